@@ -0,0 +1,84 @@
+"""
+Analytics endpoints over pre-aggregated data
+"""
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional, Literal
+from app.core.database import get_db
+from app.services.rollup_service import RollupService
+from app.services.text_analytics_service import TextAnalyticsService
+from app.services.snapshot_service import SnapshotReader
+from app.schemas.analytics_schemas import VolumeBucket, VolumeResponse, TextAnalyticsResponse, SnapshotQueryResponse
+
+router = APIRouter()
+
+@router.get("/volume", response_model=VolumeResponse)
+async def get_volume(
+    granularity: Literal["minute", "hour", "day"] = Query("hour"),
+    time_field: Literal["published_at", "created_at"] = Query("published_at"),
+    source: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """Row counts per source per time bucket, read from the rollup table"""
+    # A sync session, so the query runs on a worker thread rather than the event loop
+    buckets = await run_in_threadpool(
+        RollupService(db).volume, granularity, time_field, source=source, start=start, end=end
+    )
+    return VolumeResponse(
+        granularity=granularity,
+        time_field=time_field,
+        buckets=[VolumeBucket.from_orm(bucket) for bucket in buckets]
+    )
+
+@router.get("/text", response_model=TextAnalyticsResponse)
+async def get_text_analytics(
+    source: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    top_n: int = Query(20, ge=1, le=1000),
+    terms: Optional[str] = Query(None, description="Comma-separated terms to trend; defaults to the top keywords"),
+    db: Session = Depends(get_db)
+):
+    """Keyword frequency, per-source daily term trends and lexicon sentiment"""
+    term_list = [term.strip() for term in terms.split(",") if term.strip()] if terms else None
+    # pandas work is CPU bound, so keep it off the event loop
+    result = await run_in_threadpool(
+        TextAnalyticsService(db).analyze,
+        source=source,
+        start=start,
+        end=end,
+        top_n=top_n,
+        terms=term_list
+    )
+    return TextAnalyticsResponse(**result)
+
+@router.get("/snapshot", response_model=SnapshotQueryResponse)
+async def query_snapshot(
+    source: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    group_by: Optional[str] = Query(None, description="Comma-separated keys from source, month, day, author"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns of returned rows when not grouping"),
+    limit: int = Query(100, ge=1, le=10000),
+):
+    """Filter or aggregate rows from the Parquet snapshot without touching the database"""
+    def split(value):
+        return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+    try:
+        result = await run_in_threadpool(
+            SnapshotReader().query,
+            source=source,
+            start=start,
+            end=end,
+            group_by=split(group_by),
+            fields=split(fields),
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SnapshotQueryResponse(**result)
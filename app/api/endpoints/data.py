@@ -1,42 +1,303 @@
 """
 Data endpoints for retrieving stored data
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.core.database import get_db
+import io
+import time
+import csv
+import json
+import base64
+import binascii
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import tuple_, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, Query as SAQuery
+from sqlalchemy.sql import Select
+from typing import List, Optional, Tuple, Literal, Iterator, Union
+from app.core.database import get_async_read_db, ReadSessionLocal
+from app.core.metrics import data_query_duration
 from app.models.data_models import RawData
+from app.services.count_cache import count_cache
+from app.services.response_cache import response_cache
+from app.services.search_service import SearchService
+from app.services.metadata_store import MetadataStore
 from app.schemas.data_schemas import DataResponse, DataListResponse
 
 router = APIRouter()
 
+# Columns of a raw_data row as returned by the listing and export endpoints
+DATA_COLUMNS = [
+    RawData.id,
+    RawData.source,
+    RawData.source_id,
+    RawData.title,
+    RawData.content,
+    RawData.author,
+    RawData.url,
+    RawData.published_at,
+    RawData.raw_metadata,
+    RawData.duplicate_cluster_id,
+    RawData.created_at,
+    RawData.updated_at,
+]
+DATA_FIELDS = [column.key for column in DATA_COLUMNS]
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def encode_cursor(item: RawData) -> str:
+    """Encode the (created_at, id) position after an item as an opaque cursor"""
+    payload = json.dumps([item.created_at.isoformat(), item.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        created_at, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(item_id)
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def page_query(
+    query: Union[SAQuery, Select],
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Union[SAQuery, Select]:
+    """Restrict a RawData query or select to one page ordered by (created_at, id).
+
+    With a cursor the page seeks on the (created_at, id) index instead of
+    walking past skipped rows, so it costs the same at any depth. One extra
+    row is fetched to tell whether another page follows.
+    """
+    query = query.order_by(RawData.created_at, RawData.id)
+    if cursor:
+        created_at, item_id = decode_cursor(cursor)
+        query = query.filter(tuple_(RawData.created_at, RawData.id) > tuple_(created_at, item_id))
+    else:
+        query = query.offset(skip)
+    return query.limit(limit + 1)
+
+def split_page(items: List, limit: int) -> Tuple[List, Optional[str]]:
+    """Split the rows of a page_query into the page and the next page's cursor, if any"""
+    next_cursor = encode_cursor(items[limit - 1]) if len(items) > limit else None
+    return items[:limit], next_cursor
+
+def paginate(
+    query: SAQuery,
+    skip: int,
+    limit: int,
+    cursor: Optional[str] = None
+) -> Tuple[List, Optional[str]]:
+    """Fetch one page of a RawData entity or column query; see page_query"""
+    return split_page(page_query(query, skip, limit, cursor).all(), limit)
+
+def _to_dicts(db: Session, rows, keys: List[str]) -> List[dict]:
+    """Map result rows to dicts of keys, loading raw_metadata kept out of line"""
+    items = [{key: row._mapping[key] for key in keys} for row in rows]
+    if "raw_metadata" in keys:
+        MetadataStore(db).fill(items, [row.id for row in rows])
+    return items
+
+def _select_columns(fields: Optional[str]) -> List:
+    """Resolve a comma-separated fields parameter to RawData columns"""
+    if not fields:
+        return DATA_COLUMNS
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - set(DATA_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return [column for column in DATA_COLUMNS if column.key in requested]
+
 @router.get("/", response_model=DataListResponse)
 async def get_data(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     source: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None),
+    count: Literal["exact", "estimated", "none"] = Query("estimated"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,url"),
+    start: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get stored raw data with optional filtering"""
-    query = db.query(RawData)
+    """Get stored raw data with optional filtering.
+
+    Pass the returned next_cursor as cursor to fetch the following page;
+    skip is ignored when a cursor is given. count=estimated serves total
+    from a short-lived cache, count=exact always counts, and count=none
+    leaves total out. With fields, only those columns are selected and
+    returned. start/end bound created_at, which limits the scan to that
+    range of the (created_at, id) index. Responses are cached until the
+    next write and carry an ETag for If-None-Match revalidation.
+    """
+    started = time.perf_counter()
+    key = response_cache.key(request)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return response_cache.respond(request, cached, True, started)
+
+    columns = _select_columns(fields)
+    conditions = []
     
     if source:
-        query = query.filter(RawData.source == source)
+        conditions.append(RawData.source == source)
+    if start:
+        conditions.append(RawData.created_at >= start)
+    if end:
+        conditions.append(RawData.created_at < end)
     
-    total = query.count()
-    data = query.offset(skip).limit(limit).all()
+    # Only whole-source totals are cached
+    cacheable = not (start or end)
+    total = None
+    if count == "estimated" and cacheable:
+        total = count_cache.get(source or None)
+    if total is None and count != "none":
+        with data_query_duration.time(query="count"):
+            total = (await db.execute(select(func.count(RawData.id)).where(*conditions))).scalar_one()
+        if cacheable:
+            count_cache.set(source or None, total)
+
+    # Plain rows instead of ORM objects; id and created_at feed the cursor
+    keys = [column.key for column in columns]
+    extra = [column for column in (RawData.id, RawData.created_at) if column.key not in keys]
+    statement = page_query(select(*columns, *extra).where(*conditions), skip, limit, cursor)
+    with data_query_duration.time(query="page"):
+        data, next_cursor = split_page((await db.execute(statement)).all(), limit)
     
-    return DataListResponse(
-        data=[DataResponse.from_orm(item) for item in data],
-        total=total,
-        skip=skip,
-        limit=limit
+    # Serialized directly rather than through one DataResponse per row
+    body = {
+        "data": await db.run_sync(_to_dicts, data, keys),
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor,
+    }
+    encoded = json.dumps(body, default=_json_default, separators=(",", ":")).encode()
+    return response_cache.respond(request, response_cache.set(key, encoded), False, started)
+
+@router.get("/search")
+async def search_data(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(100, ge=1, le=1000),
+    source: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only rows created before this time"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,title,url"),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Full-text search over title and content, best match first"""
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="Empty search query")
+    columns = _select_columns(fields)
+    keys = [column.key for column in columns] + ["rank"]
+    extra = [RawData.id] if "id" not in keys else []
+    # The search service runs on the session's sync facade, still over the async driver
+    rows = await db.run_sync(
+        lambda session: SearchService(session).search(
+            q, columns + extra, source=source, start=start, end=end, limit=limit
+        )
+    )
+    body = {
+        "data": await db.run_sync(_to_dicts, rows, keys),
+        "q": q,
+        "limit": limit,
+    }
+    return Response(json.dumps(body, default=_json_default, separators=(",", ":")), media_type="application/json")
+
+# Rows fetched per server-side cursor round trip and per response chunk
+EXPORT_BATCH_SIZE = 1000
+
+def _export_ndjson(items: List[dict]) -> str:
+    return "".join(json.dumps(item, default=_json_default) + "\n" for item in items)
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+def _export_csv(items: List[dict]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(item[field]) for field in DATA_FIELDS] for item in items)
+    return buffer.getvalue()
+
+def _export_rows(
+    format: str,
+    source: Optional[str],
+    start: Optional[datetime],
+    end: Optional[datetime]
+) -> Iterator[str]:
+    """Stream matching rows in (created_at, id) order, one chunk per batch.
+
+    Runs on Starlette's threadpool with its own session, which stays open
+    until the response finishes.
+    """
+    statement = select(*DATA_COLUMNS).order_by(RawData.created_at, RawData.id)
+    if source:
+        statement = statement.where(RawData.source == source)
+    if start:
+        statement = statement.where(RawData.created_at >= start)
+    if end:
+        statement = statement.where(RawData.created_at < end)
+
+    if format == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(DATA_FIELDS)
+        yield header.getvalue()
+    encode = _export_csv if format == "csv" else _export_ndjson
+
+    db = ReadSessionLocal()
+    try:
+        # yield_per uses a server-side cursor where the driver supports one
+        result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for rows in result.partitions():
+            yield encode(_to_dicts(db, rows, DATA_FIELDS))
+    finally:
+        db.close()
+
+@router.get("/export")
+async def export_data(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    source: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None, description="Only rows created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only rows created before this time")
+):
+    """Stream stored raw data as NDJSON or CSV"""
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_rows(format, source, start, end),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=raw_data.{format}"}
     )
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Hit rate, lookup latency and size of the response cache"""
+    return response_cache.stats()
+
 @router.get("/{data_id}", response_model=DataResponse)
-async def get_data_by_id(data_id: int, db: Session = Depends(get_db)):
+async def get_data_by_id(request: Request, data_id: int, db: AsyncSession = Depends(get_async_read_db)):
     """Get specific data entry by ID"""
-    data = db.query(RawData).filter(RawData.id == data_id).first()
+    started = time.perf_counter()
+    key = response_cache.key(request)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return response_cache.respond(request, cached, True, started)
+
+    data = await db.get(RawData, data_id)
     if not data:
         raise HTTPException(status_code=404, detail="Data not found")
-    return DataResponse.from_orm(data)
+    response = DataResponse.from_orm(data)
+    if response.raw_metadata is None:
+        payloads = await db.run_sync(lambda session: MetadataStore(session).load([data_id]))
+        response.raw_metadata = payloads.get(data_id)
+    encoded = json.dumps(jsonable_encoder(response), separators=(",", ":")).encode()
+    return response_cache.respond(request, response_cache.set(key, encoded), False, started)
@@ -0,0 +1,40 @@
+"""
+Debugging endpoints for profiling a running server
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from typing import Optional, Literal
+from app.core.config import settings
+from app.core.profiler import profiler
+
+router = APIRouter()
+
+def _require_profiler():
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiler is disabled; set PROFILER_ENABLED to use it")
+
+@router.post("/profiler/start")
+async def start_profiler(interval: Optional[float] = Query(None, gt=0, le=1, description="Seconds between samples")):
+    """Start sampling every thread's stack, discarding earlier samples"""
+    _require_profiler()
+    if not profiler.start(interval):
+        raise HTTPException(status_code=409, detail="Profiler is already running")
+    return profiler.report()
+
+@router.post("/profiler/stop")
+async def stop_profiler(limit: int = Query(30, ge=1, le=500)):
+    """Stop sampling and report the hottest functions"""
+    _require_profiler()
+    profiler.stop()
+    return profiler.report(limit)
+
+@router.get("/profiler")
+async def get_profile(
+    limit: int = Query(30, ge=1, le=500),
+    format: Literal["json", "collapsed"] = Query("json")
+):
+    """Samples so far: the hottest functions, or every stack in collapsed format for a flame graph"""
+    _require_profiler()
+    if format == "collapsed":
+        return PlainTextResponse(profiler.collapsed())
+    return profiler.report(limit)
@@ -1,53 +1,78 @@
 """
 Data ingestion endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.ingestion_service import IngestionService
-from app.schemas.ingestion_schemas import IngestionRequest, IngestionResponse
+import os
+import uuid
+import shutil
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.models.data_models import IngestionJob
+from app.services.job_service import job_queue
+from app.services.file_ingestion_service import RECORD_NORMALIZERS, detect_format
+from app.schemas.ingestion_schemas import IngestionRequest, IngestionJobResponse
 
 router = APIRouter()
 
-@router.post("/news", response_model=IngestionResponse)
-async def ingest_news_data(
-    request: IngestionRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
-):
-    """Trigger news data ingestion"""
-    try:
-        ingestion_service = IngestionService(db)
-        result = await ingestion_service.ingest_news_data(
-            query=request.query,
-            language=request.language,
-            page_size=request.page_size
-        )
-        return IngestionResponse(
-            success=True,
-            message=f"Successfully ingested {result['count']} news articles",
-            data=result
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-@router.post("/twitter", response_model=IngestionResponse)
-async def ingest_twitter_data(
-    request: IngestionRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+def _job_response(job: IngestionJob) -> IngestionJobResponse:
+    """Build a job response, filling in live progress for running jobs"""
+    response = IngestionJobResponse.from_orm(job)
+    if job.status == "running":
+        response.rows_inserted = job_queue.progress.get(job.id, 0)
+    if job.started_at:
+        response.duration_seconds = ((job.finished_at or datetime.utcnow()) - job.started_at).total_seconds()
+    return response
+
+@router.post("/news", response_model=IngestionJobResponse, status_code=202)
+async def ingest_news_data(request: IngestionRequest):
+    """Queue a news data ingestion job"""
+    job = await job_queue.submit("news", request.dict())
+    return _job_response(job)
+
+@router.post("/twitter", response_model=IngestionJobResponse, status_code=202)
+async def ingest_twitter_data(request: IngestionRequest):
+    """Queue a Twitter data ingestion job"""
+    job = await job_queue.submit("twitter", request.dict())
+    return _job_response(job)
+
+def _save_upload(file: UploadFile, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as out:
+        shutil.copyfileobj(file.file, out, 1024 * 1024)
+
+@router.post("/upload", response_model=IngestionJobResponse, status_code=202)
+async def ingest_file(
+    source: str = Form(...),
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Form(None)
 ):
-    """Trigger Twitter data ingestion"""
-    try:
-        ingestion_service = IngestionService(db)
-        result = await ingestion_service.ingest_twitter_data(
-            query=request.query,
-            count=request.page_size
-        )
-        return IngestionResponse(
-            success=True,
-            message=f"Successfully ingested {result['count']} tweets",
-            data=result
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    """Queue a job loading an offline JSONL or CSV dump (optionally gzipped) of news or twitter records"""
+    if source not in RECORD_NORMALIZERS:
+        raise HTTPException(status_code=400, detail=f"Unknown source: {source}")
+    file_format = file_format or detect_format(file.filename or "")
+    if file_format not in ("jsonl", "csv"):
+        raise HTTPException(status_code=400, detail="File format must be jsonl or csv")
+
+    # The job reads the file after this request has returned
+    suffix = ".gz" if (file.filename or "").lower().endswith(".gz") else ""
+    path = os.path.join(os.path.abspath(settings.UPLOAD_DIR), f"{uuid.uuid4().hex}.{file_format}{suffix}")
+    await run_in_threadpool(_save_upload, file, path)
+    job = await job_queue.submit("file", {
+        "path": path,
+        "source": source,
+        "format": file_format,
+        "filename": file.filename,
+    })
+    return _job_response(job)
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_ingestion_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get status, row count and timing of an ingestion job"""
+    job = await db.get(IngestionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
@@ -2,10 +2,12 @@
 Main API router configuration
 """
 from fastapi import APIRouter
-from app.api.endpoints import data, ingestion
+from app.api.endpoints import data, ingestion, analytics, debug
 
 api_router = APIRouter()
 
 # Include endpoint routers
 api_router.include_router(data.router, prefix="/data", tags=["data"])
 api_router.include_router(ingestion.router, prefix="/ingestion", tags=["ingestion"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(debug.router, prefix="/debug", tags=["debug"])
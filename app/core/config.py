@@ -12,9 +12,26 @@ class Settings(BaseSettings):
     
     # Database settings
     DATABASE_URL: str = "sqlite:///./data_analytics.db"
+    # Optional replica for read-only listing queries; defaults to DATABASE_URL
+    DATABASE_READ_URL: Optional[str] = None
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = 1800
+    DATABASE_POOL_PRE_PING: bool = True
+    DATABASE_STATEMENT_CACHE_SIZE: int = 500
+    
+    # SQLite connection pragmas; ignored for other databases
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    # Page cache per connection; negative values are in KiB
+    SQLITE_CACHE_SIZE: int = -65536
     
     # News API settings
     NEWS_API_KEY: Optional[str] = None
+    NEWS_API_BASE_URL: str = "https://newsapi.org/v2"
+    NEWS_API_MAX_CONCURRENT_PAGES: int = 4
     
     # Twitter API settings
     TWITTER_API_KEY: Optional[str] = None
@@ -22,6 +39,117 @@ class Settings(BaseSettings):
     TWITTER_ACCESS_TOKEN: Optional[str] = None
     TWITTER_ACCESS_TOKEN_SECRET: Optional[str] = None
     TWITTER_BEARER_TOKEN: Optional[str] = None
+    TWITTER_MAX_WORKERS: int = 4
+    
+    # Upstream HTTP client settings
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    
+    # Source API response cache: seconds a response is reused without a
+    # request, after which it is revalidated with a conditional request
+    UPSTREAM_CACHE_ENABLED: bool = True
+    UPSTREAM_CACHE_TTL: int = 300
+    UPSTREAM_CACHE_MAX_ENTRIES: int = 1024
+    
+    # Source API rate limiting: requests wait for capacity in a token
+    # bucket per credential, sized from these rates until the API's
+    # x-rate-limit-* headers report the real quota. Rate-limited requests
+    # wait and retry; server and network errors are retried with jittered
+    # exponential backoff while the retry budget (a ratio of requests) lasts.
+    RATE_LIMIT_ENABLED: bool = True
+    NEWS_API_REQUESTS_PER_SECOND: float = 10.0
+    NEWS_API_BURST: int = 20
+    TWITTER_REQUESTS_PER_SECOND: float = 0.5
+    TWITTER_BURST: int = 10
+    RATE_LIMIT_MAX_RETRIES: int = 5
+    RATE_LIMIT_RETRY_BUDGET: float = 0.2
+    RATE_LIMIT_BACKOFF_BASE: float = 0.5
+    RATE_LIMIT_BACKOFF_MAX: float = 30.0
+    # Longest a request waits for rate-limited capacity before failing
+    RATE_LIMIT_MAX_WAIT: float = 900.0
+    
+    # Background ingestion job settings. Each API process tags the jobs it
+    # runs and refreshes their heartbeat; a running job whose heartbeat is
+    # older than the stale limit was left by a process that died, and is
+    # failed by the next process that starts.
+    INGESTION_WORKERS: int = 4
+    INGESTION_JOB_HEARTBEAT_SECONDS: float = 30.0
+    INGESTION_JOB_STALE_SECONDS: float = 120.0
+    # Ingestion pipeline: most rows of already-queued pages written in one
+    # transaction, and pages buffered between the fetch, normalize and write
+    # stages before earlier stages wait
+    INGESTION_COMMIT_BATCH_SIZE: int = 500
+    INGESTION_QUEUE_SIZE: int = 4
+    
+    # Offline dump loading: parsing worker processes (unset uses every CPU),
+    # records per block (parsed, written and clustered at a time), and where
+    # uploaded files wait for their job
+    FILE_INGESTION_WORKERS: Optional[int] = None
+    FILE_INGESTION_CHUNK_ROWS: int = 5000
+    UPLOAD_DIR: str = "./uploads"
+    
+    # Multi-source orchestrator: fetches active data_sources concurrently
+    # within per-source-type concurrency and fetch-rate budgets. The
+    # in-app scheduler checks for due sources every poll interval; a
+    # source's config may set interval_seconds to override the default.
+    # A source whose fetch failed waits its interval, doubled for each
+    # further failure in a row, up to the backoff cap, before it is retried.
+    ORCHESTRATOR_SCHEDULER_ENABLED: bool = False
+    ORCHESTRATOR_POLL_SECONDS: int = 60
+    ORCHESTRATOR_DEFAULT_INTERVAL_SECONDS: int = 900
+    ORCHESTRATOR_MAX_BACKOFF_SECONDS: int = 21600
+    ORCHESTRATOR_MAX_CONCURRENT_NEWS: int = 4
+    ORCHESTRATOR_MAX_CONCURRENT_TWITTER: int = 2
+    ORCHESTRATOR_NEWS_FETCHES_PER_MINUTE: float = 60.0
+    ORCHESTRATOR_TWITTER_FETCHES_PER_MINUTE: float = 15.0
+    ORCHESTRATOR_WRITE_BATCH_SIZE: int = 500
+    
+    # Near-duplicate detection: minimum estimated Jaccard similarity of
+    # word shingles for two rows to share a duplicate cluster
+    NEAR_DUPLICATE_THRESHOLD: float = 0.8
+    
+    # Where raw_metadata is stored: "inline" in raw_data, or "compressed"
+    # in the raw_metadata_blobs side table
+    RAW_METADATA_STORAGE: str = "compressed"
+    
+    # Retention: months of raw_data to keep (unset keeps everything) and
+    # where dropped months are archived as Parquet
+    RAW_DATA_RETENTION_MONTHS: Optional[int] = None
+    ARCHIVE_DIR: str = "./archive"
+    
+    # Where incremental Parquet snapshots of raw_data are written for analysts,
+    # and how far behind the created_at watermark each run re-reads for rows
+    # whose transaction committed late
+    SNAPSHOT_DIR: str = "./snapshots"
+    SNAPSHOT_OVERLAP_SECONDS: float = 600.0
+    
+    # Seconds a cached /data total stays valid. Totals are kept per process,
+    # so rows written by other processes (more server workers, CLI scripts)
+    # are counted at most this long after they are stored
+    DATA_COUNT_CACHE_TTL: int = 60
+    
+    # Cached /data responses: "memory" (per process LRU bounded by
+    # RESPONSE_CACHE_MAX_BYTES), "redis" (shared, needs the redis package)
+    # or "auto", which is redis when WEB_CONCURRENCY (uvicorn's worker
+    # count) is above 1 and memory otherwise. A memory cache only sees the
+    # writes of its own process; writes by other processes, CLI scripts
+    # included, show up once entries expire, up to RESPONSE_CACHE_TTL
+    # seconds later.
+    RESPONSE_CACHE_BACKEND: str = "auto"
+    WEB_CONCURRENCY: int = 1
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    RESPONSE_CACHE_TTL: int = 300
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    
+    # Metrics served at /metrics; statements slower than SLOW_QUERY_SECONDS
+    # are counted and logged
+    METRICS_ENABLED: bool = True
+    SLOW_QUERY_SECONDS: float = 0.5
+    # Sampling profiler endpoints under /api/v1/debug/profiler, off unless enabled
+    PROFILER_ENABLED: bool = False
+    PROFILER_INTERVAL_SECONDS: float = 0.005
     
     class Config:
         env_file = ".env"
@@ -1,19 +1,109 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+import threading
+from typing import Union
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+
+# asyncio drivers used for the API's async engines, by backend
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply per-connection SQLite settings from Settings"""
+    cursor = dbapi_connection.cursor()
+    try:
+        # WAL lets readers run alongside the single writer instead of
+        # waiting on the whole-database lock of the rollback journal
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+    finally:
+        cursor.close()
+
+def async_database_url(url: str) -> str:
+    """The same database URL with the backend's asyncio driver"""
+    backend = make_url(url)
+    driver = ASYNC_DRIVERS.get(backend.get_backend_name())
+    if driver is None or backend.get_driver_name() == driver:
+        return url
+    return backend.set(drivername=f"{backend.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+def create_database_engine(url: str, asynchronous: bool = False) -> Union[Engine, AsyncEngine]:
+    """Create an engine, or an asyncio engine, with pool and connection settings from Settings"""
+    if asynchronous:
+        url = async_database_url(url)
+    backend = make_url(url)
+    options = {
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        # Compiled SQL cache entries kept per engine
+        "query_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+    }
+    in_memory = backend.get_backend_name() == "sqlite" and backend.database in (None, "", ":memory:")
+    if not in_memory:
+        # In-memory SQLite uses a connection per thread rather than a pool
+        options.update(
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        )
+        if asynchronous and backend.get_backend_name() == "sqlite":
+            # aiosqlite defaults to opening a connection, and its thread, per checkout
+            options["poolclass"] = AsyncAdaptedQueuePool
+    if backend.get_backend_name() == "sqlite":
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+
+    if asynchronous:
+        engine = create_async_engine(url, **options)
+        sync_engine = engine.sync_engine
+    else:
+        engine = sync_engine = create_engine(url, **options)
+    if backend.get_backend_name() == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+    if settings.METRICS_ENABLED:
+        instrument_engine(sync_engine)
+    return engine
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+engine = create_database_engine(settings.DATABASE_URL)
+
+# Reads that tolerate replica lag can use a separate engine; without a
+# replica URL they share the primary engine
+read_engine: Engine = (
+    create_database_engine(settings.DATABASE_READ_URL) if settings.DATABASE_READ_URL else engine
 )
 
-# Create session factory
+# asyncio engines for the API endpoints, so queries do not block the event loop
+async_engine: AsyncEngine = create_database_engine(settings.DATABASE_URL, asynchronous=True)
+async_read_engine: AsyncEngine = (
+    create_database_engine(settings.DATABASE_READ_URL, asynchronous=True)
+    if settings.DATABASE_READ_URL else async_engine
+)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+# Objects stay readable after commit; lazy loads are not possible on an AsyncSession
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+# Held around every write transaction this process makes through a sync
+# session. SQLite has one writer at a time, and a connection waiting in its
+# busy handler only polls for the lock, so a steady stream of other writers
+# can keep it waiting until busy_timeout fails it. Threads waiting here are
+# handed the lock as soon as it is released.
+write_lock = threading.RLock()
 
 # Create base class for models
 Base = declarative_base()
@@ -25,3 +115,27 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Dependency to get a session for read-only queries, on the replica if configured"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """Dependency to get an asyncio database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    """Dependency to get an asyncio session for read-only queries, on the replica if configured"""
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+async def dispose_async_engines():
+    """Close pooled asyncio connections; called on application shutdown"""
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
@@ -0,0 +1,63 @@
+"""
+Shared async HTTP client for calls to upstream source APIs
+"""
+import asyncio
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.core.config import settings
+
+class HTTPClient:
+    """Keep-alive connection pool with a per-host concurrency limit"""
+
+    def __init__(
+        self,
+        timeout: float = settings.HTTP_TIMEOUT,
+        max_connections: int = settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        max_connections_per_host: int = settings.HTTP_MAX_CONNECTIONS_PER_HOST
+    ):
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+        self.max_connections_per_host = max_connections_per_host
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_connections_per_host)
+        return self._host_semaphores[host]
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None
+    ) -> httpx.Response:
+        """Send a GET request, waiting for a free slot on the target host"""
+        async with self._semaphore(url):
+            return await self.client.get(url, params=params, headers=headers)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+_http_client: Optional[HTTPClient] = None
+
+def get_http_client() -> HTTPClient:
+    """Return the shared HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None:
+        _http_client = HTTPClient()
+    return _http_client
+
+async def close_http_client():
+    """Close the shared HTTP client and its pooled connections"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
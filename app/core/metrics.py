@@ -0,0 +1,261 @@
+"""
+In-process metrics in the Prometheus text format, with request timing
+middleware and SQL statement timing hooks
+"""
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Tuple, Sequence, Iterator
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; a +Inf bucket is always added
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metric:
+    """A named metric with a value per combination of label values"""
+
+    kind = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return super().render() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values
+        ]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets, with their sum and count"""
+
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: a count per bucket plus one for +Inf, and the sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the seconds spent in the with block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            entry = self._values.get(self._key(labels))
+            return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = super().render()
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                labels = _format_labels(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+class MetricsRegistry:
+    """The metrics served at /metrics.
+
+    Recording is a dict update under a per-metric lock, so it is cheap
+    enough for every request and statement; with enabled off it returns
+    straight away.
+    """
+
+    def __init__(self, enabled: bool = settings.METRICS_ENABLED):
+        self.enabled = enabled
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(self, name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests by method, route template and status", ("method", "route", "status")
+)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency, including the response body", ("method", "route")
+)
+upstream_request_duration = metrics.histogram(
+    "upstream_request_duration_seconds", "Source API request latency per attempt", ("api", "status")
+)
+ingested_rows = metrics.counter(
+    "ingestion_rows_total",
+    "Rows given to bulk_insert: inserted, duplicate (already stored, skipped) or near_duplicate (inserted into an existing cluster)",
+    ("source", "outcome")
+)
+data_query_duration = metrics.histogram(
+    "data_query_duration_seconds", "Database time of GET /data by query", ("query",), buckets=STATEMENT_BUCKETS
+)
+statement_duration = metrics.histogram(
+    "db_statement_duration_seconds", "SQL statement execution time by statement type", ("operation",),
+    buckets=STATEMENT_BUCKETS
+)
+slow_statements = metrics.counter(
+    "db_slow_statements_total", "SQL statements slower than SLOW_QUERY_SECONDS", ("operation",)
+)
+orchestrator_failed_runs = metrics.counter(
+    "orchestrator_failed_runs_total", "Scheduled orchestrator rounds that raised; each is retried at the next poll"
+)
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request.
+
+    Requests are labelled with the matched route's path template, not the
+    URL, so ids and query strings do not create new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the shared scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_requests.inc(method=scope["method"], route=path, status=status)
+            http_request_duration.observe(time.perf_counter() - started, method=scope["method"], route=path)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["statement_started"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    statement_duration.observe(elapsed, operation=operation)
+    if elapsed >= settings.SLOW_QUERY_SECONDS:
+        slow_statements.inc(operation=operation)
+        logger.warning("Slow %s statement (%.3fs): %s", operation, elapsed, " ".join(statement.split())[:500])
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    started = exception_context.connection.info.get("statement_started") if exception_context.connection else None
+    if started:
+        started.pop()
+
+def instrument_engine(engine: Engine):
+    """Time every statement an engine executes (a sync engine, or an async engine's sync_engine)"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
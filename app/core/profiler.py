@@ -0,0 +1,132 @@
+"""
+Sampling profiler for finding hot paths in a running process
+"""
+import os
+import sys
+import time
+import threading
+from collections import Counter
+from typing import Dict, Any, Optional, Tuple
+from app.core.config import settings
+
+# Leaf frames of threads waiting for work rather than doing it
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+def _frame_name(frame) -> Tuple[str, str]:
+    return os.path.basename(frame.f_code.co_filename), frame.f_code.co_name
+
+class SamplingProfiler:
+    """Records the Python stack of every thread at a fixed interval.
+
+    A background thread reads sys._current_frames(), so nothing is added
+    to the code being profiled; the cost is one stack walk per thread per
+    interval while running, and nothing when stopped. Coroutines show up
+    in the event loop thread's stack while they run. Stacks of idle
+    threads are counted but not kept.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._idle_samples = 0
+        self._started = 0.0
+        self._stopped: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: Optional[float] = None) -> bool:
+        """Start sampling from scratch; False if already running"""
+        if self.running:
+            return False
+        if interval:
+            self.interval = interval
+        with self._lock:
+            self._reset()
+            self._started = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop sampling; the samples stay available to report"""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        with self._lock:
+            self._stopped = time.monotonic()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self._sample(own_id)
+
+    def _sample(self, own_id: int):
+        stacks = []
+        idle = 0
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if _frame_name(frame) in IDLE_FRAMES:
+                idle += 1
+                continue
+            names = []
+            while frame is not None:
+                names.append("%s:%s" % _frame_name(frame))
+                frame = frame.f_back
+            stacks.append(";".join(reversed(names)))
+        with self._lock:
+            self._samples += len(stacks)
+            self._idle_samples += idle
+            self._stacks.update(stacks)
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope"""
+        with self._lock:
+            stacks = self._stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def report(self, limit: int = 30) -> Dict[str, Any]:
+        """Functions by samples at the top of the stack (self) and anywhere in it (total)"""
+        with self._lock:
+            stacks = list(self._stacks.items())
+            samples, idle = self._samples, self._idle_samples
+            seconds = ((self._stopped or time.monotonic()) - self._started) if self._started else 0.0
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in stacks:
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for name in set(frames):
+                total[name] += count
+
+        def share(count: int) -> float:
+            return round(count / samples, 4) if samples else 0.0
+
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "seconds": round(seconds, 3),
+            "samples": samples,
+            "idle_samples": idle,
+            "self": [{"function": name, "samples": count, "share": share(count)} for name, count in own.most_common(limit)],
+            "total": [{"function": name, "samples": count, "share": share(count)} for name, count in total.most_common(limit)],
+        }
+
+profiler = SamplingProfiler(settings.PROFILER_INTERVAL_SECONDS)
@@ -1,16 +1,39 @@
 """
 Main FastAPI application for Data Analytics Platform
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.metrics import metrics, MetricsMiddleware
+from app.core.profiler import profiler
+from app.core.http import get_http_client, close_http_client
+from app.core.database import dispose_async_engines
+from app.services.job_service import job_queue
+from app.services.orchestrator_service import orchestrator
 from app.api.routes import api_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own shared resources for the lifetime of the application"""
+    get_http_client()
+    await job_queue.start()
+    if settings.ORCHESTRATOR_SCHEDULER_ENABLED:
+        orchestrator.start()
+    yield
+    profiler.stop()
+    await orchestrator.stop()
+    await job_queue.stop()
+    await close_http_client()
+    await dispose_async_engines()
+
 app = FastAPI(
     title=settings.APP_NAME,
     description="A platform for data analytics and insights",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -22,6 +45,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Time every request; added last so it is outermost and sees the full latency
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -32,3 +59,10 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Metrics in the Prometheus text exposition format"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,14 +1,22 @@
 """
 Database models for storing raw data from various sources
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
+from datetime import datetime
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, JSON, LargeBinary, UniqueConstraint, Index, event, text, inspect
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class RawData(Base):
     """Model for storing raw data from various sources"""
     __tablename__ = "raw_data"
-    
+    __table_args__ = (
+        # Lets bulk inserts skip already-stored items with ON CONFLICT DO NOTHING
+        UniqueConstraint("source", "source_id", name="uq_raw_data_source_source_id"),
+        # Keyset pagination walks (created_at, id), optionally within one source
+        Index("ix_raw_data_created_at_id", "created_at", "id"),
+        Index("ix_raw_data_source_created_at_id", "source", "created_at", "id"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     source = Column(String(50), nullable=False, index=True)  # e.g., 'news', 'twitter'
     source_id = Column(String(100), nullable=True, index=True)  # Original ID from source
@@ -17,8 +25,12 @@ class RawData(Base):
     author = Column(String(200), nullable=True)
     url = Column(String(1000), nullable=True)
     published_at = Column(DateTime, nullable=True, index=True)
-    raw_metadata = Column(JSON, nullable=True)  # Store original API response
-    created_at = Column(DateTime, default=func.now(), index=True)
+    # Original API response; NULL when it lives compressed in raw_metadata_blobs
+    raw_metadata = Column(JSON(none_as_null=True), nullable=True)
+    minhash_signature = Column(LargeBinary, nullable=True)  # MinHash of title and content shingles
+    duplicate_cluster_id = Column(Integer, nullable=True, index=True)  # id of the first row with near-identical text
+    # Set in Python so stored values compare exactly with datetimes bound from cursors
+    created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
 class DataSource(Base):
@@ -33,3 +45,139 @@ class DataSource(Base):
     config = Column(JSON, nullable=True)  # Store source-specific configuration
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+class IngestionJob(Base):
+    """Model for tracking background ingestion jobs"""
+    __tablename__ = "ingestion_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_type = Column(String(50), nullable=False)  # e.g., 'news', 'twitter'
+    status = Column(String(20), nullable=False, default='queued', index=True)  # queued, running, completed, failed
+    params = Column(JSON, nullable=True)  # Arguments passed to the ingestion method
+    rows_inserted = Column(Integer, nullable=False, default=0)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    owner = Column(String(100), nullable=True)  # host:pid of the process running the job
+    heartbeat_at = Column(DateTime, nullable=True)  # Refreshed by the owner while the job runs
+
+class RawMetadataBlob(Base):
+    """Compressed raw_metadata payloads kept out of the raw_data table"""
+    __tablename__ = "raw_metadata_blobs"
+
+    raw_data_id = Column(Integer, primary_key=True)
+    dictionary_id = Column(Integer, nullable=False)  # zlib preset dictionary used to compress payload
+    payload = Column(LargeBinary, nullable=False)
+
+class MinHashBand(Base):
+    """LSH band index over RawData MinHash signatures"""
+    __tablename__ = "minhash_bands"
+    __table_args__ = (
+        Index("ix_minhash_bands_band_hash", "band", "band_hash"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    band = Column(Integer, nullable=False)
+    band_hash = Column(BigInteger, nullable=False)
+    raw_data_id = Column(Integer, nullable=False, index=True)
+
+class VolumeRollup(Base):
+    """Pre-aggregated raw_data row counts per source and time bucket"""
+    __tablename__ = "volume_rollups"
+    __table_args__ = (
+        UniqueConstraint("time_field", "granularity", "source", "bucket_start", name="uq_volume_rollups_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    time_field = Column(String(20), nullable=False)  # published_at or created_at
+    granularity = Column(String(10), nullable=False)  # minute, hour or day
+    source = Column(String(50), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+# Full-text index over raw_data title and content. SQLite keeps an external
+# content FTS5 table in sync with triggers; Postgres uses a GIN expression
+# index that SearchService queries with the same expression.
+SQLITE_SEARCH_INDEX_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS raw_data_fts USING fts5(
+        title, content, content='raw_data', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS raw_data_fts_insert AFTER INSERT ON raw_data BEGIN
+        INSERT INTO raw_data_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS raw_data_fts_delete AFTER DELETE ON raw_data BEGIN
+        INSERT INTO raw_data_fts(raw_data_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS raw_data_fts_update AFTER UPDATE OF title, content ON raw_data BEGIN
+        INSERT INTO raw_data_fts(raw_data_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO raw_data_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+POSTGRES_SEARCH_DOCUMENT = "to_tsvector('english', coalesce(title, '') || ' ' || content)"
+
+def create_search_index(connection):
+    """Create the full-text index for raw_data if it does not exist yet.
+
+    On SQLite, rows stored before the index existed are indexed once here.
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'raw_data_fts'"
+        )).first()
+        for statement in SQLITE_SEARCH_INDEX_DDL:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text("INSERT INTO raw_data_fts(raw_data_fts) VALUES ('rebuild')"))
+    elif dialect == "postgresql":
+        connection.execute(text(
+            f"CREATE INDEX IF NOT EXISTS ix_raw_data_search ON raw_data USING GIN ({POSTGRES_SEARCH_DOCUMENT})"
+        ))
+
+def add_missing_columns(connection, table):
+    """ALTER TABLE to add model columns an existing table lacks; they start out NULL"""
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+
+def upgrade_raw_data(connection):
+    """Add the raw_data columns and indexes that a table created by an older version lacks.
+
+    create_all skips tables that already exist, so init_db runs this for
+    databases created before near-duplicate clustering and keyset
+    pagination. Added columns are nullable and start out NULL; rows stored
+    before then are clustered by the next file load that clusters.
+
+    The (source, source_id) unique index that bulk inserts rely on is added
+    too, once rows stored more than once are cut down to their oldest copy.
+    """
+    table = RawData.__table__
+    add_missing_columns(connection, table)
+    inspector = inspect(connection)
+    for index in table.indexes:
+        index.create(connection, checkfirst=True)
+
+    unique = [constraint["column_names"] for constraint in inspector.get_unique_constraints(table.name)]
+    unique += [index["column_names"] for index in inspector.get_indexes(table.name) if index["unique"]]
+    if ["source", "source_id"] not in unique:
+        connection.execute(text(
+            "DELETE FROM raw_data WHERE source_id IS NOT NULL AND id NOT IN ("
+            "SELECT min(id) FROM raw_data WHERE source_id IS NOT NULL GROUP BY source, source_id)"
+        ))
+        connection.execute(text(
+            "CREATE UNIQUE INDEX uq_raw_data_source_source_id ON raw_data (source, source_id)"
+        ))
+
+@event.listens_for(RawData.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    create_search_index(connection)
+
+@event.listens_for(RawData.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("DROP TABLE IF EXISTS raw_data_fts"))
@@ -0,0 +1,49 @@
+"""
+Pydantic schemas for analytics responses
+"""
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+class VolumeBucket(BaseModel):
+    source: str
+    bucket_start: datetime
+    count: int
+
+    class Config:
+        orm_mode = True
+
+class VolumeResponse(BaseModel):
+    granularity: str
+    time_field: str
+    buckets: List[VolumeBucket]
+
+class KeywordCount(BaseModel):
+    term: str
+    count: int
+
+class TermTrendPoint(BaseModel):
+    source: str
+    day: datetime
+    term: str
+    count: int
+
+class SourceSentiment(BaseModel):
+    source: str
+    rows: int
+    mean_score: float
+    positive: int
+    negative: int
+    neutral: int
+
+class TextAnalyticsResponse(BaseModel):
+    rows: int
+    keywords: List[KeywordCount]
+    trends: List[TermTrendPoint]
+    sentiment: List[SourceSentiment]
+
+class SnapshotQueryResponse(BaseModel):
+    watermark: Optional[datetime]
+    rows_matched: int
+    groups: Optional[List[Dict[str, Any]]] = None
+    rows: Optional[List[Dict[str, Any]]] = None
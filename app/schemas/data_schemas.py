@@ -15,14 +15,16 @@ class DataResponse(BaseModel):
     url: Optional[str]
     published_at: Optional[datetime]
     raw_metadata: Optional[Dict[str, Any]]
+    duplicate_cluster_id: Optional[int]
     created_at: datetime
     updated_at: datetime
 
     class Config:
-        from_attributes = True
+        orm_mode = True
 
 class DataListResponse(BaseModel):
     data: List[DataResponse]
-    total: int
+    total: Optional[int]
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
@@ -3,13 +3,32 @@ Pydantic schemas for ingestion requests and responses
 """
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
+from datetime import datetime
 
 class IngestionRequest(BaseModel):
     query: str
     language: Optional[str] = "en"
     page_size: Optional[int] = 100
+    # Only fetch items newer than the last run of the same query
+    incremental: Optional[bool] = True
 
 class IngestionResponse(BaseModel):
     success: bool
     message: str
     data: Optional[Dict[str, Any]] = None
+
+class IngestionJobResponse(BaseModel):
+    id: int
+    job_type: str
+    status: str
+    params: Optional[Dict[str, Any]]
+    rows_inserted: int
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    duration_seconds: Optional[float] = None
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,43 @@
+"""
+In-process cache of raw_data row counts per listing filter
+"""
+import time
+from typing import Dict, Optional, Tuple
+from app.core.config import settings
+
+class CountCache:
+    """Row counts keyed by source filter (None for all sources).
+
+    Entries expire after ttl seconds so writes from other processes show up
+    eventually; writes through IngestionService update them immediately.
+    """
+
+    def __init__(self, ttl: float = settings.DATA_COUNT_CACHE_TTL):
+        self.ttl = ttl
+        self._counts: Dict[Optional[str], Tuple[int, float]] = {}
+
+    def get(self, source: Optional[str]) -> Optional[int]:
+        """Return the cached count for a filter, or None if missing or expired"""
+        entry = self._counts.get(source)
+        if entry is None:
+            return None
+        count, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._counts[source]
+            return None
+        return count
+
+    def set(self, source: Optional[str], count: int):
+        self._counts[source] = (count, time.monotonic() + self.ttl)
+
+    def increment(self, source: str, count: int):
+        """Add newly inserted rows to the cached counts they belong to"""
+        for key in (source, None):
+            entry = self._counts.get(key)
+            if entry is not None:
+                self._counts[key] = (entry[0] + count, entry[1])
+
+    def clear(self):
+        self._counts.clear()
+
+count_cache = CountCache()
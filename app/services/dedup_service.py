@@ -0,0 +1,219 @@
+"""
+Service for near-duplicate detection with MinHash signatures and LSH bands
+"""
+import re
+import zlib
+from typing import Dict, Any, Optional, List, Tuple
+import numpy as np
+from sqlalchemy import insert, update, bindparam
+from sqlalchemy.orm import Session
+from app.models.data_models import RawData, MinHashBand
+from app.core.config import settings
+
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 3
+
+# SQLite limits bound parameters per statement, so IN lookups are chunked
+LOOKUP_CHUNK_SIZE = 250
+
+# Universal hashing (a * x + b) mod p with a Mersenne prime; a * x stays
+# below 2**63 because a < 2**31 and shingle hashes are 32-bit
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+def lsh_bands(threshold: float, num_permutations: int = NUM_PERMUTATIONS) -> Tuple[int, int]:
+    """Pick (bands, rows per band) with the highest LSH threshold (1/b)^(1/r) not above threshold.
+
+    Erring low keeps recall; candidates below threshold are dropped when
+    their signatures are compared.
+    """
+    options = [
+        ((1 / bands) ** (bands / num_permutations), bands, num_permutations // bands)
+        for bands in range(1, num_permutations + 1)
+        if num_permutations % bands == 0
+    ]
+    eligible = [option for option in options if option[0] <= threshold] or [min(options)]
+    _, bands, rows = max(eligible)
+    return bands, rows
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """32-bit hashes of the word n-grams in text"""
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    # crc32 rather than hash(), which is salted per process
+    return np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+
+def minhash_signature(text: str) -> Optional[np.ndarray]:
+    """MinHash signature of text's shingles, or None for text without words"""
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+def row_text(row: Dict[str, Any]) -> str:
+    return f"{row.get('title') or ''} {row.get('content') or ''}"
+
+class NearDuplicateService:
+    """Assigns duplicate_cluster_id to raw_data rows as they are inserted.
+
+    Each row's signature is split into LSH bands; only rows sharing a band
+    hash are compared, so a lookup touches a few candidates instead of the
+    whole table. A row joins the cluster of the first stored row whose
+    estimated similarity reaches the threshold, and otherwise starts its
+    own cluster.
+    """
+
+    def __init__(self, db: Session, threshold: float = settings.NEAR_DUPLICATE_THRESHOLD):
+        self.db = db
+        self.threshold = threshold
+        self.bands, self.rows_per_band = lsh_bands(threshold)
+
+    def band_hashes(self, signature: np.ndarray) -> List[int]:
+        return [
+            zlib.crc32(signature[band * self.rows_per_band:(band + 1) * self.rows_per_band].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def prepare(self, rows: List[Dict[str, Any]]):
+        """Store a MinHash signature on each row dict before it is inserted"""
+        for row in rows:
+            signature = minhash_signature(row_text(row))
+            row["minhash_signature"] = signature.tobytes() if signature is not None else None
+
+    def _candidates(self, keys: List[Tuple[int, int]]) -> Dict[Tuple[int, int], List[int]]:
+        """Stored raw_data ids per (band, band_hash)"""
+        # Looked up one band at a time: SQLite only uses the (band, band_hash)
+        # index for band = ? AND band_hash IN (...), not for a row-value IN
+        hashes = {}
+        for band, band_hash in keys:
+            hashes.setdefault(band, []).append(band_hash)
+        candidates = {}
+        for band, band_hashes in hashes.items():
+            for start in range(0, len(band_hashes), LOOKUP_CHUNK_SIZE):
+                chunk = band_hashes[start:start + LOOKUP_CHUNK_SIZE]
+                rows = self.db.query(MinHashBand.band_hash, MinHashBand.raw_data_id).filter(
+                    MinHashBand.band == band, MinHashBand.band_hash.in_(chunk)
+                ).all()
+                for band_hash, raw_data_id in rows:
+                    candidates.setdefault((band, band_hash), []).append(raw_data_id)
+        return candidates
+
+    def _load(self, ids: List[int]) -> Dict[int, Tuple[np.ndarray, int]]:
+        """Signature and cluster of stored rows"""
+        loaded = {}
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self.db.query(RawData.id, RawData.minhash_signature, RawData.duplicate_cluster_id).filter(
+                RawData.id.in_(chunk)
+            ).all()
+            for row_id, signature, cluster_id in rows:
+                if signature is not None:
+                    loaded[row_id] = (np.frombuffer(signature, dtype=np.uint32), cluster_id or row_id)
+        return loaded
+
+    def assign_clusters(self, inserted: List[Tuple[int, bytes]]) -> int:
+        """Cluster newly inserted rows, given as (id, signature), and index their bands.
+
+        Returns the number of rows that joined an existing cluster.
+        """
+        inserted = [(row_id, np.frombuffer(signature, dtype=np.uint32)) for row_id, signature in inserted if signature]
+        if not inserted:
+            return 0
+        new_ids = {row_id for row_id, _ in inserted}
+        bands = {row_id: self.band_hashes(signature) for row_id, signature in inserted}
+
+        keys = sorted({(band, band_hash) for hashes in bands.values() for band, band_hash in enumerate(hashes)})
+        candidates = self._candidates(keys)
+        stored_ids = sorted({
+            candidate for ids in candidates.values() for candidate in ids if candidate not in new_ids
+        })
+        stored = self._load(stored_ids)
+
+        # Rows in this batch are matched against each other too, in id order
+        clusters = {}
+        signatures = {}
+        batch = {}
+        duplicates = 0
+        for row_id, signature in sorted(inserted, key=lambda item: item[0]):
+            cluster_id = row_id
+            matches = {
+                candidate
+                for band, band_hash in enumerate(bands[row_id])
+                for candidate in candidates.get((band, band_hash), []) + batch.get((band, band_hash), [])
+            }
+            for candidate in sorted(matches):
+                if candidate in stored:
+                    candidate_signature, candidate_cluster = stored[candidate]
+                elif candidate in clusters:
+                    candidate_signature, candidate_cluster = signatures[candidate], clusters[candidate]
+                else:
+                    continue
+                if similarity(signature, candidate_signature) >= self.threshold:
+                    cluster_id = candidate_cluster
+                    duplicates += 1
+                    break
+            clusters[row_id] = cluster_id
+            signatures[row_id] = signature
+            for band, band_hash in enumerate(bands[row_id]):
+                batch.setdefault((band, band_hash), []).append(row_id)
+
+        self.db.execute(insert(MinHashBand), [
+            {"band": band, "band_hash": band_hash, "raw_data_id": row_id}
+            for row_id, hashes in bands.items()
+            for band, band_hash in enumerate(hashes)
+        ])
+        self.db.execute(
+            update(RawData.__table__).where(RawData.__table__.c.id == bindparam("row_id")).values(
+                duplicate_cluster_id=bindparam("cluster_id")
+            ),
+            [{"row_id": row_id, "cluster_id": cluster_id} for row_id, cluster_id in clusters.items()]
+        )
+        return duplicates
+
+    def cluster_pending(self, limit: int) -> Tuple[int, int]:
+        """Sign and cluster up to limit rows stored without a cluster, oldest first.
+
+        Bulk file loads insert rows unclustered and catch up here afterwards;
+        pending rows are found through the duplicate_cluster_id index. A
+        signature stored with the row is reused, otherwise it is computed
+        here. Rows without words get a cluster of their own so they are not
+        picked up again. Returns (rows processed, rows that joined an
+        existing cluster).
+        """
+        rows = self.db.query(RawData.id, RawData.title, RawData.content, RawData.minhash_signature).filter(
+            RawData.duplicate_cluster_id.is_(None)
+        ).order_by(RawData.id).limit(limit).all()
+        if not rows:
+            return 0, 0
+        signed = []
+        for row_id, title, content, signature in rows:
+            if signature is None:
+                signature = minhash_signature(row_text({"title": title, "content": content}))
+                signature = signature.tobytes() if signature is not None else None
+            signed.append((row_id, signature))
+
+        table = RawData.__table__
+        self.db.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values(
+                minhash_signature=bindparam("signature"),
+                duplicate_cluster_id=bindparam("cluster_id")
+            ),
+            [
+                {"row_id": row_id, "signature": signature, "cluster_id": None if signature else row_id}
+                for row_id, signature in signed
+            ]
+        )
+        return len(rows), self.assign_clusters([(row_id, signature) for row_id, signature in signed if signature])
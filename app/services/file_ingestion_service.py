@@ -0,0 +1,243 @@
+"""
+Service for loading offline JSONL and CSV dumps of source API records
+"""
+import io
+import os
+import csv
+import gzip
+import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple, BinaryIO, Iterator, Callable
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import write_lock
+from app.services.ingestion_service import IngestionService, news_article_to_row, tweet_to_row
+from app.services.dedup_service import NearDuplicateService, minhash_signature, row_text
+
+# How each raw_data source's records map to rows, as on the API paths
+RECORD_NORMALIZERS = {"news": news_article_to_row, "twitter": tweet_to_row}
+
+FILE_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# Parse errors reported per run; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+def detect_format(filename: str) -> Optional[str]:
+    """File format from a name such as dump.jsonl or dump.csv.gz"""
+    name = filename.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    return FILE_FORMATS.get(os.path.splitext(name)[1])
+
+def open_dump(path: str) -> BinaryIO:
+    """Open a dump for reading, decompressing .gz files on the fly"""
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+def read_chunks(stream: BinaryIO, file_format: str, chunk_rows: int) -> Iterator[Tuple[int, bytes]]:
+    """Split a dump into blocks of about chunk_rows records, as (first line number, bytes).
+
+    Blocks end on record boundaries: for CSV, a line break inside a quoted
+    field is not one, which is tracked by the parity of quote characters.
+    Only one block is held at a time.
+    """
+    lines: List[bytes] = []
+    first_line = 1
+    line_number = 0
+    in_quotes = False
+    for line in stream:
+        line_number += 1
+        lines.append(line)
+        if file_format == "csv" and line.count(b'"') % 2:
+            in_quotes = not in_quotes
+        if len(lines) >= chunk_rows and not in_quotes:
+            yield first_line, b"".join(lines)
+            lines = []
+            first_line = line_number + 1
+    if lines:
+        yield first_line, b"".join(lines)
+
+def unflatten(record: Dict[str, str]) -> Dict[str, Any]:
+    """Nest dotted CSV columns (source.name, public_metrics.like_count) and turn empty cells into None"""
+    nested: Dict[str, Any] = {}
+    for column, value in record.items():
+        if column is None:
+            continue
+        target = nested
+        *parents, name = column.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value if value != "" else None
+    return nested
+
+def parse_chunk(
+    source: str,
+    file_format: str,
+    header: Optional[List[str]],
+    first_line: int,
+    data: bytes
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Parse and normalize one block into raw_data rows with MinHash signatures.
+
+    Runs in a worker process; returns the rows and an error per unparseable record.
+    """
+    normalize = RECORD_NORMALIZERS[source]
+    records: List[Tuple[int, Any]] = []
+    errors = []
+    if file_format == "jsonl":
+        for offset, line in enumerate(data.splitlines()):
+            if not line.strip():
+                continue
+            try:
+                records.append((first_line + offset, json.loads(line)))
+            except ValueError as e:
+                errors.append(f"line {first_line + offset}: {e}")
+    else:
+        reader = csv.DictReader(io.StringIO(data.decode("utf-8")), fieldnames=header, strict=True)
+        try:
+            for record in reader:
+                records.append((first_line + reader.line_num - 1, unflatten(record)))
+        except csv.Error as e:
+            # The reader cannot resynchronize, so the rest of the block is lost
+            errors.append(f"line {first_line + reader.line_num - 1}: {e}")
+
+    rows = []
+    for line, record in records:
+        if not isinstance(record, dict):
+            errors.append(f"line {line}: expected an object")
+            continue
+        try:
+            row = normalize(record)
+        except (TypeError, ValueError, AttributeError) as e:
+            errors.append(f"line {line}: {e}")
+            continue
+        # raw_data.content is NOT NULL; an insert without it would fail the whole block
+        if row.get("content") is None:
+            errors.append(f"line {line}: record has no text")
+            continue
+        signature = minhash_signature(row_text(row))
+        row["minhash_signature"] = signature.tobytes() if signature is not None else None
+        rows.append(row)
+    return rows, errors
+
+class FileIngestionService:
+    """Streams a dump through parsing workers into IngestionService.bulk_insert.
+
+    The file is read in blocks of chunk_rows records. Worker processes
+    parse and normalize blocks and compute their MinHash signatures, the
+    CPU-heavy part of ingestion, while this process writes earlier blocks
+    in order, committing each. At most two blocks per worker are in flight,
+    so memory stays flat however large the file is. Workers are spawned
+    rather than forked, since loads run on threads of the API server.
+
+    Matching the signatures against stored rows is left out of the load:
+    with cluster on, the rows are clustered in a second pass once every
+    block is stored, and otherwise they wait for the next load that
+    clusters.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        workers: Optional[int] = settings.FILE_INGESTION_WORKERS,
+        chunk_rows: int = settings.FILE_INGESTION_CHUNK_ROWS
+    ):
+        self.db = db
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+
+    def ingest(
+        self,
+        stream: BinaryIO,
+        source: str,
+        file_format: str,
+        progress: Optional[Callable[[int], None]] = None,
+        cluster: bool = True
+    ) -> Dict[str, Any]:
+        """Load every record of a binary stream; returns row and error counts"""
+        if source not in RECORD_NORMALIZERS:
+            raise ValueError(f"Unknown source: {source}")
+        if file_format not in ("jsonl", "csv"):
+            raise ValueError(f"Unknown file format: {file_format}")
+
+        header = None
+        first_line = 1
+        if file_format == "csv":
+            header = next(csv.reader([stream.readline().decode("utf-8-sig")]), None)
+            if not header:
+                raise ValueError("CSV file has no header row")
+            first_line = 2
+
+        service = IngestionService(self.db)
+        result = {
+            "source": source, "format": file_format, "records": 0, "count": 0, "skipped": 0,
+            "errors": [], "clustered": 0, "near_duplicates": 0
+        }
+
+        def store(line: int, rows: List[Dict[str, Any]], errors: List[str]):
+            result["records"] += len(rows) + len(errors)
+            result["skipped"] += len(errors)
+            result["errors"].extend(errors[:MAX_REPORTED_ERRORS - len(result["errors"])])
+            if rows:
+                with write_lock:
+                    try:
+                        count = service.bulk_insert(source, rows, cluster=False)
+                        service.commit()
+                        result["count"] += count
+                    except SQLAlchemyError as e:
+                        # Only this block is lost; later blocks are still stored
+                        service.rollback()
+                        result["skipped"] += len(rows)
+                        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+                            result["errors"].append(f"block from line {line}: {getattr(e, 'orig', None) or e}")
+            if progress:
+                progress(result["count"])
+
+        chunks = (
+            (start + first_line - 1, data)
+            for start, data in read_chunks(stream, file_format, self.chunk_rows)
+        )
+        if self.workers == 1:
+            for line, data in chunks:
+                store(line, *parse_chunk(source, file_format, header, line, data))
+        else:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as executor:
+                pending = deque()
+                for line, data in chunks:
+                    pending.append((line, executor.submit(parse_chunk, source, file_format, header, line, data)))
+                    if len(pending) >= 2 * self.workers:
+                        line, future = pending.popleft()
+                        store(line, *future.result())
+                while pending:
+                    line, future = pending.popleft()
+                    store(line, *future.result())
+
+        if cluster:
+            near_duplicates = NearDuplicateService(self.db)
+            while True:
+                with write_lock:
+                    clustered, duplicates = near_duplicates.cluster_pending(self.chunk_rows)
+                    if not clustered:
+                        break
+                    service.commit()
+                result["clustered"] += clustered
+                result["near_duplicates"] += duplicates
+        return result
+
+    def ingest_path(
+        self,
+        path: str,
+        source: str,
+        file_format: Optional[str] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        cluster: bool = True
+    ) -> Dict[str, Any]:
+        """Load a dump from disk, detecting its format from the file name if not given"""
+        file_format = file_format or detect_format(path)
+        if file_format is None:
+            raise ValueError(f"Cannot tell the format of {path}; expected .jsonl or .csv")
+        with open_dump(path) as stream:
+            return self.ingest(stream, source, file_format, progress, cluster)
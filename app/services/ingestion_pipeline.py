@@ -0,0 +1,212 @@
+"""
+Fetch, normalize and write stages of an ingestion run, joined by bounded queues
+"""
+import time
+import asyncio
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable
+from fastapi.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.database import write_lock
+
+# Put on a queue by a stage that has finished
+_DONE = object()
+
+class StageQueue(asyncio.Queue):
+    """Bounded queue that records its depth and how long producers waited on it"""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize)
+        self.puts = 0
+        self.depth_total = 0
+        self.max_depth = 0
+        self.full_waits = 0
+        self.blocked_seconds = 0.0
+
+    async def put(self, item):
+        if self.full():
+            # The consumer is behind: the producer waits instead of running ahead
+            self.full_waits += 1
+            started = time.perf_counter()
+            await super().put(item)
+            self.blocked_seconds += time.perf_counter() - started
+        else:
+            self.put_nowait(item)
+        if item is not _DONE:
+            self.puts += 1
+            self.depth_total += self.qsize()
+            self.max_depth = max(self.max_depth, self.qsize())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "maxsize": self.maxsize,
+            "mean_depth": round(self.depth_total / self.puts, 2) if self.puts else 0,
+            "max_depth": self.max_depth,
+            "full_waits": self.full_waits,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
+
+class StageStats:
+    def __init__(self):
+        self.pages = 0
+        self.rows = 0
+        self.seconds = 0.0
+
+    def record(self, rows: int, started: float, pages: int = 1):
+        self.pages += pages
+        self.rows += rows
+        self.seconds += time.perf_counter() - started
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "pages": self.pages,
+            "rows": self.rows,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows / self.seconds) if self.seconds else None,
+        }
+
+class IngestionPipeline:
+    """Runs the pages of one query through fetch -> normalize -> write.
+
+    Each stage is a task and hands pages to the next over a queue of
+    queue_size pages, so fetching the next page, mapping API items to
+    raw_data rows and writing the previous page overlap. When the writer
+    falls behind the queues fill up and the earlier stages wait, which
+    bounds memory and stops pages from being requested before they can be
+    stored. Writes run on a worker thread. Each call writes the pages that
+    are already waiting, up to commit_batch_size rows, and commits before
+    returning, under the process-wide write_lock. The SQLite write lock is
+    therefore never held while the loop awaits a page, and a failure keeps
+    every batch committed before it.
+
+    Stage seconds count time spent working: waiting for the API in fetch,
+    mapping in normalize, inserting and committing in write. The queue
+    stats show where pages piled up.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[List[Dict[str, Any]]], int],
+        commit: Callable[[], None],
+        rollback: Callable[[], None],
+        commit_batch_size: int = settings.INGESTION_COMMIT_BATCH_SIZE,
+        queue_size: int = settings.INGESTION_QUEUE_SIZE
+    ):
+        self.write = write
+        self.commit = commit
+        self.rollback = rollback
+        self.commit_batch_size = commit_batch_size
+        self.queue_size = queue_size
+
+    async def run(
+        self,
+        pages: AsyncIterator[List[Dict[str, Any]]],
+        normalize: Callable[[Dict[str, Any]], Dict[str, Any]],
+        progress: Optional[Callable[[int], None]] = None,
+        stop_when_stored: bool = False
+    ) -> Dict[str, Any]:
+        """Ingest pages of API items; returns the rows inserted and stage stats.
+
+        With stop_when_stored, a page whose rows were all stored already
+        ends the run, for APIs that return the newest items first.
+        """
+        fetched: StageQueue = StageQueue(self.queue_size)
+        normalized: StageQueue = StageQueue(self.queue_size)
+        stats = {"fetch": StageStats(), "normalize": StageStats(), "write": StageStats()}
+        started = time.perf_counter()
+
+        async def fetch():
+            try:
+                while True:
+                    page_started = time.perf_counter()
+                    try:
+                        items = await pages.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    stats["fetch"].record(len(items), page_started)
+                    await fetched.put(items)
+            finally:
+                await pages.aclose()
+
+        async def transform():
+            while (items := await fetched.get()) is not _DONE:
+                page_started = time.perf_counter()
+                rows = [normalize(item) for item in items]
+                stats["normalize"].record(len(rows), page_started)
+                await normalized.put(rows)
+
+        async def stage(body, out: StageQueue):
+            """Run a producing stage, then tell the next one it has finished"""
+            try:
+                await body()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await out.put(_DONE)
+                raise
+            await out.put(_DONE)
+
+        inserted = 0
+
+        def write_batch(batch: List[List[Dict[str, Any]]]) -> List[int]:
+            """Write pages in one transaction and commit it; returns rows inserted per page"""
+            counts = []
+            with write_lock:
+                for rows in batch:
+                    counts.append(self.write(rows))
+                    if stop_when_stored and counts[-1] == 0:
+                        break
+                self.commit()
+            return counts
+
+        async def store():
+            nonlocal inserted
+            finished = False
+            while not finished:
+                batch = [await normalized.get()]
+                # Pages already waiting join the same transaction
+                while (
+                    batch[-1] is not _DONE
+                    and not normalized.empty()
+                    and sum(len(rows) for rows in batch) < self.commit_batch_size
+                ):
+                    batch.append(normalized.get_nowait())
+                if batch[-1] is _DONE:
+                    finished = True
+                    batch.pop()
+                if not batch:
+                    break
+                batch_started = time.perf_counter()
+                counts = await run_in_threadpool(write_batch, batch)
+                inserted += sum(counts)
+                stats["write"].record(sum(len(rows) for rows in batch[:len(counts)]), batch_started, len(counts))
+                if progress:
+                    progress(inserted)
+                if stop_when_stored and counts[-1] == 0:
+                    return
+
+        producers = [asyncio.create_task(stage(fetch, fetched)), asyncio.create_task(stage(transform, normalized))]
+        try:
+            await store()
+        except Exception:
+            await run_in_threadpool(self.rollback)
+            raise
+        finally:
+            # Producers stop here if the writer returned early or failed;
+            # otherwise they have finished and this only collects their errors
+            for task in producers:
+                task.cancel()
+            errors = [
+                result for result in await asyncio.gather(*producers, return_exceptions=True)
+                if isinstance(result, Exception)
+            ]
+        # Pages written before an upstream failure are committed already
+        if errors:
+            raise errors[0]
+
+        return {
+            "count": inserted,
+            "pages": stats["write"].pages,
+            "seconds": round(time.perf_counter() - started, 3),
+            "stages": {name: stage_stats.as_dict() for name, stage_stats in stats.items()},
+            "queues": {"fetched": fetched.stats(), "normalized": normalized.stats()},
+        }
@@ -1,12 +1,142 @@
 """
 Service for handling data ingestion from various sources
 """
+from datetime import datetime, timezone
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional
-from app.models.data_models import RawData
+from typing import Dict, Any, Optional, List, Iterable, Set, Callable
+from app.core.database import write_lock
+from app.models.data_models import RawData, DataSource
 from app.services.news_service import NewsService
 from app.services.twitter_service import TwitterService
+from app.services.count_cache import count_cache
+from app.services.response_cache import response_cache
+from app.services.rollup_service import RollupService
+from app.services.dedup_service import NearDuplicateService
+from app.services.metadata_store import MetadataStore
+from app.services.ingestion_pipeline import IngestionPipeline
 from app.core.config import settings
+from app.core.metrics import ingested_rows
+
+# SQLite limits bound parameters per statement, so IN lookups are chunked
+LOOKUP_CHUNK_SIZE = 500
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp from a source API into a naive UTC datetime"""
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    # DateTime columns store wall time without an offset, so store UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def news_article_to_row(article: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a News API article to a raw_data row"""
+    return {
+        "source": "news",
+        "source_id": article.get("url"),
+        "title": article.get("title"),
+        "content": (article.get("description") or "") + " " + (article.get("content") or ""),
+        "author": article.get("author"),
+        "url": article.get("url"),
+        "published_at": parse_datetime(article.get("publishedAt")),
+        "raw_metadata": article,
+    }
+
+def tweet_to_row(tweet: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a tweet dictionary to a raw_data row"""
+    created_at = tweet.get("created_at")
+    metadata = dict(tweet)
+    if isinstance(created_at, datetime):
+        metadata["created_at"] = created_at.isoformat()
+    return {
+        "source": "twitter",
+        "source_id": str(tweet.get("id")) if tweet.get("id") is not None else None,
+        "title": None,
+        "content": tweet.get("text"),
+        "author": str(tweet.get("author_id")) if tweet.get("author_id") is not None else None,
+        "url": f"https://twitter.com/user/status/{tweet.get('id')}",
+        "published_at": parse_datetime(created_at),
+        "raw_metadata": metadata,
+    }
+
+def news_source_name(query: str, language: str) -> str:
+    """DataSource name under which a News API query's fetch state is kept"""
+    return f"news:{language}:{query}"
+
+def twitter_source_name(query: str) -> str:
+    """DataSource name under which a Twitter search's fetch state is kept"""
+    return f"twitter:{query}"
+
+def article_published_at(article: Dict[str, Any]) -> Optional[datetime]:
+    return parse_datetime(article.get("publishedAt"))
+
+def tweet_id(tweet: Dict[str, Any]) -> Optional[int]:
+    return int(tweet["id"]) if tweet.get("id") is not None else None
+
+def _encode(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+class FetchWindow:
+    """Bounds of one incremental run of a query and the fetch state it leaves.
+
+    Sources return the newest items first, so a run that hits its item
+    limit before reaching the watermark (the newest item of an earlier
+    complete run) leaves a gap between the watermark and the oldest item
+    it fetched. The watermark then stays where it is and the gap is kept
+    in the state; later runs page backwards through it, before the oldest
+    item fetched so far, and only the run that reaches the watermark moves
+    it up to the newest item seen.
+    """
+
+    def __init__(self, config: Dict[str, Any], key: str, parse: Callable[[Any], Any], incremental: bool = True):
+        self.key = key
+        self.incremental = incremental
+        self.watermark = parse(config[key]) if config.get(key) else None
+        gap = (config.get("gap") or {}) if incremental else {}
+        # Items are requested after `after` and, while a gap is open, before `before`
+        self.after = self.watermark if incremental else None
+        self.before = parse(gap["before"]) if gap.get("before") else None
+        self.gap_newest = parse(gap["newest"]) if gap.get("newest") else None
+        self.newest = None
+        self.oldest = None
+        self.fetched = 0
+
+    @classmethod
+    def news(cls, config: Dict[str, Any], incremental: bool = True) -> "FetchWindow":
+        return cls(config, "newest_published_at", parse_datetime, incremental)
+
+    @classmethod
+    def twitter(cls, config: Dict[str, Any], incremental: bool = True) -> "FetchWindow":
+        return cls(config, "since_id", int, incremental)
+
+    def record(self, values: List[Any]):
+        """Note a fetched page by its items' publishedAt or id"""
+        self.fetched += len(values)
+        values = [value for value in values if value is not None]
+        if values:
+            self.newest = max(values + ([self.newest] if self.newest is not None else []))
+            self.oldest = min(values + ([self.oldest] if self.oldest is not None else []))
+
+    def state(self, limit: int) -> Dict[str, Any]:
+        """Fetch state to save once every fetched item is stored.
+
+        A run that fetched fewer than limit items ran out of results, so it
+        reached the watermark; a first run has no watermark to reach.
+        """
+        if self.fetched >= limit and (self.watermark or self.before):
+            if not self.incremental or self.oldest is None:
+                return {}
+            return {"gap": {"before": _encode(self.oldest), "newest": _encode(self.gap_newest or self.newest)}}
+        newest = max([value for value in (self.watermark, self.gap_newest, self.newest) if value], default=None)
+        return {self.key: _encode(newest) if newest else None, "gap": None}
 
 class IngestionService:
     def __init__(self, db: Session):
@@ -14,82 +144,253 @@ class IngestionService:
         self.news_service = NewsService()
         self.twitter_service = TwitterService()
 
+    def existing_source_ids(self, source: str, source_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of source_ids already stored for a source"""
+        source_ids = list(source_ids)
+        existing = set()
+        for start in range(0, len(source_ids), LOOKUP_CHUNK_SIZE):
+            chunk = source_ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self.db.query(RawData.source_id).filter(
+                RawData.source == source,
+                RawData.source_id.in_(chunk)
+            ).all()
+            existing.update(row[0] for row in rows)
+        return existing
+
+    def inserted_rows(self, source: str, source_ids: Iterable[str]) -> List[tuple]:
+        """Return (id, source_id, minhash_signature) of stored rows for a source's source_ids"""
+        source_ids = list(source_ids)
+        rows = []
+        for start in range(0, len(source_ids), LOOKUP_CHUNK_SIZE):
+            chunk = source_ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows.extend(self.db.query(RawData.id, RawData.source_id, RawData.minhash_signature).filter(
+                RawData.source == source,
+                RawData.source_id.in_(chunk)
+            ).all())
+        return rows
+
+    def fetch_state(self, name: str, source_type: str, config: Dict[str, Any]) -> DataSource:
+        """The DataSource row that remembers how far a query has been fetched, created on first use"""
+        data_source = self.db.query(DataSource).filter(DataSource.name == name).first()
+        if data_source is None:
+            # Inactive, so the orchestrator does not repeat an ad-hoc query;
+            # scripts/run_orchestrator.py add activates it
+            data_source = DataSource(name=name, source_type=source_type, config=config, is_active="false")
+            with write_lock:
+                self.db.add(data_source)
+                try:
+                    self.db.commit()
+                    # Loaded here, so reading it later does not query from the event loop
+                    self.db.refresh(data_source)
+                except IntegrityError:
+                    # Another job for the same query created it first
+                    self.db.rollback()
+                    data_source = self.db.query(DataSource).filter(DataSource.name == name).one()
+        return data_source
+
+    def save_fetch_state(self, data_source: DataSource, **state: Any):
+        """Merge state into a DataSource's config and stamp last_fetch"""
+        with write_lock:
+            # A new dict, so the JSON column registers the change
+            data_source.config = {**(data_source.config or {}), **state}
+            data_source.last_fetch = datetime.utcnow()
+            self.db.commit()
+
+    def commit(self):
+        """Commit rows written by bulk_insert and drop cached /data responses.
+
+        Every write path commits through here: invalidating only after the
+        commit means a read in between cannot cache pre-commit data under
+        the new cache version.
+        """
+        self.db.commit()
+        response_cache.invalidate()
+
+    def rollback(self):
+        self.db.rollback()
+        # bulk_insert counted rows that are now gone
+        count_cache.clear()
+
+    def pipeline(self, source: str) -> IngestionPipeline:
+        """A fetch -> normalize -> write pipeline storing rows for a raw_data source"""
+        return IngestionPipeline(
+            write=lambda rows: self.bulk_insert(source, rows),
+            commit=self.commit,
+            rollback=self.rollback
+        )
+
+    def _insert_statement(self):
+        """Build an INSERT that ignores (source, source_id) conflicts where supported"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            return insert(RawData)
+        return dialect_insert(RawData).on_conflict_do_nothing(
+            index_elements=["source", "source_id"]
+        )
+
+    def bulk_insert(self, source: str, rows: List[Dict[str, Any]], cluster: bool = True) -> int:
+        """Insert rows for one source, skipping items already stored.
+
+        Existing rows are found with one IN query per chunk instead of one
+        query per item, and survivors are written with a single Core
+        executemany. Returns the number of rows inserted; callers make them
+        visible with commit(). With cluster off, near-duplicate clustering
+        is left to NearDuplicateService.cluster_pending.
+        """
+        # Drop duplicates within the batch itself, keeping the first occurrence
+        new_rows = []
+        seen = set()
+        for row in rows:
+            source_id = row.get("source_id")
+            if source_id is not None:
+                if source_id in seen:
+                    continue
+                seen.add(source_id)
+            new_rows.append(row)
+
+        existing = self.existing_source_ids(source, seen)
+        new_rows = [row for row in new_rows if row.get("source_id") not in existing]
+
+        if new_rows:
+            # Stamped here so the rollups bucket the same created_at that is stored
+            created_at = datetime.utcnow()
+            for row in new_rows:
+                row.setdefault("created_at", created_at)
+            near_duplicates = NearDuplicateService(self.db)
+            if cluster:
+                near_duplicates.prepare(new_rows)
+
+            # Rows without a source_id cannot be found again by id, so they keep
+            # their payload inline
+            payloads = {}
+            if settings.RAW_METADATA_STORAGE == "compressed":
+                payloads = {
+                    row["source_id"]: row["raw_metadata"]
+                    for row in new_rows if row.get("source_id") is not None
+                }
+                new_rows = [
+                    {**row, "raw_metadata": None} if row.get("source_id") is not None else row
+                    for row in new_rows
+                ]
+
+            self.db.execute(self._insert_statement(), new_rows)
+
+            # Clustering and side-table payloads need the new ids, which
+            # executemany does not return
+            inserted = self.inserted_rows(
+                source, [row["source_id"] for row in new_rows if row.get("source_id") is not None]
+            )
+            clustered = 0
+            if cluster:
+                clustered = near_duplicates.assign_clusters([(row_id, signature) for row_id, _, signature in inserted])
+            MetadataStore(self.db).save({
+                row_id: payloads[source_id]
+                for row_id, source_id, _ in inserted
+                if payloads.get(source_id) is not None
+            })
+            RollupService(self.db).add_rows(new_rows)
+            count_cache.increment(source, len(new_rows))
+            ingested_rows.inc(len(new_rows), source=source, outcome="inserted")
+            ingested_rows.inc(clustered, source=source, outcome="near_duplicate")
+        ingested_rows.inc(len(rows) - len(new_rows), source=source, outcome="duplicate")
+        return len(new_rows)
+
     async def ingest_news_data(
-        self, 
-        query: str, 
-        language: str = "en", 
-        page_size: int = 100
+        self,
+        query: str,
+        language: str = "en",
+        page_size: int = 100,
+        progress: Optional[Callable[[int], None]] = None,
+        incremental: bool = True
     ) -> Dict[str, Any]:
-        """Ingest data from News API"""
+        """Ingest data from News API
+
+        progress, if given, is called with the running row count after each page.
+        With incremental, only articles published since the newest one seen by
+        the last complete run of the same query and language are requested
+        (see FetchWindow).
+        """
         if not settings.NEWS_API_KEY:
             raise ValueError("News API key not configured")
-        
-        articles = await self.news_service.fetch_articles(
+
+        # Database work runs on a worker thread, like the pipeline's writes
+        state = await run_in_threadpool(
+            self.fetch_state, news_source_name(query, language), "news_api", {"query": query, "language": language}
+        )
+        window = FetchWindow.news(state.config or {}, incremental)
+        pages = self.news_service.iter_article_pages(
             query=query,
             language=language,
-            page_size=page_size
+            page_size=page_size,
+            published_from=window.after,
+            published_to=window.before
         )
-        
-        count = 0
-        for article in articles:
-            # Check if article already exists
-            existing = self.db.query(RawData).filter(
-                RawData.source == "news",
-                RawData.source_id == article.get("url")
-            ).first()
-            
-            if not existing:
-                raw_data = RawData(
-                    source="news",
-                    source_id=article.get("url"),
-                    title=article.get("title"),
-                    content=article.get("description", "") + " " + article.get("content", ""),
-                    author=article.get("author"),
-                    url=article.get("url"),
-                    published_at=article.get("publishedAt"),
-                    raw_metadata=article
-                )
-                self.db.add(raw_data)
-                count += 1
-        
-        self.db.commit()
-        return {"count": count, "query": query}
+
+        async def article_pages():
+            try:
+                async for _, articles in pages:
+                    window.record([article_published_at(article) for article in articles])
+                    yield articles
+            finally:
+                await pages.aclose()
+
+        # Results are sorted by publishedAt, so a fully stored page means
+        # every older page has been stored already
+        result = await self.pipeline("news").run(
+            article_pages(), news_article_to_row, progress=progress, stop_when_stored=True
+        )
+
+        await run_in_threadpool(self.save_fetch_state, state, **window.state(page_size))
+        return {
+            "count": result["count"],
+            "query": query,
+            "pages": result["pages"],
+            "pipeline": {name: result[name] for name in ("seconds", "stages", "queues")}
+        }
 
     async def ingest_twitter_data(
-        self, 
-        query: str, 
-        count: int = 100
+        self,
+        query: str,
+        count: int = 100,
+        progress: Optional[Callable[[int], None]] = None,
+        incremental: bool = True
     ) -> Dict[str, Any]:
-        """Ingest data from Twitter API"""
+        """Ingest data from Twitter API
+
+        progress, if given, is called with the running row count after each page.
+        With incremental, only tweets newer than the newest one seen by the
+        last complete run of the same query are requested (see FetchWindow).
+        """
         if not settings.TWITTER_BEARER_TOKEN:
             raise ValueError("Twitter API credentials not configured")
-        
-        tweets = await self.twitter_service.fetch_tweets(
+
+        state = await run_in_threadpool(self.fetch_state, twitter_source_name(query), "twitter", {"query": query})
+        window = FetchWindow.twitter(state.config or {}, incremental)
+        pages = self.twitter_service.fetch_tweets(
             query=query,
-            count=count
+            count=count,
+            since_id=str(window.after) if window.after else None,
+            until_id=str(window.before) if window.before else None
         )
-        
-        count = 0
-        for tweet in tweets:
-            # Check if tweet already exists
-            existing = self.db.query(RawData).filter(
-                RawData.source == "twitter",
-                RawData.source_id == tweet.get("id")
-            ).first()
-            
-            if not existing:
-                raw_data = RawData(
-                    source="twitter",
-                    source_id=tweet.get("id"),
-                    title=None,
-                    content=tweet.get("text"),
-                    author=tweet.get("author_id"),
-                    url=f"https://twitter.com/user/status/{tweet.get('id')}",
-                    published_at=tweet.get("created_at"),
-                    raw_metadata=tweet
-                )
-                self.db.add(raw_data)
-                count += 1
-        
-        self.db.commit()
-        return {"count": count, "query": query}
+
+        async def tweet_pages():
+            try:
+                async for tweets in pages:
+                    window.record([tweet_id(tweet) for tweet in tweets])
+                    yield tweets
+            finally:
+                await pages.aclose()
+
+        result = await self.pipeline("twitter").run(tweet_pages(), tweet_to_row, progress=progress)
+
+        await run_in_threadpool(self.save_fetch_state, state, **window.state(count))
+        return {
+            "count": result["count"],
+            "query": query,
+            "pages": result["pages"],
+            "pipeline": {name: result[name] for name in ("seconds", "stages", "queues")}
+        }
@@ -0,0 +1,278 @@
+"""
+In-process background queue for ingestion jobs
+"""
+import os
+import socket
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update, or_
+from app.core.config import settings
+from app.core.database import SessionLocal, write_lock
+from app.models.data_models import IngestionJob
+from app.services.ingestion_service import IngestionService
+from app.services.file_ingestion_service import FileIngestionService
+
+logger = logging.getLogger(__name__)
+
+JOB_TYPES = ("news", "twitter", "file")
+
+async def _run_ingestion(
+    service: IngestionService,
+    job_type: str,
+    params: Dict[str, Any],
+    progress
+) -> Dict[str, Any]:
+    """Dispatch a job to the matching IngestionService method"""
+    if job_type == "news":
+        return await service.ingest_news_data(
+            query=params["query"],
+            language=params.get("language", "en"),
+            page_size=params.get("page_size", 100),
+            progress=progress,
+            incremental=params.get("incremental", True)
+        )
+    elif job_type == "twitter":
+        return await service.ingest_twitter_data(
+            query=params["query"],
+            count=params.get("page_size", 100),
+            progress=progress,
+            incremental=params.get("incremental", True)
+        )
+    elif job_type == "file":
+        # Loading is blocking work, so the whole file runs on a worker thread
+        try:
+            return await run_in_threadpool(
+                FileIngestionService(service.db).ingest_path,
+                params["path"],
+                params["source"],
+                params.get("format"),
+                progress
+            )
+        finally:
+            # The upload was only kept for this job
+            if os.path.exists(params["path"]):
+                os.remove(params["path"])
+    raise ValueError(f"Unknown job type: {job_type}")
+
+class JobQueue:
+    """asyncio task queue drained by a fixed number of worker tasks.
+
+    Job records are persisted in ingestion_jobs; rows ingested by running
+    jobs are tracked in memory and only written when the job finishes.
+
+    Several API processes can share the table. A job is claimed with a
+    conditional update, so only one process runs it, and the claiming
+    process (its owner) keeps the job's heartbeat fresh while it runs.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.INGESTION_WORKERS,
+        heartbeat_seconds: float = settings.INGESTION_JOB_HEARTBEAT_SECONDS,
+        stale_seconds: float = settings.INGESTION_JOB_STALE_SECONDS
+    ):
+        self.workers = workers
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.owner: Optional[str] = None
+        self.progress: Dict[int, int] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """Start the workers and pick up jobs left over from a previous run"""
+        if self.running:
+            return
+        # Set here rather than at import, which may happen before a server forks
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+        for job_id in await run_in_threadpool(self._recover_jobs, self.stale_seconds):
+            self._queue.put_nowait(job_id)
+
+    @staticmethod
+    def _recover_jobs(stale_seconds: float) -> List[int]:
+        """Fail running jobs whose owner stopped sending heartbeats; returns the ids of queued jobs.
+
+        Jobs running in other live processes keep a fresh heartbeat and are
+        left alone. Queued jobs are picked up by every process that starts,
+        but only the first to claim one runs it.
+        """
+        db = SessionLocal()
+        try:
+            stale = datetime.utcnow() - timedelta(seconds=stale_seconds)
+            with write_lock:
+                for job in db.query(IngestionJob).filter(
+                    IngestionJob.status == "running",
+                    or_(IngestionJob.heartbeat_at.is_(None), IngestionJob.heartbeat_at < stale)
+                ):
+                    job.status = "failed"
+                    job.error = "Interrupted by application shutdown"
+                    job.finished_at = datetime.utcnow()
+                db.commit()
+            queued = db.query(IngestionJob.id).filter(
+                IngestionJob.status == "queued"
+            ).order_by(IngestionJob.id).all()
+            return [job_id for (job_id,) in queued]
+        finally:
+            db.close()
+
+    async def stop(self):
+        """Cancel the workers; queued jobs are resumed on the next start"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    @staticmethod
+    def _create_job(job_type: str, params: Dict[str, Any]) -> IngestionJob:
+        db = SessionLocal()
+        try:
+            job = IngestionJob(job_type=job_type, status="queued", params=params)
+            with write_lock:
+                db.add(job)
+                db.commit()
+            db.refresh(job)
+            return job
+        finally:
+            db.close()
+
+    async def submit(self, job_type: str, params: Dict[str, Any]) -> IngestionJob:
+        """Persist a new job and queue it for the workers.
+
+        The insert runs on a worker thread rather than an async session:
+        running jobs write through sync sessions on the event loop, and an
+        async insert left waiting for the loop to send its COMMIT would hold
+        SQLite's write lock while they wait on it.
+        """
+        if job_type not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {job_type}")
+        if not self.running:
+            await self.start()
+
+        job = await run_in_threadpool(self._create_job, job_type, params)
+        self._queue.put_nowait(job.id)
+        return job
+
+    @staticmethod
+    def _beat(owner: str):
+        db = SessionLocal()
+        try:
+            with write_lock:
+                db.execute(
+                    update(IngestionJob).where(
+                        IngestionJob.owner == owner, IngestionJob.status == "running"
+                    ).values(heartbeat_at=datetime.utcnow())
+                )
+                db.commit()
+        finally:
+            db.close()
+
+    async def _heartbeat(self):
+        """Refresh the heartbeat of this process's running jobs"""
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            if not self.progress:
+                continue
+            try:
+                await run_in_threadpool(self._beat, self.owner)
+            except Exception:
+                logger.exception("Could not refresh ingestion job heartbeats")
+
+    async def join(self):
+        """Wait until every queued job has finished"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception as e:
+                # Keep the worker alive and the job from staying "running"
+                logger.exception("Ingestion job %s failed", job_id)
+                try:
+                    await run_in_threadpool(self._finish_job, job_id, error=str(e))
+                except Exception:
+                    logger.exception("Could not mark ingestion job %s failed", job_id)
+            finally:
+                self.progress.pop(job_id, None)
+                self._queue.task_done()
+
+    @staticmethod
+    def _start_job(job_id: int, owner: str) -> Optional[IngestionJob]:
+        """Claim a queued job for owner; None if it is gone or was already picked up.
+
+        The status check and the claim are one UPDATE, so two processes
+        that queued the same job cannot both start it.
+        """
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            with write_lock:
+                claimed = db.execute(
+                    update(IngestionJob).where(
+                        IngestionJob.id == job_id, IngestionJob.status == "queued"
+                    ).values(status="running", owner=owner, started_at=now, heartbeat_at=now)
+                ).rowcount
+                db.commit()
+            if not claimed:
+                return None
+            return db.get(IngestionJob, job_id)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _finish_job(job_id: int, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None):
+        """Record a job's outcome: completed with its result, or failed with error"""
+        db = SessionLocal()
+        try:
+            with write_lock:
+                job = db.get(IngestionJob, job_id)
+                if error is None:
+                    job.status = "completed"
+                    job.rows_inserted = result["count"]
+                    job.result = result
+                else:
+                    job.status = "failed"
+                    job.error = error
+                job.finished_at = datetime.utcnow()
+                db.commit()
+        finally:
+            db.close()
+
+    async def _run_job(self, job_id: int):
+        """Run one job. Job rows are read and written on worker threads, so a
+        commit waiting on SQLite's write lock never blocks the event loop."""
+        job = await run_in_threadpool(self._start_job, job_id, self.owner)
+        if job is None:
+            return
+
+        self.progress[job_id] = 0
+        db = SessionLocal()
+        try:
+            result = await _run_ingestion(
+                IngestionService(db),
+                job.job_type,
+                job.params or {},
+                lambda count: self.progress.__setitem__(job_id, count)
+            )
+        except Exception as e:
+            await run_in_threadpool(db.rollback)
+            await run_in_threadpool(self._finish_job, job_id, error=str(e))
+        else:
+            await run_in_threadpool(self._finish_job, job_id, result=result)
+        finally:
+            await run_in_threadpool(db.close)
+
+job_queue = JobQueue()
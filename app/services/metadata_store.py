@@ -0,0 +1,116 @@
+"""
+Compressed side-table storage for raw_data.raw_metadata payloads
+"""
+import json
+import zlib
+from typing import Dict, Any, List, Iterable
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.data_models import RawData, RawMetadataBlob
+
+# SQLite limits bound parameters per statement, so IN lookups are chunked
+LOOKUP_CHUNK_SIZE = 500
+
+# Preset zlib dictionaries, keyed by the id stored with each blob. Payloads
+# are small JSON documents that repeat the same keys and boilerplate, which
+# a shared dictionary lets even a short payload back-reference. Add a new
+# id rather than editing one, since stored blobs need their original bytes.
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+METADATA_DICTIONARIES = {
+    1: (
+        b'{"id": 1, "text": "RT @", "author_id": "", "created_at": "2024-01-01T00:00:00+00:00", '
+        b'"public_metrics": {"retweet_count": 0, "reply_count": 0, "like_count": 0, "quote_count": 0, '
+        b'"bookmark_count": 0, "impression_count": 0}, "context_annotations": [], "entities": '
+        b'{"urls": [{"start": 0, "end": 23, "url": "https://t.co/", "expanded_url": "https://", '
+        b'"display_url": ""}], "hashtags": [{"start": 0, "end": 0, "tag": ""}], "mentions": '
+        b'[{"start": 0, "end": 0, "username": "", "id": ""}]}, "lang": "en", "possibly_sensitive": false, '
+        b'"conversation_id": "", "in_reply_to_user_id": null, "referenced_tweets": null, '
+        b'{"source": {"id": null, "name": ""}, "author": null, "title": "", "description": "", '
+        b'"url": "https://www.", "urlToImage": "https://", ".com/", ".jpg", ".png", '
+        b'"publishedAt": "2024-01-01T00:00:00Z", "content": "", " [+1000 chars]"}'
+    ),
+    # Built from template payloads with the same json.dumps call as
+    # compress_metadata, so its bytes match what is actually stored
+    2: _dumps({
+        "id": 1, "text": "RT @", "author_id": "", "created_at": "2024-01-01T00:00:00+00:00",
+        "public_metrics": {"retweet_count": 0, "reply_count": 0, "like_count": 0, "quote_count": 0,
+                           "bookmark_count": 0, "impression_count": 0},
+    }) + _dumps({
+        "source": {"id": None, "name": ""}, "author": None, "title": "", "description": "",
+        "url": "https://www.", "urlToImage": "https://", "publishedAt": "2024-01-01T00:00:00Z",
+        "content": " [+1000 chars]",
+    }),
+}
+CURRENT_DICTIONARY_ID = max(METADATA_DICTIONARIES)
+
+def compress_metadata(payload: Any, dictionary_id: int = CURRENT_DICTIONARY_ID) -> bytes:
+    compressor = zlib.compressobj(level=9, zdict=METADATA_DICTIONARIES[dictionary_id])
+    return compressor.compress(_dumps(payload)) + compressor.flush()
+
+def decompress_metadata(blob: bytes, dictionary_id: int) -> Any:
+    decompressor = zlib.decompressobj(zdict=METADATA_DICTIONARIES[dictionary_id])
+    return json.loads(decompressor.decompress(blob) + decompressor.flush())
+
+class MetadataStore:
+    """Reads and writes raw_metadata kept out of the raw_data table.
+
+    raw_data rows in compressed mode hold NULL raw_metadata, so scans of
+    the hot table skip the payloads; they are only read back here, one
+    IN query per page of rows that ask for them.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def save(self, payloads: Dict[int, Any]):
+        """Store compressed payloads keyed by raw_data id"""
+        if not payloads:
+            return
+        self.db.execute(insert(RawMetadataBlob), [
+            {"raw_data_id": row_id, "dictionary_id": CURRENT_DICTIONARY_ID, "payload": compress_metadata(payload)}
+            for row_id, payload in payloads.items()
+        ])
+
+    def load(self, ids: Iterable[int]) -> Dict[int, Any]:
+        """Decompressed payloads for the given raw_data ids that have one"""
+        ids = list(ids)
+        payloads = {}
+        for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+            chunk = ids[start:start + LOOKUP_CHUNK_SIZE]
+            rows = self.db.query(
+                RawMetadataBlob.raw_data_id, RawMetadataBlob.dictionary_id, RawMetadataBlob.payload
+            ).filter(RawMetadataBlob.raw_data_id.in_(chunk)).all()
+            for row_id, dictionary_id, blob in rows:
+                payloads[row_id] = decompress_metadata(blob, dictionary_id)
+        return payloads
+
+    def fill(self, items: List[Dict[str, Any]], ids: List[int]):
+        """Set raw_metadata on item dicts, parallel to ids, that have none inline"""
+        missing = [row_id for item, row_id in zip(items, ids) if item.get("raw_metadata") is None]
+        if not missing:
+            return
+        payloads = self.load(missing)
+        for item, row_id in zip(items, ids):
+            if item.get("raw_metadata") is None:
+                item["raw_metadata"] = payloads.get(row_id)
+
+    def compact(self, batch_size: int = 1000) -> int:
+        """Move inline raw_metadata into the side table; returns rows moved"""
+        moved = 0
+        last_id = 0
+        while True:
+            rows = self.db.query(RawData.id, RawData.raw_metadata).filter(
+                RawData.id > last_id,
+                RawData.raw_metadata.isnot(None)
+            ).order_by(RawData.id).limit(batch_size).all()
+            if not rows:
+                return moved
+            last_id = rows[-1][0]
+            self.save({row_id: payload for row_id, payload in rows})
+            self.db.query(RawData).filter(
+                RawData.id.in_([row_id for row_id, _ in rows])
+            ).update({RawData.raw_metadata: None}, synchronize_session=False)
+            self.db.commit()
+            moved += len(rows)
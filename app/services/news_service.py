@@ -1,76 +1,221 @@
 """
 Service for fetching data from News API
 """
-import requests
-from typing import List, Dict, Any, Optional
+import time
+import asyncio
+from datetime import datetime
+import httpx
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from app.core.config import settings
+from app.core.http import HTTPClient, get_http_client
+from app.core.metrics import upstream_request_duration
+from app.services.upstream_cache import upstream_cache
+from app.services.rate_limiter import rate_limiter, RetryableError
+
+# News API returns at most this many articles per page
+MAX_PAGE_SIZE = 100
+
+def _error_code(response: httpx.Response) -> Optional[str]:
+    """Extract the News API error code from an error response, if any"""
+    try:
+        return response.json().get("code")
+    except ValueError:
+        return None
 
 class NewsService:
-    def __init__(self):
+    def __init__(self, http_client: Optional[HTTPClient] = None):
         self.api_key = settings.NEWS_API_KEY
-        self.base_url = "https://newsapi.org/v2"
-    
-    async def fetch_articles(
-        self, 
-        query: str, 
-        language: str = "en", 
-        page_size: int = 100
-    ) -> List[Dict[str, Any]]:
-        """Fetch articles from News API"""
-        if not self.api_key:
-            raise ValueError("News API key not configured")
-        
+        self.base_url = settings.NEWS_API_BASE_URL
+        self.http_client = http_client
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a request through the shared client and unwrap the response.
+
+        Successful responses are cached per (url, params); a fresh entry
+        skips the request and an expired one is revalidated conditionally.
+        Requests wait for the API key's rate limit, and rate-limited or
+        failed requests are retried.
+        """
+        key = upstream_cache.key(url, params, exclude=("apiKey",))
+        cached = upstream_cache.get(key)
+        if cached is not None and cached.fresh:
+            upstream_cache.record_hit(cached)
+            return cached.data
+
+        client = self.http_client or get_http_client()
+        bucket = rate_limiter.bucket(
+            "news_api", self.api_key, settings.NEWS_API_REQUESTS_PER_SECOND, settings.NEWS_API_BURST
+        )
+
+        async def send() -> httpx.Response:
+            started = time.perf_counter()
+            try:
+                response = await client.get(url, params=params, headers=cached.validators() if cached else None)
+            except httpx.TransportError as e:
+                upstream_request_duration.observe(time.perf_counter() - started, api="news_api", status="error")
+                raise RetryableError(e)
+            upstream_request_duration.observe(
+                time.perf_counter() - started, api="news_api", status=response.status_code
+            )
+            if response.status_code == 429 or response.status_code >= 500:
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    raise RetryableError(e, response.headers, rate_limited=response.status_code == 429)
+            bucket.observe(response.headers)
+            return response
+
+        response = await rate_limiter.call(bucket, send)
+        if response.status_code == 304 and cached is not None:
+            upstream_cache.record_not_modified(cached)
+            return cached.data
+        upstream_cache.record_request(len(response.content))
+        response.raise_for_status()
+        data = response.json()
+        if data.get("status") == "ok":
+            upstream_cache.set(
+                key, data, len(response.content),
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified")
+            )
+        return data
+
+    async def _fetch_articles_page(
+        self,
+        query: str,
+        language: str,
+        page: int,
+        page_size: int,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Fetch a single page of articles from News API with the total result count"""
         url = f"{self.base_url}/everything"
         params = {
             "q": query,
             "language": language,
-            "pageSize": min(page_size, 100),  # News API max is 100
+            "pageSize": page_size,
+            "page": page,
             "apiKey": self.api_key,
             "sortBy": "publishedAt"
         }
-        
+        if published_from:
+            params["from"] = published_from.strftime("%Y-%m-%dT%H:%M:%S")
+        if published_to:
+            params["to"] = published_to.strftime("%Y-%m-%dT%H:%M:%S")
+
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
+            data = await self._get(url, params)
+
             if data.get("status") == "ok":
-                return data.get("articles", [])
+                return data.get("articles", []), data.get("totalResults", 0)
             else:
                 raise Exception(f"News API error: {data.get('message', 'Unknown error')}")
-                
-        except requests.RequestException as e:
+
+        except httpx.HTTPStatusError as e:
+            if page > 1 and _error_code(e.response) == "maximumResultsReached":
+                # The plan's result cap is reached; treat it as the last page
+                return [], 0
             raise Exception(f"Failed to fetch news data: {str(e)}")
-    
+        except httpx.HTTPError as e:
+            raise Exception(f"Failed to fetch news data: {str(e)}")
+
+    async def iter_article_pages(
+        self,
+        query: str,
+        language: str = "en",
+        page_size: int = 100,
+        max_concurrent_pages: int = settings.NEWS_API_MAX_CONCURRENT_PAGES,
+        published_from: Optional[datetime] = None,
+        published_to: Optional[datetime] = None
+    ) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Fetch up to page_size articles, yielding (page, articles) in page order.
+
+        published_from (naive UTC) limits results to articles published at
+        or after it, so a repeated query only asks for newer items; the
+        first page is then fetched alone and its totalResults decides how
+        many further pages to request. published_to likewise limits them
+        to articles published at or before it.
+
+        Pages are requested concurrently, at most max_concurrent_pages at a
+        time. Each page is yielded as soon as it and all earlier pages have
+        arrived, so a consumer that stops iterating (e.g. because a page was
+        already stored) cancels every page not yet fetched.
+        """
+        if not self.api_key:
+            raise ValueError("News API key not configured")
+        if page_size <= 0:
+            return
+
+        per_page = min(page_size, MAX_PAGE_SIZE)
+        page_count = -(-page_size // per_page)
+        semaphore = asyncio.Semaphore(max_concurrent_pages)
+
+        async def fetch_page(page: int) -> Tuple[List[Dict[str, Any]], int]:
+            async with semaphore:
+                return await self._fetch_articles_page(
+                    query, language, page, per_page, published_from, published_to
+                )
+
+        tasks = [asyncio.create_task(fetch_page(1))]
+        remaining = page_size
+        try:
+            if published_from:
+                _, total_results = await tasks[0]
+                page_count = min(page_count, max(1, -(-total_results // per_page)))
+            tasks += [asyncio.create_task(fetch_page(page)) for page in range(2, page_count + 1)]
+            for page, task in enumerate(tasks, start=1):
+                articles = (await task)[0][:remaining]
+                if not articles:
+                    break
+                remaining -= len(articles)
+                yield page, articles
+                if len(articles) < per_page or remaining <= 0:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def fetch_articles(
+        self,
+        query: str,
+        language: str = "en",
+        page_size: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Fetch articles from News API"""
+        articles = []
+        async for _, page_articles in self.iter_article_pages(query, language, page_size):
+            articles.extend(page_articles)
+        return articles
+
     async def fetch_top_headlines(
-        self, 
-        country: str = "us", 
+        self,
+        country: str = "us",
         category: Optional[str] = None,
         page_size: int = 100
     ) -> List[Dict[str, Any]]:
         """Fetch top headlines from News API"""
         if not self.api_key:
             raise ValueError("News API key not configured")
-        
+
         url = f"{self.base_url}/top-headlines"
         params = {
             "country": country,
-            "pageSize": min(page_size, 100),
+            "pageSize": min(page_size, MAX_PAGE_SIZE),
             "apiKey": self.api_key
         }
-        
+
         if category:
             params["category"] = category
-        
+
         try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
+            data = await self._get(url, params)
+
             if data.get("status") == "ok":
                 return data.get("articles", [])
             else:
                 raise Exception(f"News API error: {data.get('message', 'Unknown error')}")
-                
-        except requests.RequestException as e:
+
+        except httpx.HTTPError as e:
             raise Exception(f"Failed to fetch top headlines: {str(e)}")
@@ -0,0 +1,257 @@
+"""
+Concurrent ingestion of every active DataSource through a single writer
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal, write_lock
+from app.core.metrics import orchestrator_failed_runs
+from app.models.data_models import DataSource
+from app.services.news_service import NewsService
+from app.services.twitter_service import TwitterService
+from app.services.ingestion_service import (
+    IngestionService,
+    news_article_to_row,
+    tweet_to_row,
+    article_published_at,
+    tweet_id,
+    FetchWindow,
+)
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TYPES = ("news_api", "twitter")
+
+class FetchPacer:
+    """Spaces the start of fetches so they stay within a per-minute budget"""
+
+    def __init__(self, per_minute: float):
+        self.interval = 60 / per_minute if per_minute else 0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_start - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_start = max(now, self._next_start) + self.interval
+
+class IngestionOrchestrator:
+    """Runs the fetches of active data_sources rows concurrently.
+
+    Each source type has its own concurrency limit and fetch pacing, so a
+    slow or rate-limited API does not hold up the others. Fetchers only
+    produce rows; one writer drains them in batches, so the database sees
+    a single writer however many sources run. A source's fetch state and
+    last_fetch are saved by the writer once all of its rows are stored; a
+    failed fetch is recorded instead, and backs the source off (see is_due).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_concurrent: Optional[Dict[str, int]] = None,
+        fetches_per_minute: Optional[Dict[str, float]] = None,
+        write_batch_size: int = settings.ORCHESTRATOR_WRITE_BATCH_SIZE
+    ):
+        self.session_factory = session_factory
+        self.max_concurrent = max_concurrent or {
+            "news_api": settings.ORCHESTRATOR_MAX_CONCURRENT_NEWS,
+            "twitter": settings.ORCHESTRATOR_MAX_CONCURRENT_TWITTER,
+        }
+        self.fetches_per_minute = fetches_per_minute or {
+            "news_api": settings.ORCHESTRATOR_NEWS_FETCHES_PER_MINUTE,
+            "twitter": settings.ORCHESTRATOR_TWITTER_FETCHES_PER_MINUTE,
+        }
+        self.write_batch_size = write_batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def is_due(source: DataSource, now: datetime) -> bool:
+        """Due interval_seconds after the last fetch, or after a failed one with exponential backoff"""
+        config = source.config or {}
+        interval = config.get("interval_seconds", settings.ORCHESTRATOR_DEFAULT_INTERVAL_SECONDS)
+        failure = config.get("failure")
+        if failure:
+            backoff = min(
+                interval * 2 ** (failure["count"] - 1),
+                max(interval, settings.ORCHESTRATOR_MAX_BACKOFF_SECONDS)
+            )
+            return datetime.fromisoformat(failure["at"]) + timedelta(seconds=backoff) <= now
+        return source.last_fetch is None or source.last_fetch + timedelta(seconds=interval) <= now
+
+    def active_sources(self, db: Session, only_due: bool = False) -> List[DataSource]:
+        sources = db.query(DataSource).filter(
+            DataSource.is_active == "true",
+            DataSource.source_type.in_(SOURCE_TYPES)
+        ).order_by(DataSource.id).all()
+        if only_due:
+            now = datetime.utcnow()
+            sources = [source for source in sources if self.is_due(source, now)]
+        return sources
+
+    async def run_once(self, only_due: bool = False) -> Dict[str, Any]:
+        """Fetch every active source (or only those due) and store the results"""
+        db = self.session_factory()
+        try:
+            sources = [
+                {"id": source.id, "name": source.name, "source_type": source.source_type, "config": source.config or {}}
+                for source in self.active_sources(db, only_due)
+            ]
+            # End the read before the writer starts using the session
+            db.commit()
+
+            results = {source["id"]: {"name": source["name"], "fetched": 0, "status": "running"} for source in sources}
+            # Bounded, so fetchers wait instead of piling rows up in memory
+            queue: asyncio.Queue = asyncio.Queue(maxsize=max(len(sources), 1) * 4)
+            semaphores = {source_type: asyncio.Semaphore(limit) for source_type, limit in self.max_concurrent.items()}
+            pacers = {source_type: FetchPacer(rate) for source_type, rate in self.fetches_per_minute.items()}
+            writer = asyncio.create_task(self._write(db, queue))
+
+            async def fetch(source):
+                async with semaphores[source["source_type"]]:
+                    await pacers[source["source_type"]].wait()
+                    try:
+                        await self._fetch(source, queue, results[source["id"]])
+                    except Exception as e:
+                        results[source["id"]].update(status="failed", error=str(e))
+                        await queue.put(("failed", source["id"], None))
+
+            fetching = asyncio.gather(*(fetch(source) for source in sources))
+            try:
+                # The writer only finishes first by failing; fetchers waiting on
+                # the full queue would then wait forever, so they are stopped
+                await asyncio.wait([fetching, writer], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                fetching.cancel()
+                await asyncio.gather(fetching, return_exceptions=True)
+                if not writer.done():
+                    await queue.put(None)
+                inserted = await writer
+        finally:
+            db.close()
+
+        return {"sources": list(results.values()), "inserted": inserted}
+
+    async def _fetch(self, source: Dict[str, Any], queue: asyncio.Queue, result: Dict[str, Any]):
+        """Queue a source's rows page by page, then its new fetch state"""
+        config = source["config"]
+        incremental = config.get("incremental", True)
+        if source["source_type"] == "news_api":
+            if not settings.NEWS_API_KEY:
+                raise ValueError("News API key not configured")
+            window = FetchWindow.news(config, incremental)
+            limit = config.get("page_size", 100)
+            pages = NewsService().iter_article_pages(
+                query=config["query"],
+                language=config.get("language", "en"),
+                page_size=limit,
+                published_from=window.after,
+                published_to=window.before
+            )
+            try:
+                async for _, articles in pages:
+                    window.record([article_published_at(article) for article in articles])
+                    result["fetched"] += len(articles)
+                    await queue.put(("rows", "news", [news_article_to_row(article) for article in articles]))
+            finally:
+                await pages.aclose()
+        else:
+            window = FetchWindow.twitter(config, incremental)
+            limit = config.get("count", 100)
+            pages = TwitterService().fetch_tweets(
+                query=config["query"],
+                count=limit,
+                since_id=str(window.after) if window.after else None,
+                until_id=str(window.before) if window.before else None
+            )
+            try:
+                async for tweets in pages:
+                    window.record([tweet_id(tweet) for tweet in tweets])
+                    result["fetched"] += len(tweets)
+                    await queue.put(("rows", "twitter", [tweet_to_row(tweet) for tweet in tweets]))
+            finally:
+                await pages.aclose()
+        state = window.state(limit)
+        await queue.put(("done", source["id"], state))
+        result["status"] = "completed"
+
+    async def _write(self, db: Session, queue: asyncio.Queue) -> int:
+        """Drain the queue, inserting rows in batches per raw_data source"""
+        service = IngestionService(db)
+        pending: Dict[str, List[Dict[str, Any]]] = {}
+        inserted = 0
+
+        def flush() -> int:
+            count = 0
+            with write_lock:
+                for source, rows in pending.items():
+                    if rows:
+                        count += service.bulk_insert(source, rows)
+                pending.clear()
+                service.commit()
+            return count
+
+        def save_state(source_id: int, state: Dict[str, Any]) -> int:
+            # Rows come before state, so a source never claims rows it has not stored
+            count = flush()
+            service.save_fetch_state(db.get(DataSource, source_id), **state, failure=None)
+            return count
+
+        def save_failure(source_id: int):
+            # last_fetch stays put; is_due backs off from the failure instead
+            with write_lock:
+                data_source = db.get(DataSource, source_id)
+                config = data_source.config or {}
+                count = (config.get("failure") or {}).get("count", 0) + 1
+                data_source.config = {**config, "failure": {"count": count, "at": datetime.utcnow().isoformat()}}
+                db.commit()
+
+        while True:
+            item = await queue.get()
+            # Writes run on a worker thread so fetchers keep going meanwhile
+            if item is None:
+                return inserted + await run_in_threadpool(flush)
+            kind, key, payload = item
+            if kind == "done":
+                inserted += await run_in_threadpool(save_state, key, payload)
+                continue
+            if kind == "failed":
+                await run_in_threadpool(save_failure, key)
+                continue
+            pending.setdefault(key, []).extend(payload)
+            if sum(len(rows) for rows in pending.values()) >= self.write_batch_size:
+                inserted += await run_in_threadpool(flush)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, poll_seconds: float = settings.ORCHESTRATOR_POLL_SECONDS):
+        """Start the in-app scheduler, which runs due sources every poll_seconds"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._schedule(poll_seconds))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _schedule(self, poll_seconds: float):
+        while True:
+            try:
+                await self.run_once(only_due=True)
+            except Exception:
+                # A failed round is retried at the next poll
+                logger.exception("Orchestrator run failed")
+                orchestrator_failed_runs.inc()
+            await asyncio.sleep(poll_seconds)
+
+orchestrator = IngestionOrchestrator()
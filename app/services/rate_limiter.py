@@ -0,0 +1,244 @@
+"""
+Per-credential rate limiting and retries for source API requests
+"""
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional, Mapping, Callable, Awaitable, TypeVar
+from app.core.config import settings
+
+T = TypeVar("T")
+
+class RetryableError(Exception):
+    """Raised by a request attempt that may succeed if repeated.
+
+    rate_limited marks a quota response (429), whose headers may say when
+    capacity returns. error is raised in its place once retrying stops.
+    """
+
+    def __init__(self, error: Exception, headers: Optional[Mapping[str, str]] = None, rate_limited: bool = False):
+        super().__init__(str(error))
+        self.error = error
+        self.headers = headers or {}
+        self.rate_limited = rate_limited
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds until capacity returns, from Retry-After or x-rate-limit-reset"""
+    retry_after = headers.get("retry-after")
+    if retry_after is not None:
+        seconds = _header_float(headers, "retry-after")
+        if seconds is None:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            return max(0.0, seconds)
+    reset = _header_float(headers, "x-rate-limit-reset")
+    if reset is not None:
+        return max(0.0, reset - time.time())
+    return None
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+class TokenBucket:
+    """Request capacity of one credential at one API.
+
+    Until the API reports its quota, tokens refill at rate per second up to
+    burst; each rate-limited response halves the rate and each success wins
+    back a twentieth of it. Once x-rate-limit-remaining and
+    x-rate-limit-reset are seen, that window is used instead: its remaining
+    requests are sent without pacing, then requests wait for the reset.
+    State is behind a thread lock, since tweepy reports headers from its
+    worker threads.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, backoff_base: float, backoff_max: float):
+        self.name = name
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._strikes = 0
+        self._in_flight = 0
+        self._window_remaining: Optional[float] = None
+        self._window_reset = 0.0
+        self._window_reset_epoch: Optional[float] = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "waits": 0, "waited_seconds": 0.0}
+
+    def _reserve(self) -> float:
+        """Take capacity for one request, or return the seconds to wait for it"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._window_remaining is not None and now < self._window_reset:
+                if self._window_remaining < 1:
+                    return self._window_reset - now
+                self._window_remaining -= 1
+            else:
+                self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens < 1:
+                    return (1 - self.tokens) / self.rate
+                self.tokens -= 1
+            self._in_flight += 1
+            self.stats["requests"] += 1
+            return 0.0
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        waited = 0.0
+        while True:
+            delay = self._reserve()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+            waited += delay
+        if waited:
+            with self._lock:
+                self.stats["waits"] += 1
+                self.stats["waited_seconds"] += waited
+
+    def release(self):
+        """A request taken with acquire has completed"""
+        with self._lock:
+            self._in_flight -= 1
+
+    def observe(self, headers: Mapping[str, str]):
+        """Record a successful response and the quota it reports"""
+        remaining = _header_float(headers, "x-rate-limit-remaining")
+        reset = _header_float(headers, "x-rate-limit-reset")
+        with self._lock:
+            self._strikes = 0
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+            if remaining is None or reset is None:
+                return
+            if reset == self._window_reset_epoch:
+                # Responses to concurrent requests arrive out of order, so
+                # within a window only a lower count is news
+                remaining = min(remaining, self._window_remaining)
+            else:
+                # A new window: the other requests in flight may count against it
+                remaining = max(0.0, remaining - (self._in_flight - 1))
+            self._window_remaining = remaining
+            self._window_reset_epoch = reset
+            self._window_reset = time.monotonic() + max(0.0, reset - time.time())
+
+    def rate_limited(self, headers: Mapping[str, str]):
+        """Stop sending until the API says capacity is back, or back off if it does not say"""
+        wait = retry_after_seconds(headers)
+        with self._lock:
+            self.stats["rate_limited"] += 1
+            now = time.monotonic()
+            if wait is None:
+                if now < self._paused_until:
+                    # Sent before the pause began; the backoff already covers it
+                    return
+                self.rate = max(self.rate / 2, self.max_rate / 64)
+                wait = min(self.backoff_max, self.backoff_base * 2 ** self._strikes)
+                self._strikes += 1
+            self.tokens = min(self.tokens, 0.0)
+            self._paused_until = max(self._paused_until, now + wait)
+
+    def allow_retry(self, budget: float) -> bool:
+        """Spend from the retry budget: a few retries plus budget per request sent"""
+        with self._lock:
+            if self.stats["retries"] >= 10 + budget * self.stats["requests"]:
+                return False
+            self.stats["retries"] += 1
+            return True
+
+class RateLimiter:
+    """Token buckets per (API, credential) and the retry loop around requests"""
+
+    def __init__(
+        self,
+        enabled: bool = settings.RATE_LIMIT_ENABLED,
+        max_retries: int = settings.RATE_LIMIT_MAX_RETRIES,
+        retry_budget: float = settings.RATE_LIMIT_RETRY_BUDGET,
+        backoff_base: float = settings.RATE_LIMIT_BACKOFF_BASE,
+        backoff_max: float = settings.RATE_LIMIT_BACKOFF_MAX,
+        max_wait: float = settings.RATE_LIMIT_MAX_WAIT
+    ):
+        self.enabled = enabled
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_wait = max_wait
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, api: str, credential: Optional[str], rate: float, burst: int) -> TokenBucket:
+        """The bucket of a credential; only a digest of it appears in the name"""
+        digest = hashlib.sha256((credential or "").encode()).hexdigest()[:12]
+        name = f"{api}:{digest}"
+        with self._lock:
+            if name not in self._buckets:
+                self._buckets[name] = TokenBucket(name, rate, burst, self.backoff_base, self.backoff_max)
+            return self._buckets[name]
+
+    async def call(self, bucket: TokenBucket, send: Callable[[], Awaitable[T]]) -> T:
+        """Run send once the bucket has capacity, retrying it on RetryableError.
+
+        Rate-limited attempts wait for capacity for up to max_wait seconds;
+        other failures are retried up to max_retries times with backoff while
+        the bucket's retry budget allows.
+        """
+        if not self.enabled:
+            try:
+                return await send()
+            except RetryableError as e:
+                raise e.error
+
+        deadline = time.monotonic() + self.max_wait
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            try:
+                return await send()
+            except RetryableError as e:
+                error = e
+            finally:
+                bucket.release()
+
+            if error.rate_limited:
+                bucket.rate_limited(error.headers)
+                if time.monotonic() >= deadline:
+                    raise error.error
+                # acquire waits out the pause; the jitter keeps callers
+                # paused together from all resuming at once
+                await asyncio.sleep(random.uniform(0, self.backoff_base))
+                continue
+            if attempt >= self.max_retries or not bucket.allow_retry(self.retry_budget):
+                raise error.error
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_base, self.backoff_max))
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = list(self._buckets.values())
+        return {bucket.name: {**bucket.stats, "rate": bucket.rate} for bucket in buckets}
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,195 @@
+"""
+Cache of serialized read responses, invalidated by a data version counter
+"""
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, NamedTuple
+from fastapi import Request
+from fastapi.responses import Response
+from app.core.config import settings
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    media_type: str
+
+class MemoryBackend:
+    """In-process LRU bounded by the total size of cached bodies.
+
+    The data version lives in this process, so writes made by other
+    processes only show up once entries expire after ttl seconds.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.evictions = 0
+        self._version = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def version(self) -> int:
+        return self._version
+
+    def bump(self):
+        with self._lock:
+            self._version += 1
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            response, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return response
+
+    def set(self, key: str, response: CachedResponse):
+        if len(response.body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (response, time.monotonic() + self.ttl)
+            self.size += len(response.body)
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str):
+        response, _ = self._entries.pop(key)
+        self.size -= len(response.body)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "bytes": self.size, "evictions": self.evictions}
+
+class RedisBackend:
+    """Responses kept in Redis, shared by every API process.
+
+    The data version is a Redis counter, so a bump from any process
+    invalidates all of them. Size-based eviction is left to the server's
+    maxmemory-policy (allkeys-lru).
+    """
+
+    VERSION_KEY = "response_cache:version"
+
+    def __init__(self, url: str, ttl: float):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError(
+                "The redis response cache (RESPONSE_CACHE_BACKEND=redis, or auto with WEB_CONCURRENCY "
+                "above 1) requires the redis package"
+            )
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    def version(self) -> int:
+        return int(self.client.get(self.VERSION_KEY) or 0)
+
+    def bump(self):
+        self.client.incr(self.VERSION_KEY)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.client.hgetall(f"response_cache:{key}")
+        if not entry:
+            return None
+        return CachedResponse(entry[b"body"], entry[b"etag"].decode(), entry[b"media_type"].decode())
+
+    def set(self, key: str, response: CachedResponse):
+        name = f"response_cache:{key}"
+        pipeline = self.client.pipeline()
+        pipeline.hset(name, mapping=response._asdict())
+        pipeline.expire(name, int(self.ttl))
+        pipeline.execute()
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Weak If-None-Match comparison against a response's ETag"""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+class ResponseCache:
+    """Serialized GET responses keyed by path, normalized query and data version.
+
+    Stored rows do not change once ingested, so a cached body stays valid
+    until the version is bumped by a write. Every response carries an
+    ETag, a hash of its body, so polling clients that send it back in
+    If-None-Match get an empty 304 instead of the body.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._seconds = {"hit": 0.0, "miss": 0.0}
+
+    def key(self, request: Request) -> str:
+        query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+        return f"{self.backend.version()}:{request.url.path}?{query}"
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self.backend.get(key)
+
+    def set(self, key: str, body: bytes, media_type: str = "application/json") -> CachedResponse:
+        response = CachedResponse(body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', media_type)
+        self.backend.set(key, response)
+        return response
+
+    def invalidate(self):
+        """Bump the data version; called whenever stored rows change"""
+        self.backend.bump()
+
+    def respond(self, request: Request, cached: CachedResponse, hit: bool, started: float) -> Response:
+        """Build the 200 or 304 response for a cached body and record the lookup"""
+        headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), cached.etag):
+            self.not_modified += 1
+            response = Response(status_code=304, headers=headers)
+        else:
+            response = Response(cached.body, media_type=cached.media_type, headers=headers)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self._seconds["hit" if hit else "miss"] += time.perf_counter() - started
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "version": self.backend.version(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "mean_hit_ms": self._seconds["hit"] * 1000 / self.hits if self.hits else None,
+            "mean_miss_ms": self._seconds["miss"] * 1000 / self.misses if self.misses else None,
+            **self.backend.stats(),
+        }
+
+def backend_name() -> str:
+    """The configured backend, with "auto" resolved by the number of server workers"""
+    if settings.RESPONSE_CACHE_BACKEND == "auto":
+        # Other workers' writes only invalidate this process's entries through redis
+        return "redis" if settings.WEB_CONCURRENCY > 1 else "memory"
+    return settings.RESPONSE_CACHE_BACKEND
+
+def _create_backend():
+    if backend_name() == "redis":
+        return RedisBackend(settings.RESPONSE_CACHE_REDIS_URL, settings.RESPONSE_CACHE_TTL)
+    return MemoryBackend(settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL)
+
+response_cache = ResponseCache(_create_backend())
@@ -0,0 +1,176 @@
+"""
+Service for month-by-month retention of raw_data with Parquet archives
+"""
+import os
+import json
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, delete, update, func, tuple_, bindparam
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.data_models import RawData, MinHashBand, RawMetadataBlob
+from app.services.count_cache import count_cache
+from app.services.response_cache import response_cache
+from app.services.metadata_store import MetadataStore
+
+# Rows read per archive batch
+ARCHIVE_BATCH_SIZE = 5000
+# Rows deleted per transaction; SQLite limits bound parameters per statement
+DELETE_BATCH_SIZE = 500
+
+ARCHIVE_SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("source", pa.string()),
+    ("source_id", pa.string()),
+    ("title", pa.string()),
+    ("content", pa.string()),
+    ("author", pa.string()),
+    ("url", pa.string()),
+    ("published_at", pa.timestamp("us")),
+    ("raw_metadata", pa.string()),  # JSON text
+    ("duplicate_cluster_id", pa.int64()),
+    ("created_at", pa.timestamp("us")),
+    ("updated_at", pa.timestamp("us")),
+])
+ARCHIVE_COLUMNS = [getattr(RawData, name) for name in ARCHIVE_SCHEMA.names]
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+def next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+def archive_table(store: MetadataStore, rows) -> pa.Table:
+    """Arrow table of raw_data rows selected as ARCHIVE_COLUMNS, payloads included"""
+    items = [dict(row._mapping) for row in rows]
+    store.fill(items, [item["id"] for item in items])
+    for item in items:
+        if item["raw_metadata"] is not None:
+            item["raw_metadata"] = json.dumps(item["raw_metadata"])
+    return pa.Table.from_pylist(items, schema=ARCHIVE_SCHEMA)
+
+def archive_path(directory: str, month: datetime) -> str:
+    """Hive-style path of a month's archive, e.g. raw_data/year=2024/month=01"""
+    return os.path.join(directory, "raw_data", f"year={month.year}", f"month={month.month:02d}", "data.parquet")
+
+class RetentionService:
+    """Archives and drops raw_data one created_at month at a time.
+
+    Each month is a contiguous range of the (created_at, id) index, so
+    reading, archiving and deleting it never scans other months, and the
+    delete runs as many small id-keyed transactions rather than one large
+    DELETE. Volume rollups are left untouched so counts for dropped months
+    stay available.
+    """
+
+    def __init__(self, db: Session, archive_dir: str = settings.ARCHIVE_DIR):
+        self.db = db
+        self.archive_dir = archive_dir
+
+    def _month_filter(self, month: datetime):
+        return (RawData.created_at >= month, RawData.created_at < next_month(month))
+
+    def months(self) -> List[Dict[str, Any]]:
+        """Months that hold raw_data rows, oldest first, with row counts"""
+        first, last = self.db.query(func.min(RawData.created_at), func.max(RawData.created_at)).one()
+        if first is None:
+            return []
+        months = []
+        month = month_start(first)
+        while month <= last:
+            rows = self.db.query(func.count(RawData.id)).filter(*self._month_filter(month)).scalar()
+            if rows:
+                months.append({"month": month, "rows": rows})
+            month = next_month(month)
+        return months
+
+    def _month_batches(self, month: datetime):
+        """Yield archive rows of a month in (created_at, id) order, one batch at a time"""
+        last: Optional[Tuple[datetime, int]] = None
+        while True:
+            statement = select(*ARCHIVE_COLUMNS).where(*self._month_filter(month))
+            if last:
+                statement = statement.where(tuple_(RawData.created_at, RawData.id) > tuple_(*last))
+            rows = self.db.execute(
+                statement.order_by(RawData.created_at, RawData.id).limit(ARCHIVE_BATCH_SIZE)
+            ).all()
+            if not rows:
+                return
+            last = (rows[-1].created_at, rows[-1].id)
+            yield rows
+
+    def archive_month(self, month: datetime) -> Tuple[str, int]:
+        """Write a month's rows, payloads included, to a Parquet file"""
+        month = month_start(month)
+        path = archive_path(self.archive_dir, month)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        store = MetadataStore(self.db)
+        written = 0
+        # Written to a temporary name so a partial archive is never mistaken for a complete one
+        with pq.ParquetWriter(path + ".tmp", ARCHIVE_SCHEMA, compression="zstd") as writer:
+            for rows in self._month_batches(month):
+                writer.write_table(archive_table(store, rows))
+                written += len(rows)
+        os.replace(path + ".tmp", path)
+        return path, written
+
+    def _repoint_clusters(self, dropped_ids: List[int]):
+        """Hand clusters whose first row was dropped to their oldest surviving member.
+
+        A cluster id is the id of its first row, so the survivor with the
+        lowest id takes that role; a lone survivor becomes its own cluster.
+        """
+        survivors = self.db.query(RawData.duplicate_cluster_id, func.min(RawData.id)).filter(
+            RawData.duplicate_cluster_id.in_(dropped_ids)
+        ).group_by(RawData.duplicate_cluster_id).all()
+        if survivors:
+            table = RawData.__table__
+            self.db.execute(
+                update(table).where(table.c.duplicate_cluster_id == bindparam("old_id")).values(
+                    duplicate_cluster_id=bindparam("new_id")
+                ),
+                [{"old_id": old_id, "new_id": new_id} for old_id, new_id in survivors]
+            )
+
+    def drop_month(self, month: datetime) -> int:
+        """Delete a month's rows and their side-table entries in small batches"""
+        month = month_start(month)
+        dropped = 0
+        while True:
+            ids = [row_id for (row_id,) in self.db.query(RawData.id).filter(
+                *self._month_filter(month)
+            ).order_by(RawData.created_at, RawData.id).limit(DELETE_BATCH_SIZE)]
+            if not ids:
+                break
+            self.db.execute(delete(MinHashBand).where(MinHashBand.raw_data_id.in_(ids)))
+            self.db.execute(delete(RawMetadataBlob).where(RawMetadataBlob.raw_data_id.in_(ids)))
+            self.db.execute(delete(RawData).where(RawData.id.in_(ids)))
+            self._repoint_clusters(ids)
+            self.db.commit()
+            dropped += len(ids)
+        count_cache.clear()
+        response_cache.invalidate()
+        return dropped
+
+    def apply(self, keep_months: int, archive: bool = True, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Archive (optionally) and drop every month older than the newest keep_months"""
+        if keep_months < 1:
+            raise ValueError("keep_months must be at least 1")
+        cutoff = month_start(now or datetime.utcnow())
+        for _ in range(keep_months - 1):
+            cutoff = datetime(cutoff.year - (cutoff.month == 1), (cutoff.month - 2) % 12 + 1, 1)
+        applied = []
+        for entry in self.months():
+            if entry["month"] >= cutoff:
+                break
+            path = None
+            if archive:
+                path, _ = self.archive_month(entry["month"])
+            applied.append({
+                "month": entry["month"],
+                "archived_to": path,
+                "rows_dropped": self.drop_month(entry["month"]),
+            })
+        return applied
@@ -0,0 +1,131 @@
+"""
+Service for maintaining and querying time-bucketed volume rollups
+"""
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+from app.models.data_models import RawData, VolumeRollup
+
+TIME_FIELDS = ("published_at", "created_at")
+GRANULARITIES = ("minute", "hour", "day")
+
+# Rows read per round trip while backfilling
+BACKFILL_BATCH_SIZE = 10000
+
+RollupKey = Tuple[str, str, str, datetime]
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    """Truncate a timestamp to the start of its bucket, as naive UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    if granularity == "minute":
+        return value.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return value.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+def count_buckets(rows: Iterable[Dict[str, Any]]) -> Counter:
+    """Count rows per (time_field, granularity, source, bucket_start)"""
+    counts = Counter()
+    for row in rows:
+        for time_field in TIME_FIELDS:
+            value = row.get(time_field)
+            if value is None:
+                continue
+            for granularity in GRANULARITIES:
+                counts[(time_field, granularity, row["source"], bucket_start(value, granularity))] += 1
+    return counts
+
+class RollupService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _upsert_statement(self):
+        """Build an INSERT that adds to the count of an existing bucket, where supported"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            return None
+        statement = dialect_insert(VolumeRollup)
+        return statement.on_conflict_do_update(
+            index_elements=["time_field", "granularity", "source", "bucket_start"],
+            set_={"count": VolumeRollup.count + statement.excluded.count}
+        )
+
+    def apply(self, counts: Counter):
+        """Add bucket counts to the rollup table in the current transaction"""
+        if not counts:
+            return
+        statement = self._upsert_statement()
+        if statement is not None:
+            self.db.execute(statement, [
+                {"time_field": time_field, "granularity": granularity, "source": source,
+                 "bucket_start": start, "count": count}
+                for (time_field, granularity, source, start), count in counts.items()
+            ])
+            return
+        for (time_field, granularity, source, start), count in counts.items():
+            rollup = self.db.query(VolumeRollup).filter(
+                VolumeRollup.time_field == time_field,
+                VolumeRollup.granularity == granularity,
+                VolumeRollup.source == source,
+                VolumeRollup.bucket_start == start
+            ).first()
+            if rollup:
+                rollup.count += count
+            else:
+                self.db.add(VolumeRollup(
+                    time_field=time_field, granularity=granularity, source=source,
+                    bucket_start=start, count=count
+                ))
+        self.db.flush()
+
+    def add_rows(self, rows: Iterable[Dict[str, Any]]):
+        """Count newly inserted raw_data rows into their buckets"""
+        self.apply(count_buckets(rows))
+
+    def backfill(self) -> int:
+        """Rebuild every rollup from raw_data and return the rows counted.
+
+        Streams raw_data once, so memory grows with the number of buckets
+        rather than the number of rows.
+        """
+        self.db.execute(delete(VolumeRollup))
+        statement = select(RawData.source, RawData.published_at, RawData.created_at)
+        result = self.db.execute(statement.execution_options(yield_per=BACKFILL_BATCH_SIZE))
+        counts = Counter()
+        total = 0
+        for rows in result.partitions():
+            counts.update(count_buckets(row._mapping for row in rows))
+            total += len(rows)
+        self.apply(counts)
+        self.db.commit()
+        return total
+
+    def volume(
+        self,
+        granularity: str,
+        time_field: str,
+        source: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[VolumeRollup]:
+        """Return rollup buckets in time order"""
+        query = self.db.query(VolumeRollup).filter(
+            VolumeRollup.time_field == time_field,
+            VolumeRollup.granularity == granularity
+        )
+        if source:
+            query = query.filter(VolumeRollup.source == source)
+        if start:
+            query = query.filter(VolumeRollup.bucket_start >= bucket_start(start, granularity))
+        if end:
+            query = query.filter(VolumeRollup.bucket_start < end)
+        return query.order_by(VolumeRollup.bucket_start, VolumeRollup.source).all()
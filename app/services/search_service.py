@@ -0,0 +1,63 @@
+"""
+Service for ranked full-text search over stored raw data
+"""
+from datetime import datetime
+from sqlalchemy import select, table, column, func, literal_column, or_
+from sqlalchemy.orm import Session
+from typing import Optional, List
+from app.models.data_models import RawData, POSTGRES_SEARCH_DOCUMENT
+
+def fts5_match_expression(q: str) -> str:
+    """Quote each term so user input is matched literally, not as FTS5 syntax"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        q: str,
+        columns: List,
+        source: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List:
+        """Return rows matching every term in q, best match first.
+
+        Each row holds the requested columns plus a rank, where higher is
+        more relevant.
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            fts = table("raw_data_fts", column("rowid"))
+            # bm25 scores better matches lower, so negate it
+            rank = (-func.bm25(literal_column("raw_data_fts"))).label("rank")
+            statement = (
+                select(*columns, rank)
+                .select_from(RawData.__table__.join(fts, fts.c.rowid == RawData.id))
+                .where(literal_column("raw_data_fts").op("MATCH")(fts5_match_expression(q)))
+            )
+        elif dialect == "postgresql":
+            query = func.plainto_tsquery(literal_column("'english'"), q)
+            document = literal_column(POSTGRES_SEARCH_DOCUMENT)
+            rank = func.ts_rank(document, query).label("rank")
+            statement = select(*columns, rank).where(document.op("@@")(query))
+        else:
+            # No full-text index: fall back to an unranked substring scan
+            rank = literal_column("0").label("rank")
+            statement = select(*columns, rank).where(*(
+                or_(RawData.title.contains(term, autoescape=True), RawData.content.contains(term, autoescape=True))
+                for term in q.split()
+            ))
+
+        if source:
+            statement = statement.where(RawData.source == source)
+        if start:
+            statement = statement.where(RawData.created_at >= start)
+        if end:
+            statement = statement.where(RawData.created_at < end)
+
+        statement = statement.order_by(rank.desc(), RawData.id).limit(limit)
+        return self.db.execute(statement).all()
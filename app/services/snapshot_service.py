@@ -0,0 +1,219 @@
+"""
+Incremental Parquet snapshots of raw_data and queries over them
+"""
+import os
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Set
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+from pyarrow import fs
+from sqlalchemy import select, func, tuple_
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.data_models import RawData
+from app.services.metadata_store import MetadataStore
+from app.services.retention_service import ARCHIVE_SCHEMA, ARCHIVE_COLUMNS, archive_table
+
+# Rows read from the database per snapshot batch
+SNAPSHOT_BATCH_SIZE = 50000
+
+SNAPSHOT_PARTITIONING = ds.partitioning(
+    pa.schema([("source", pa.string()), ("month", pa.string())]), flavor="hive"
+)
+SNAPSHOT_FIELDS = ARCHIVE_SCHEMA.names
+GROUP_KEYS = ("source", "month", "day", "author")
+
+def snapshot_root(directory: str) -> str:
+    return os.path.join(directory, "raw_data")
+
+def watermark_path(directory: str) -> str:
+    # A leading underscore keeps the file out of dataset discovery
+    return os.path.join(snapshot_root(directory), "_watermark.json")
+
+def read_watermark(directory: str) -> Dict[str, Any]:
+    """Contents of the watermark file, {} before the first snapshot"""
+    try:
+        with open(watermark_path(directory)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def watermark_time(directory: str) -> Optional[datetime]:
+    """Newest raw_data created_at already written to the snapshot"""
+    created_at = read_watermark(directory).get("created_at")
+    return datetime.fromisoformat(created_at) if created_at else None
+
+def write_watermark(directory: str, created_at: datetime):
+    path = watermark_path(directory)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"created_at": created_at.isoformat(), "updated_at": datetime.utcnow().isoformat()}, f)
+    os.replace(path + ".tmp", path)
+
+class SnapshotWriter:
+    """Appends raw_data rows created since the watermark to a Parquet snapshot.
+
+    Files are partitioned Hive-style by source and created_at month, so
+    queries on either read only the matching directories. raw_data is
+    append-only apart from retention, so written rows are never rewritten;
+    rows dropped by retention stay in the snapshot.
+
+    Rows are stamped with created_at before their transaction commits, and
+    with concurrent writers (Postgres) one can become visible after rows
+    stamped later were snapshotted. Each run therefore re-reads overlap
+    seconds behind the watermark and skips ids the snapshot already holds;
+    a row is only missed if it takes longer than that to commit.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        snapshot_dir: str = settings.SNAPSHOT_DIR,
+        overlap_seconds: float = settings.SNAPSHOT_OVERLAP_SECONDS
+    ):
+        self.db = db
+        self.snapshot_dir = snapshot_dir
+        self.overlap_seconds = overlap_seconds
+
+    def _written_ids(self, since: Optional[datetime]) -> Set[int]:
+        """Ids in the snapshot created at or after since (all of them without since)"""
+        dataset = SnapshotReader(self.snapshot_dir).dataset()
+        if dataset is None or not dataset.files:
+            return set()
+        expression = SnapshotReader._filter(None, since, None) if since else None
+        return set(dataset.to_table(columns=["id"], filter=expression)["id"].to_pylist())
+
+    def write(self, batch_size: int = SNAPSHOT_BATCH_SIZE) -> Dict[str, Any]:
+        """Snapshot rows added since the last run; returns rows written and the new watermark"""
+        root = snapshot_root(self.snapshot_dir)
+        os.makedirs(root, exist_ok=True)
+        state = read_watermark(self.snapshot_dir)
+        watermark = watermark_time(self.snapshot_dir)
+        if watermark is None and state.get("last_id"):
+            # Left by a version that kept an id watermark
+            watermark = self.db.query(func.max(RawData.created_at)).filter(RawData.id <= state["last_id"]).scalar()
+        since = watermark - timedelta(seconds=self.overlap_seconds) if watermark else None
+        # Also covers files of an earlier run interrupted before its watermark moved
+        written_ids = self._written_ids(since)
+        store = MetadataStore(self.db)
+        written = 0
+        last = None
+        while True:
+            statement = select(*ARCHIVE_COLUMNS)
+            if since:
+                statement = statement.where(RawData.created_at >= since)
+            if last:
+                statement = statement.where(tuple_(RawData.created_at, RawData.id) > tuple_(*last))
+            rows = self.db.execute(
+                statement.order_by(RawData.created_at, RawData.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last = (rows[-1].created_at, rows[-1].id)
+            rows = [row for row in rows if row.id not in written_ids]
+            if not rows:
+                continue
+            table = archive_table(store, rows)
+            table = table.append_column("month", pc.strftime(table["created_at"], format="%Y-%m"))
+            # Named after the batch's first id, which no earlier file can hold
+            ds.write_dataset(
+                table,
+                root,
+                format="parquet",
+                partitioning=SNAPSHOT_PARTITIONING,
+                basename_template=f"part-{rows[0].id}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+                file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+            )
+            watermark = max(watermark, rows[-1].created_at) if watermark else rows[-1].created_at
+            write_watermark(self.snapshot_dir, watermark)
+            written += len(rows)
+        if watermark and not state.get("created_at"):
+            write_watermark(self.snapshot_dir, watermark)
+        return {"rows_written": written, "watermark": watermark}
+
+class SnapshotReader:
+    """Answers filter and aggregate queries from snapshot files alone.
+
+    Files are memory-mapped and only the columns a query needs are read;
+    source and month filters prune whole partitions, and created_at
+    filters skip row groups by their statistics.
+    """
+
+    def __init__(self, snapshot_dir: str = settings.SNAPSHOT_DIR):
+        self.snapshot_dir = snapshot_dir
+
+    def dataset(self) -> Optional[ds.Dataset]:
+        root = snapshot_root(self.snapshot_dir)
+        if not os.path.isdir(root):
+            return None
+        return ds.dataset(
+            root,
+            format="parquet",
+            partitioning=SNAPSHOT_PARTITIONING,
+            filesystem=fs.LocalFileSystem(use_mmap=True),
+        )
+
+    @staticmethod
+    def _filter(source: Optional[str], start: Optional[datetime], end: Optional[datetime]):
+        expression = None
+        conditions = []
+        if source:
+            conditions.append(ds.field("source") == source)
+        if start:
+            conditions.append(ds.field("month") >= f"{start:%Y-%m}")
+            conditions.append(ds.field("created_at") >= pa.scalar(start, type=pa.timestamp("us")))
+        if end:
+            conditions.append(ds.field("month") <= f"{end:%Y-%m}")
+            conditions.append(ds.field("created_at") < pa.scalar(end, type=pa.timestamp("us")))
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return expression
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        group_by: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """Row counts per group, or up to limit matching rows when group_by is empty.
+
+        Groups also report distinct duplicate clusters, i.e. unique stories.
+        """
+        unknown = set(group_by or []) - set(GROUP_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown group keys: {', '.join(sorted(unknown))}")
+        unknown = set(fields or []) - set(SNAPSHOT_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+        result = {"watermark": watermark_time(self.snapshot_dir), "rows_matched": 0, "groups": None, "rows": None}
+        dataset = self.dataset()
+        expression = self._filter(source, start, end)
+        if dataset is None:
+            result["groups" if group_by else "rows"] = []
+            return result
+
+        if group_by:
+            columns = {key for key in group_by if key != "day"} | {"id", "duplicate_cluster_id"}
+            if "day" in group_by:
+                columns.add("created_at")
+            table = dataset.to_table(columns=sorted(columns), filter=expression)
+            if "day" in group_by:
+                table = table.append_column("day", pc.floor_temporal(table["created_at"], unit="day"))
+            grouped = table.group_by(group_by).aggregate([
+                ("id", "count"),
+                ("duplicate_cluster_id", "count_distinct"),
+            ]).rename_columns(group_by + ["rows", "clusters"])
+            grouped = grouped.sort_by([(key, "ascending") for key in group_by])
+            result["rows_matched"] = sum(grouped["rows"].to_pylist())
+            result["groups"] = grouped.to_pylist()
+        else:
+            columns = [field for field in SNAPSHOT_FIELDS if field in fields] if fields else SNAPSHOT_FIELDS
+            result["rows_matched"] = dataset.count_rows(filter=expression)
+            result["rows"] = dataset.scanner(columns=columns, filter=expression).head(limit).to_pylist()
+        return result
@@ -0,0 +1,158 @@
+"""
+Service for batch text analytics over stored raw data content
+"""
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Iterator
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.data_models import RawData
+
+# Rows loaded into memory at a time; bounds peak memory regardless of table size
+CHUNK_SIZE = 20000
+
+TOKEN_PATTERN = r"[a-z][a-z']+"
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers herself him himself his how
+i if in into is it its itself just me more most my myself no nor not now of off on
+once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too
+under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves said says new one two it's i'm don't
+""".split())
+
+# Minimal general-purpose sentiment lexicon: +1 positive, -1 negative
+SENTIMENT_LEXICON = {
+    **dict.fromkeys("""
+    good great excellent positive success successful win wins winning gain gains growth
+    improve improved improves improvement strong best better love like happy benefit
+    benefits breakthrough innovative innovation boost record profit profits rise rises
+    surge optimistic opportunity progress safe secure effective efficient helpful
+    """.split(), 1),
+    **dict.fromkeys("""
+    bad poor negative fail fails failed failure loss losses lose decline declines drop
+    drops weak worst worse hate sad risk risks threat threats crisis crash fraud scam
+    problem problems concern concerns fear fears attack attacks lawsuit ban banned
+    warning danger dangerous vulnerable breach layoffs cut cuts slump plunge
+    """.split(), -1),
+}
+
+def read_chunks(
+    db: Session,
+    source: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    chunksize: int = CHUNK_SIZE
+) -> Iterator[pd.DataFrame]:
+    """Read raw_data content in DataFrame chunks with a per-row day bucket"""
+    statement = select(RawData.id, RawData.source, RawData.content, RawData.published_at, RawData.created_at)
+    if source:
+        statement = statement.where(RawData.source == source)
+    if start:
+        statement = statement.where(RawData.created_at >= start)
+    if end:
+        statement = statement.where(RawData.created_at < end)
+
+    # yield_per keeps the driver from buffering the whole result (server-side cursor)
+    chunks = pd.read_sql(
+        statement.execution_options(yield_per=chunksize),
+        db.connection(),
+        chunksize=chunksize,
+        parse_dates=["published_at", "created_at"]
+    )
+    for chunk in chunks:
+        chunk["day"] = chunk["published_at"].fillna(chunk["created_at"]).dt.floor("D")
+        yield chunk
+
+def tokenize(chunk: pd.DataFrame) -> pd.DataFrame:
+    """One row per token, keeping the source row's index, source and day"""
+    terms = chunk["content"].fillna("").str.lower().str.findall(TOKEN_PATTERN).explode()
+    tokens = chunk[["source", "day"]].join(terms.rename("term"))
+    return tokens.dropna(subset=["term"])
+
+def score_sentiment(chunk: pd.DataFrame, tokens: pd.DataFrame) -> pd.Series:
+    """Lexicon sentiment score per row: positive minus negative words"""
+    scores = tokens["term"].map(SENTIMENT_LEXICON).fillna(0)
+    return scores.groupby(level=0).sum().reindex(chunk.index, fill_value=0)
+
+class TextAnalyticsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def analyze(
+        self,
+        source: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        top_n: int = 20,
+        terms: Optional[List[str]] = None,
+        chunksize: int = CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """Compute keyword frequency, term trends and sentiment chunk by chunk.
+
+        Trends are per source and day for the given terms; without terms
+        they cover the top keywords, which needs a second pass.
+        """
+        terms = [term.lower() for term in terms] if terms else None
+        keywords = pd.Series(dtype="int64")
+        trend_parts = []
+        sentiment = pd.DataFrame(columns=["rows", "score", "positive", "negative"], dtype="int64")
+        rows = 0
+
+        for chunk in read_chunks(self.db, source, start, end, chunksize):
+            rows += len(chunk)
+            tokens = tokenize(chunk)
+
+            counts = tokens.loc[~tokens["term"].isin(STOPWORDS), "term"].value_counts()
+            keywords = keywords.add(counts, fill_value=0)
+
+            if terms:
+                trend_parts.append(self._trend_counts(tokens, terms))
+
+            scores = score_sentiment(chunk, tokens)
+            per_source = pd.DataFrame({
+                "source": chunk["source"],
+                "rows": 1,
+                "score": scores,
+                "positive": (scores > 0).astype("int64"),
+                "negative": (scores < 0).astype("int64"),
+            }).groupby("source").sum()
+            sentiment = sentiment.add(per_source, fill_value=0)
+
+        top_keywords = keywords.sort_values(ascending=False, kind="stable").head(top_n)
+        if not terms:
+            terms = list(top_keywords.index[:5])
+            for chunk in read_chunks(self.db, source, start, end, chunksize):
+                trend_parts.append(self._trend_counts(tokenize(chunk), terms))
+        # Partial counts are small once filtered to terms, so combine them at the end
+        trends = pd.concat(trend_parts).groupby(level=[0, 1, 2]).sum() if trend_parts else pd.Series(dtype="int64")
+
+        return {
+            "rows": rows,
+            "keywords": [
+                {"term": term, "count": int(count)} for term, count in top_keywords.items()
+            ],
+            "trends": [
+                {"source": source_name, "day": day.to_pydatetime(), "term": term, "count": int(count)}
+                for (source_name, day, term), count in trends.sort_index().items()
+            ],
+            "sentiment": [
+                {
+                    "source": source_name,
+                    "rows": int(row["rows"]),
+                    "mean_score": float(row["score"] / row["rows"]),
+                    "positive": int(row["positive"]),
+                    "negative": int(row["negative"]),
+                    "neutral": int(row["rows"] - row["positive"] - row["negative"]),
+                }
+                for source_name, row in sentiment.iterrows()
+            ],
+        }
+
+    @staticmethod
+    def _trend_counts(tokens: pd.DataFrame, terms: List[str]) -> pd.Series:
+        matched = tokens[tokens["term"].isin(terms)]
+        return matched.groupby(["source", "day", "term"]).size()
@@ -1,9 +1,68 @@
 """
 Service for fetching data from Twitter API
 """
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
 import tweepy
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Iterator
 from app.core.config import settings
+from app.core.metrics import upstream_request_duration
+from app.services.upstream_cache import upstream_cache
+from app.services.rate_limiter import rate_limiter, RetryableError, TokenBucket
+
+# Twitter API v2 returns at most this many tweets per page
+MAX_PAGE_SIZE = 100
+
+# tweepy is synchronous, so page requests run here instead of on the event loop
+_executor = ThreadPoolExecutor(
+    max_workers=settings.TWITTER_MAX_WORKERS,
+    thread_name_prefix="twitter"
+)
+
+# The rate limit bucket of the request running on the current worker thread
+_current_bucket = threading.local()
+
+class _ObservedClient(tweepy.Client):
+    """tweepy Client that times each request and reports its response's
+    rate limit headers to the bucket of the request that made it"""
+
+    def request(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = super().request(*args, **kwargs)
+        except tweepy.HTTPException as e:
+            upstream_request_duration.observe(
+                time.perf_counter() - started, api="twitter", status=e.response.status_code
+            )
+            raise
+        except requests.RequestException:
+            upstream_request_duration.observe(time.perf_counter() - started, api="twitter", status="error")
+            raise
+        upstream_request_duration.observe(time.perf_counter() - started, api="twitter", status=response.status_code)
+        bucket = getattr(_current_bucket, "bucket", None)
+        if bucket is not None:
+            bucket.observe(response.headers)
+        return response
+
+def _call_with_bucket(bucket: TokenBucket, func, *args):
+    _current_bucket.bucket = bucket
+    try:
+        return func(*args)
+    finally:
+        _current_bucket.bucket = None
+
+def _tweet_to_dict(tweet: Any, author_id: Optional[Any] = None) -> Dict[str, Any]:
+    """Convert a tweepy Tweet into a plain dictionary"""
+    return {
+        "id": tweet.id,
+        "text": tweet.text,
+        "author_id": author_id if author_id is not None else tweet.author_id,
+        "created_at": tweet.created_at,
+        "public_metrics": tweet.public_metrics
+    }
 
 class TwitterService:
     def __init__(self):
@@ -12,12 +71,12 @@ class TwitterService:
         self.api_secret = settings.TWITTER_API_SECRET
         self.access_token = settings.TWITTER_ACCESS_TOKEN
         self.access_token_secret = settings.TWITTER_ACCESS_TOKEN_SECRET
-        
+
         # Initialize Twitter API client
         if self.bearer_token:
-            self.client = tweepy.Client(bearer_token=self.bearer_token)
+            self.client = _ObservedClient(bearer_token=self.bearer_token)
         elif all([self.api_key, self.api_secret, self.access_token, self.access_token_secret]):
-            self.client = tweepy.Client(
+            self.client = _ObservedClient(
                 consumer_key=self.api_key,
                 consumer_secret=self.api_secret,
                 access_token=self.access_token,
@@ -25,86 +84,155 @@ class TwitterService:
             )
         else:
             self.client = None
-    
+
+    async def _run(self, func, *args):
+        """Run a blocking tweepy call on the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+
+    def _bucket(self, endpoint: str) -> TokenBucket:
+        """Twitter limits each endpoint separately for a credential"""
+        return rate_limiter.bucket(
+            f"twitter:{endpoint}",
+            self.bearer_token or self.access_token,
+            settings.TWITTER_REQUESTS_PER_SECOND,
+            settings.TWITTER_BURST
+        )
+
+    async def _request(self, endpoint: str, error_message: str, func, *args):
+        """Run a tweepy call within its endpoint's rate limit, retrying
+        rate-limited and failed calls"""
+        bucket = self._bucket(endpoint)
+
+        async def send():
+            try:
+                return await self._run(_call_with_bucket, bucket, func, *args)
+            except tweepy.TooManyRequests as e:
+                raise RetryableError(
+                    Exception("Twitter API rate limit exceeded"), e.response.headers, rate_limited=True
+                )
+            except tweepy.Unauthorized:
+                raise Exception("Twitter API authentication failed")
+            except (tweepy.TwitterServerError, requests.ConnectionError, requests.Timeout) as e:
+                raise RetryableError(Exception(f"{error_message}: {str(e)}"))
+            except Exception as e:
+                raise Exception(f"{error_message}: {str(e)}")
+
+        return await rate_limiter.call(bucket, send)
+
+    async def _iter_pages(
+        self,
+        method,
+        count: int,
+        error_message: str,
+        **kwargs
+    ) -> AsyncIterator[List[Any]]:
+        """Yield pages of tweepy Tweets, fetching the next page while the
+        current one is being consumed"""
+        # Search endpoints reject max_results below 10
+        per_page = max(min(count, MAX_PAGE_SIZE), 10)
+        kwargs["max_results"] = per_page
+        page_count = -(-count // per_page)
+        pages: Iterator = iter(tweepy.Paginator(method, limit=page_count, **kwargs))
+
+        async def next_page():
+            # A failed page request leaves the paginator where it was, so retrying repeats it
+            return await self._request(method.__name__, error_message, next, pages, None)
+
+        remaining = count
+        pending = asyncio.ensure_future(next_page())
+        try:
+            while remaining > 0:
+                response = await pending
+                if response is None or not response.data:
+                    break
+                pending = asyncio.ensure_future(next_page())
+                tweets = response.data[:remaining]
+                remaining -= len(tweets)
+                yield tweets
+        finally:
+            pending.cancel()
+
     async def fetch_tweets(
-        self, 
-        query: str, 
-        count: int = 100
-    ) -> List[Dict[str, Any]]:
-        """Fetch tweets using Twitter API v2"""
+        self,
+        query: str,
+        count: int = 100,
+        since_id: Optional[str] = None,
+        until_id: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Fetch tweets using Twitter API v2, yielding one page of tweet
+        dictionaries at a time
+
+        since_id limits results to tweets newer than it and until_id to
+        tweets older than it. A search answered in full within the upstream
+        cache TTL is replayed from the cache.
+        """
         if not self.client:
             raise ValueError("Twitter API credentials not configured")
-        
+        if count <= 0:
+            return
+
+        key = upstream_cache.key("search_recent_tweets", {
+            "query": query, "count": count, "since_id": since_id, "until_id": until_id
+        })
+        cached = upstream_cache.get(key)
+        if cached is not None and cached.fresh:
+            upstream_cache.record_hit(cached, calls=max(len(cached.data), 1))
+            for tweets in cached.data:
+                yield tweets
+            return
+
+        # Search for tweets
+        kwargs = {name: value for name, value in (("since_id", since_id), ("until_id", until_id)) if value}
+        pages = self._iter_pages(
+            self.client.search_recent_tweets,
+            count,
+            "Failed to fetch tweets",
+            query=query,
+            tweet_fields=['created_at', 'author_id', 'public_metrics'],
+            **kwargs
+        )
+        fetched = []
         try:
-            # Search for tweets
-            tweets = tweepy.Paginator(
-                self.client.search_recent_tweets,
-                query=query,
-                tweet_fields=['created_at', 'author_id', 'public_metrics'],
-                max_results=min(count, 100)  # API limit
-            ).flatten(limit=count)
-            
-            # Convert to list of dictionaries
-            tweet_data = []
-            for tweet in tweets:
-                tweet_dict = {
-                    "id": tweet.id,
-                    "text": tweet.text,
-                    "author_id": tweet.author_id,
-                    "created_at": tweet.created_at,
-                    "public_metrics": tweet.public_metrics
-                }
-                tweet_data.append(tweet_dict)
-            
-            return tweet_data
-            
-        except tweepy.TooManyRequests:
-            raise Exception("Twitter API rate limit exceeded")
-        except tweepy.Unauthorized:
-            raise Exception("Twitter API authentication failed")
-        except Exception as e:
-            raise Exception(f"Failed to fetch tweets: {str(e)}")
-    
+            async for tweets in pages:
+                page = [_tweet_to_dict(tweet) for tweet in tweets]
+                upstream_cache.record_request(0)
+                fetched.append(page)
+                yield page
+        finally:
+            await pages.aclose()
+        # Only a search read to the end is complete enough to replay
+        upstream_cache.set(key, fetched, 0)
+
     async def fetch_user_tweets(
-        self, 
-        username: str, 
+        self,
+        username: str,
         count: int = 100
-    ) -> List[Dict[str, Any]]:
-        """Fetch tweets from a specific user"""
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Fetch tweets from a specific user, yielding one page of tweet
+        dictionaries at a time"""
         if not self.client:
             raise ValueError("Twitter API credentials not configured")
-        
+        if count <= 0:
+            return
+
+        # Get user by username
+        user = await self._request(
+            "get_user", "Failed to fetch user tweets", lambda: self.client.get_user(username=username)
+        )
+        if not user.data:
+            raise Exception(f"User {username} not found")
+
+        # Get user's tweets
+        pages = self._iter_pages(
+            self.client.get_users_tweets,
+            count,
+            "Failed to fetch user tweets",
+            id=user.data.id,
+            tweet_fields=['created_at', 'public_metrics']
+        )
         try:
-            # Get user by username
-            user = self.client.get_user(username=username)
-            if not user.data:
-                raise Exception(f"User {username} not found")
-            
-            # Get user's tweets
-            tweets = tweepy.Paginator(
-                self.client.get_users_tweets,
-                id=user.data.id,
-                tweet_fields=['created_at', 'public_metrics'],
-                max_results=min(count, 100)
-            ).flatten(limit=count)
-            
-            # Convert to list of dictionaries
-            tweet_data = []
-            for tweet in tweets:
-                tweet_dict = {
-                    "id": tweet.id,
-                    "text": tweet.text,
-                    "author_id": user.data.id,
-                    "created_at": tweet.created_at,
-                    "public_metrics": tweet.public_metrics
-                }
-                tweet_data.append(tweet_dict)
-            
-            return tweet_data
-            
-        except tweepy.TooManyRequests:
-            raise Exception("Twitter API rate limit exceeded")
-        except tweepy.Unauthorized:
-            raise Exception("Twitter API authentication failed")
-        except Exception as e:
-            raise Exception(f"Failed to fetch user tweets: {str(e)}")
+            async for tweets in pages:
+                yield [_tweet_to_dict(tweet, author_id=user.data.id) for tweet in tweets]
+        finally:
+            await pages.aclose()
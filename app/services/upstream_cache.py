@@ -0,0 +1,109 @@
+"""
+Cache of source API responses with conditional revalidation
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable
+from app.core.config import settings
+
+class UpstreamEntry:
+    def __init__(self, data: Any, size: int, etag: Optional[str], last_modified: Optional[str], ttl: float):
+        self.data = data
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = time.monotonic() + ttl
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers that let the API answer 304 for an unchanged response"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class UpstreamCache:
+    """Responses of source API calls keyed by (endpoint, params).
+
+    A fresh entry answers a call without touching the API. An expired one
+    is kept so the next call can be made conditional; a 304 reuses it and
+    skips downloading the body again. The least recently used entries are
+    evicted beyond max_entries.
+    """
+
+    def __init__(
+        self,
+        ttl: float = settings.UPSTREAM_CACHE_TTL,
+        max_entries: int = settings.UPSTREAM_CACHE_MAX_ENTRIES,
+        enabled: bool = settings.UPSTREAM_CACHE_ENABLED
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, UpstreamEntry]" = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"requests": 0, "hits": 0, "not_modified": 0, "bytes_received": 0, "bytes_saved": 0}
+
+    @staticmethod
+    def key(endpoint: str, params: Dict[str, Any], exclude: Iterable[str] = ()) -> str:
+        """Normalized key; exclude names credentials that must not end up in keys"""
+        kept = {name: value for name, value in params.items() if name not in exclude and value is not None}
+        return f"{endpoint}?{json.dumps(kept, sort_keys=True, default=str)}"
+
+    def get(self, key: str) -> Optional[UpstreamEntry]:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(
+        self,
+        key: str,
+        data: Any,
+        size: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> UpstreamEntry:
+        entry = UpstreamEntry(data, size, etag, last_modified, self.ttl)
+        if self.enabled:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def record_hit(self, entry: UpstreamEntry, calls: int = 1):
+        """A fresh entry answered calls that would otherwise have been made"""
+        self.stats["hits"] += calls
+        self.stats["bytes_saved"] += entry.size
+
+    def record_not_modified(self, entry: UpstreamEntry):
+        """A conditional request came back 304; the entry is fresh again"""
+        self.stats["requests"] += 1
+        self.stats["not_modified"] += 1
+        self.stats["bytes_saved"] += entry.size
+        entry.expires_at = time.monotonic() + self.ttl
+
+    def record_request(self, size: int):
+        self.stats["requests"] += 1
+        self.stats["bytes_received"] += size
+
+    def expire(self):
+        """Mark every entry stale, keeping it for conditional requests"""
+        for entry in self._entries.values():
+            entry.expires_at = 0
+
+    def clear(self):
+        self._entries.clear()
+
+upstream_cache = UpstreamCache()
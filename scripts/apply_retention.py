@@ -0,0 +1,44 @@
+"""
+Archive raw_data months older than the retention window to Parquet and drop them
+"""
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.retention_service import RetentionService
+
+def apply_retention(keep_months, archive, list_only):
+    """Apply the retention policy, or list stored months"""
+    db = SessionLocal()
+    try:
+        service = RetentionService(db)
+        if list_only:
+            for entry in service.months():
+                print(f"{entry['month']:%Y-%m} {entry['rows']:>10} rows")
+            return
+
+        applied = service.apply(keep_months, archive=archive)
+        if not applied:
+            print(f"Nothing older than the newest {keep_months} months")
+        for entry in applied:
+            archived = f", archived to {entry['archived_to']}" if entry["archived_to"] else ""
+            print(f"{entry['month']:%Y-%m}: dropped {entry['rows_dropped']} rows{archived}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--keep-months", type=int, default=settings.RAW_DATA_RETENTION_MONTHS,
+        help="Months to keep, including the current one (defaults to RAW_DATA_RETENTION_MONTHS)"
+    )
+    parser.add_argument("--no-archive", action="store_true", help="Drop old months without archiving them")
+    parser.add_argument("--list", action="store_true", help="List stored months and exit")
+    args = parser.parse_args()
+
+    if not args.list and args.keep_months is None:
+        parser.error("--keep-months is required when RAW_DATA_RETENTION_MONTHS is not set")
+    apply_retention(args.keep_months, not args.no_archive, args.list)
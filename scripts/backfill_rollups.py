@@ -0,0 +1,24 @@
+"""
+Rebuild the volume rollup tables from rows already in raw_data
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.rollup_service import RollupService
+
+def backfill_rollups():
+    """Recount every raw_data row into the rollup tables"""
+    db = SessionLocal()
+    try:
+        print("Backfilling volume rollups...")
+        start = time.perf_counter()
+        total = RollupService(db).backfill()
+        print(f"Counted {total} rows in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill_rollups()
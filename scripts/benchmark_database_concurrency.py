@@ -0,0 +1,143 @@
+"""
+Benchmark mixed read/write throughput with default and configured engines
+"""
+import sys
+import os
+import time
+import argparse
+import tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base, create_database_engine
+from app.models.data_models import RawData
+
+WRITE_BATCH_SIZE = 50
+READ_PAGE_SIZE = 100
+
+def populate(Session, rows):
+    db = Session()
+    try:
+        start = datetime(2024, 1, 1)
+        db.execute(insert(RawData), [
+            {
+                "source": "news" if i % 2 else "twitter",
+                "source_id": f"seed-{i}",
+                "title": f"Item {i}",
+                "content": "Synthetic content " * 10,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+def make_engine(label, url):
+    if label == "default":
+        # The engine as created before pool and pragma settings existed
+        return create_engine(url, connect_args={"check_same_thread": False} if url.startswith("sqlite") else {})
+    return create_database_engine(url)
+
+def writer(label, url, worker, deadline, stats):
+    Session = sessionmaker(bind=make_engine(label, url))
+    db = Session()
+    batch = 0
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                db.execute(insert(RawData), [
+                    {
+                        "source": "news",
+                        "source_id": f"w{worker}-{batch}-{i}",
+                        "title": "Written during the benchmark",
+                        "content": "Synthetic content " * 10,
+                        "created_at": datetime.utcnow(),
+                    }
+                    for i in range(WRITE_BATCH_SIZE)
+                ])
+                db.commit()
+                with stats["writes"].get_lock():
+                    stats["writes"].value += 1
+            except OperationalError:
+                db.rollback()
+                with stats["errors"].get_lock():
+                    stats["errors"].value += 1
+            batch += 1
+    finally:
+        db.close()
+
+def reader(label, url, deadline, stats):
+    Session = sessionmaker(bind=make_engine(label, url))
+    db = Session()
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                db.execute(
+                    select(RawData.id, RawData.title, RawData.created_at)
+                    .order_by(RawData.created_at.desc(), RawData.id.desc())
+                    .limit(READ_PAGE_SIZE)
+                ).all()
+                db.execute(select(func.count(RawData.id)).where(RawData.source == "twitter")).scalar()
+                # End the read transaction, as a request would
+                db.commit()
+                with stats["reads"].get_lock():
+                    stats["reads"].value += 1
+            except OperationalError:
+                db.rollback()
+                with stats["errors"].get_lock():
+                    stats["errors"].value += 1
+    finally:
+        db.close()
+
+def run(label, url, rows, writers, readers, seconds):
+    engine = make_engine(label, url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    populate(sessionmaker(bind=engine), rows)
+    engine.dispose()
+
+    # Separate processes, as with several API workers beside an ingestion
+    # worker, so the database rather than the GIL is what is contended
+    stats = {name: multiprocessing.Value("i", 0) for name in ("writes", "reads", "errors")}
+    deadline = time.perf_counter() + seconds
+    processes = [
+        multiprocessing.Process(target=writer, args=(label, url, i, deadline, stats)) for i in range(writers)
+    ]
+    processes += [multiprocessing.Process(target=reader, args=(label, url, deadline, stats)) for _ in range(readers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    writes, reads, errors = (stats[name].value for name in ("writes", "reads", "errors"))
+    print(
+        f"{label:<12} {writes / seconds:>10.1f} {writes * WRITE_BATCH_SIZE / seconds:>10.0f} "
+        f"{reads / seconds:>10.1f} {errors:>8}"
+    )
+
+def main(database_url, rows, writers, readers, seconds):
+    print(f"{writers} writers, {readers} readers, {seconds}s per engine")
+    print(f"{'engine':<12} {'commits/s':>10} {'rows/s':>10} {'reads/s':>10} {'errors':>8}")
+    if database_url:
+        urls = [database_url, database_url]
+    else:
+        # Separate files, since journal_mode=WAL persists in the database file
+        directory = tempfile.mkdtemp()
+        urls = [f"sqlite:///{os.path.join(directory, name)}" for name in ("default.db", "configured.db")]
+    run("default", urls[0], rows, writers, readers, seconds)
+    run("configured", urls[1], rows, writers, readers, seconds)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", help="Database to benchmark against (defaults to temporary SQLite files)")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+    main(args.database_url, args.rows, args.writers, args.readers, args.seconds)
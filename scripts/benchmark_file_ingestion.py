@@ -0,0 +1,145 @@
+"""
+Generate a synthetic news dump and load it with FileIngestionService from
+JSONL and CSV, with and without the clustering pass, against reading the
+whole file into one clustering bulk_insert, reporting rows/s and peak
+memory of each run
+"""
+import sys
+import os
+import csv
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+WORDS = [
+    "market", "energy", "policy", "climate", "election", "court", "budget", "health", "vaccine", "storm",
+    "league", "season", "trade", "tariff", "startup", "launch", "satellite", "research", "study", "school",
+    "city", "council", "housing", "rent", "inflation", "bank", "rate", "oil", "gas", "solar", "wind", "grid",
+    "merger", "lawsuit", "strike", "union", "museum", "festival", "drought", "flood", "river", "bridge",
+    "airport", "rail", "transit", "hospital", "doctor", "patient", "farm", "harvest", "export", "import",
+]
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def write_dump(path, file_format, rows, seed=7):
+    """Write rows News API articles with distinct random-word text"""
+    rng = random.Random(seed)
+    published = datetime(2026, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8") as out:
+        writer = None
+        if file_format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(["url", "title", "description", "content", "author", "publishedAt", "source.name"])
+        for i in range(rows):
+            article = {
+                "url": f"https://example.com/articles/{i}",
+                "title": sentence(rng, 8),
+                "description": sentence(rng, 20),
+                "content": sentence(rng, 40),
+                "author": f"author{i % 500}",
+                "publishedAt": (published + timedelta(minutes=i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "source": {"name": f"outlet{i % 40}"},
+            }
+            if writer:
+                writer.writerow([
+                    article["url"], article["title"], article["description"], article["content"],
+                    article["author"], article["publishedAt"], article["source"]["name"],
+                ])
+            else:
+                out.write(json.dumps(article) + "\n")
+
+def peak_rss_mb():
+    """Peak resident memory of this process and of its largest parsing worker"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return (own + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024
+
+def run_mode(path, mode, workers, chunk_rows):
+    """Load the dump once into a fresh database; runs in its own process for a clean memory peak"""
+    from app.core.database import engine, Base, SessionLocal
+    from app.models import data_models  # noqa: F401 registers the tables
+    from app.services.ingestion_service import IngestionService, news_article_to_row
+    from app.services.file_ingestion_service import FileIngestionService, detect_format
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    started = time.perf_counter()
+    loaded = []
+    try:
+        if mode == "whole file":
+            with open(path, encoding="utf-8") as dump:
+                articles = [json.loads(line) for line in dump]
+            service = IngestionService(db)
+            count = service.bulk_insert("news", [news_article_to_row(article) for article in articles])
+            service.commit()
+        else:
+            service = FileIngestionService(db, workers=workers, chunk_rows=chunk_rows)
+            count = service.ingest_path(
+                path, "news", detect_format(path),
+                # The last progress call comes once every block is stored
+                progress=lambda _: loaded.append(time.perf_counter()),
+                cluster=mode == "clustered"
+            )["count"]
+    finally:
+        db.close()
+    elapsed = time.perf_counter() - started
+    load = (loaded[-1] - started) if loaded else elapsed
+    print(json.dumps({"load_seconds": load, "seconds": elapsed, "count": count, "peak_mb": peak_rss_mb()}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000, help="Articles in the dump")
+    parser.add_argument("--workers", type=int, help="Parsing processes (defaults to the CPU count)")
+    parser.add_argument("--chunk-rows", type=int, default=5000)
+    parser.add_argument("--run", nargs=2, metavar=("PATH", "MODE"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        path, mode = args.run
+        run_mode(path, mode, args.workers, args.chunk_rows)
+        return
+
+    # (label, dump format, mode)
+    modes = [
+        ("whole file", "jsonl", "whole file"),
+        ("jsonl", "jsonl", "clustered"),
+        ("csv", "csv", "clustered"),
+        ("jsonl, no clustering", "jsonl", "unclustered"),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        dumps = {}
+        for file_format in ("jsonl", "csv"):
+            dumps[file_format] = os.path.join(tmp, f"news.{file_format}")
+            write_dump(dumps[file_format], file_format, args.rows)
+        size = os.path.getsize(dumps["jsonl"]) / 1024 / 1024
+        workers = args.workers or os.cpu_count() or 1
+        print(
+            f"{args.rows} articles ({size:.1f} MB as JSONL), {args.chunk_rows} records per block, "
+            f"{workers} parsing worker(s), {os.cpu_count()} CPU(s)"
+        )
+        print(f"{'mode':<22} {'rows':>7} {'load s':>7} {'load rows/s':>12} {'total s':>8} {'rows/s':>7} {'peak MB':>8}")
+
+        for i, (label, file_format, mode) in enumerate(modes):
+            env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, f'benchmark{i}.db')}")
+            output = subprocess.run(
+                [
+                    sys.executable, __file__, "--workers", str(workers), "--chunk-rows", str(args.chunk_rows),
+                    "--run", dumps[file_format], mode
+                ],
+                env=env, check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{label:<22} {result['count']:>7} {result['load_seconds']:>7.2f} "
+                f"{result['count'] / result['load_seconds']:>12.0f} {result['seconds']:>8.2f} "
+                f"{result['count'] / result['seconds']:>7.0f} {result['peak_mb']:>8.0f}"
+            )
+
+if __name__ == "__main__":
+    main()
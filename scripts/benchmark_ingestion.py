@@ -0,0 +1,99 @@
+"""
+Benchmark bulk ingestion against the per-row insert loop
+"""
+import sys
+import os
+import time
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.data_models import RawData
+from app.services.ingestion_service import IngestionService, news_article_to_row
+
+def make_articles(count, offset=0):
+    """Generate synthetic News API articles"""
+    return [
+        {
+            "url": f"https://example.com/article/{offset + i}",
+            "title": f"Article {offset + i}",
+            "description": "Synthetic description",
+            "content": "Synthetic content " * 20,
+            "author": "bench",
+            "publishedAt": "2024-01-01T00:00:00Z",
+        }
+        for i in range(count)
+    ]
+
+def per_row_insert(db, rows):
+    """Baseline: one lookup query and one ORM add per row"""
+    count = 0
+    for row in rows:
+        existing = db.query(RawData).filter(
+            RawData.source == row["source"],
+            RawData.source_id == row["source_id"]
+        ).first()
+        if not existing:
+            db.add(RawData(**row))
+            count += 1
+    db.commit()
+    return count
+
+def bulk_insert(db, rows):
+    """Set-based lookup and Core executemany insert"""
+    count = IngestionService(db).bulk_insert("news", rows)
+    db.commit()
+    return count
+
+def run(database_url, sizes):
+    engine = create_engine(database_url)
+    Session = sessionmaker(bind=engine)
+
+    print(f"{'rows':>8} {'per-row rows/s':>16} {'bulk rows/s':>14} {'speedup':>8}")
+    for size in sizes:
+        results = {}
+        for name, insert_fn in (("per_row", per_row_insert), ("bulk", bulk_insert)):
+            Base.metadata.drop_all(bind=engine)
+            Base.metadata.create_all(bind=engine)
+            db = Session()
+            try:
+                # Half the batch is already stored so both paths exercise dedup
+                seed = [news_article_to_row(a) for a in make_articles(size // 2)]
+                bulk_insert(db, seed)
+                rows = [news_article_to_row(a) for a in make_articles(size)]
+
+                start = time.perf_counter()
+                inserted = insert_fn(db, rows)
+                elapsed = time.perf_counter() - start
+                assert inserted == size - size // 2
+                results[name] = size / elapsed
+            finally:
+                db.close()
+
+        speedup = results["bulk"] / results["per_row"]
+        print(f"{size:>8} {results['per_row']:>16.0f} {results['bulk']:>14.0f} {speedup:>7.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--database-url",
+        help="Database to benchmark (defaults to a temporary SQLite file); "
+             "pass a postgresql:// URL to benchmark Postgres. "
+             "Its tables are dropped and recreated"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000]
+    )
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.sizes)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.sizes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark response size and latency of limit=1000 data pages
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_articles(count):
+    """Generate News API articles with realistically sized payloads"""
+    return [
+        {
+            "source": {"id": "bench", "name": "Bench"},
+            "author": "bench",
+            "title": f"Article {i}",
+            "description": "Synthetic description " * 10,
+            "url": f"https://example.com/article/{i}",
+            "urlToImage": f"https://example.com/article/{i}.jpg",
+            "publishedAt": "2024-01-01T00:00:00Z",
+            "content": "Synthetic content " * 60,
+        }
+        for i in range(count)
+    ]
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def run_benchmark(rows, requests, limit):
+    # The app reads its settings at import time, so point it at the database first
+    from fastapi import Depends
+    from sqlalchemy.orm import Session
+    from app.core.database import engine, Base, SessionLocal, get_db
+    from app.main import app
+    from app.models.data_models import RawData
+    from app.schemas.data_schemas import DataResponse, DataListResponse
+    from app.services.ingestion_service import IngestionService, news_article_to_row
+    import httpx
+
+    # The previous listing: ORM entities, one DataResponse per row
+    @app.get("/bench/baseline", response_model=DataListResponse)
+    async def baseline(limit: int = 100, db: Session = Depends(get_db)):
+        query = db.query(RawData)
+        total = query.count()
+        data = query.offset(0).limit(limit).all()
+        return DataListResponse(
+            data=[DataResponse.from_orm(item) for item in data],
+            total=total,
+            skip=0,
+            limit=limit
+        )
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        IngestionService(db).bulk_insert("news", [news_article_to_row(a) for a in make_articles(rows)])
+        db.commit()
+    finally:
+        db.close()
+
+    variants = [
+        ("baseline (per-row pydantic)", f"/bench/baseline?limit={limit}"),
+        ("all fields", f"/api/v1/data/?limit={limit}&count=exact"),
+        ("fields=id,title,url", f"/api/v1/data/?limit={limit}&count=exact&fields=id,title,url"),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        print(f"{'variant':<30} {'bytes':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, url in variants:
+            await client.get(url)
+            times = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                response = await client.get(url)
+                times.append(time.perf_counter() - start)
+                response.raise_for_status()
+            print(
+                f"{name:<30} {len(response.content):>10} "
+                f"{percentile(times, 0.5) * 1000:>8.1f} {percentile(times, 0.99) * 1000:>8.1f}"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(run_benchmark(args.rows, args.requests, args.limit))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compare raw_data table size and scan speed with inline and compressed raw_metadata
+"""
+import sys
+import os
+import time
+import random
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.database import Base
+from app.services.ingestion_service import IngestionService, news_article_to_row, tweet_to_row
+
+BATCH_SIZE = 1000
+
+def make_news(rng, i):
+    """A News API article shaped like real responses"""
+    words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    return {
+        "source": {"id": None, "name": rng.choice(["Reuters", "BBC News", "The Verge", "TechCrunch"])},
+        "author": words(2).title(),
+        "title": words(10).capitalize(),
+        "description": words(35).capitalize() + ".",
+        "url": f"https://www.example-news.com/2024/01/{i}/{words(5).replace(' ', '-')}",
+        "urlToImage": f"https://cdn.example-news.com/images/{i}.jpg",
+        "publishedAt": "2024-01-01T12:00:00Z",
+        "content": words(40).capitalize() + "… [+3200 chars]",
+    }
+
+def make_tweet(rng, i):
+    """A tweepy tweet dictionary with the fields TwitterService requests"""
+    words = lambda n: " ".join(rng.choice(WORDS) for _ in range(n))
+    return {
+        "id": 1700000000000000000 + i,
+        "text": words(25),
+        "author_id": str(rng.randint(10 ** 8, 10 ** 9)),
+        "created_at": "2024-01-01T12:00:00+00:00",
+        "public_metrics": {
+            "retweet_count": rng.randint(0, 500), "reply_count": rng.randint(0, 50),
+            "like_count": rng.randint(0, 5000), "quote_count": rng.randint(0, 20),
+        },
+        "context_annotations": [
+            {"domain": {"id": "66", "name": "Interests and Hobbies Category"},
+             "entity": {"id": "847544972781826048", "name": "Technology"}}
+        ],
+    }
+
+rng_words = random.Random(0)
+WORDS = ["".join(rng_words.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng_words.randint(2, 9))) for _ in range(5000)]
+
+def table_bytes(db, table):
+    """Bytes used by a table, from SQLite's dbstat virtual table"""
+    try:
+        return db.execute(text("SELECT SUM(pgsize) FROM dbstat WHERE name = :name"), {"name": table}).scalar() or 0
+    except Exception:
+        return None
+
+def time_scan(db, repeat):
+    """Full scan of raw_data on an unindexed column stored after raw_metadata"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        db.execute(text("SELECT COUNT(*) FROM raw_data WHERE updated_at < '2000-01-01'")).scalar()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(directory, rows, repeat):
+    results = {}
+    for mode in ("inline", "compressed"):
+        settings.RAW_METADATA_STORAGE = mode
+        engine = create_engine(f"sqlite:///{os.path.join(directory, f'{mode}.db')}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            rng = random.Random(1)
+            service = IngestionService(db)
+            for offset in range(0, rows, BATCH_SIZE):
+                count = min(BATCH_SIZE, rows - offset)
+                service.bulk_insert("news", [news_article_to_row(make_news(rng, offset + i)) for i in range(count // 2)])
+                service.bulk_insert("twitter", [tweet_to_row(make_tweet(rng, offset + i)) for i in range(count - count // 2)])
+                db.commit()
+            db.execute(text("VACUUM"))
+            results[mode] = (
+                table_bytes(db, "raw_data"),
+                table_bytes(db, "raw_metadata_blobs"),
+                time_scan(db, repeat),
+            )
+        finally:
+            db.close()
+            engine.dispose()
+
+    inline_bytes, _, inline_scan = results["inline"]
+    hot_bytes, blob_bytes, compressed_scan = results["compressed"]
+    print(f"{rows} rows, half news and half tweets")
+    if inline_bytes is not None:
+        print(f"raw_data inline:     {inline_bytes / 2 ** 20:8.1f} MiB")
+        print(f"raw_data compressed: {hot_bytes / 2 ** 20:8.1f} MiB ({1 - hot_bytes / inline_bytes:.0%} smaller), "
+              f"plus {blob_bytes / 2 ** 20:.1f} MiB of compressed payloads")
+    else:
+        print("SQLite was built without dbstat; table sizes unavailable")
+    print(f"Full scan: inline {inline_scan * 1000:.1f} ms, compressed {compressed_scan * 1000:.1f} ms "
+          f"({inline_scan / compressed_scan:.1f}x faster)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run(tmp, args.rows, args.repeat)
+
+if __name__ == "__main__":
+    main()
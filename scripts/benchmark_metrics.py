@@ -0,0 +1,103 @@
+"""
+Measure the overhead of metrics collection: /data requests through the
+app and bulk inserts, with METRICS_ENABLED on and off, each setting in a
+fresh process since the middleware and statement hooks are installed at
+import
+"""
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def make_rows(start, count):
+    from app.services.ingestion_service import news_article_to_row
+
+    return [
+        news_article_to_row({
+            "url": f"https://example.com/articles/{start + i}",
+            "title": f"article {start + i} about topic {i % 97}",
+            "description": f"summary number {start + i} of story {i % 13} in section {i % 7}",
+            "publishedAt": "2026-01-01T00:00:00Z",
+        })
+        for i in range(count)
+    ]
+
+async def time_requests(app, requests):
+    """Seconds for sequential GET /data pages; distinct offsets miss the response cache"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        started = time.perf_counter()
+        for i in range(requests):
+            response = await client.get("/api/v1/data/", params={"skip": i, "limit": 20, "count": "exact"})
+            response.raise_for_status()
+        return time.perf_counter() - started
+
+def run_mode(rows, batch, requests):
+    """Seconds to insert rows into a fresh database, then to serve requests"""
+    from app.core.database import engine, Base, SessionLocal
+    from app.models import data_models  # noqa: F401 registers the tables
+    from app.services.ingestion_service import IngestionService
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        for start in range(0, rows, batch):
+            IngestionService(db).bulk_insert("news", make_rows(start, min(batch, rows - start)))
+            db.commit()
+        insert_seconds = time.perf_counter() - started
+    finally:
+        db.close()
+    request_seconds = asyncio.run(time_requests(app, requests))
+    print(json.dumps({"insert": insert_seconds, "requests": request_seconds}))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000, help="Rows inserted per round")
+    parser.add_argument("--batch", type=int, default=100, help="Rows per bulk_insert call")
+    parser.add_argument("--requests", type=int, default=1000, help="/data requests per round")
+    parser.add_argument("--rounds", type=int, default=6, help="Rounds per setting; the fastest is kept")
+    parser.add_argument("--run", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_mode(args.rows, args.batch, args.requests)
+        return
+
+    # Rounds alternate the two settings so drift in machine load hits both
+    results = {"False": [], "True": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for round_number in range(args.rounds):
+            order = ("False", "True") if round_number % 2 == 0 else ("True", "False")
+            for enabled in order:
+                env = dict(
+                    os.environ,
+                    DATABASE_URL=f"sqlite:///{os.path.join(tmp, f'benchmark_{round_number}_{enabled}.db')}",
+                    METRICS_ENABLED=enabled,
+                )
+                output = subprocess.run(
+                    [sys.executable, __file__, "--run", "--rows", str(args.rows), "--batch", str(args.batch),
+                     "--requests", str(args.requests)],
+                    env=env, check=True, capture_output=True, text=True
+                ).stdout
+                results[enabled].append(json.loads(output.strip().splitlines()[-1]))
+
+    off, on = (
+        {name: min(result[name] for result in results[enabled]) for name in ("insert", "requests")}
+        for enabled in ("False", "True")
+    )
+    print(f"{args.rows} rows in batches of {args.batch}, {args.requests} /data requests, best of {args.rounds}")
+    print(f"{'workload':<10} {'off s':>8} {'on s':>8} {'overhead':>9}")
+    for name in ("insert", "requests"):
+        print(f"{name:<10} {off[name]:>8.3f} {on[name]:>8.3f} {(on[name] / off[name] - 1) * 100:>8.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark near-duplicate clustering on a synthetic corpus of edited copies
+"""
+import sys
+import os
+import time
+import random
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.data_models import RawData
+from app.services.ingestion_service import IngestionService, news_article_to_row
+
+def make_corpus(originals, copies_per_original, edit_rate, words_per_article, seed=0):
+    """Articles plus syndicated copies with a fraction of words replaced.
+
+    Returns the articles and, per article, the index of its original.
+    """
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(50000)]
+
+    articles = []
+    origins = []
+    for i in range(originals):
+        words = rng.choices(vocabulary, k=words_per_article)
+        articles.append(words)
+        origins.append(i)
+        for _ in range(copies_per_original):
+            copy = [rng.choice(vocabulary) if rng.random() < edit_rate else word for word in words]
+            articles.append(copy)
+            origins.append(i)
+
+    order = list(range(len(articles)))
+    rng.shuffle(order)
+    return (
+        [
+            {"url": f"https://example.com/{n}", "title": "", "content": " ".join(articles[index])}
+            for n, index in enumerate(order)
+        ],
+        [origins[index] for index in order],
+    )
+
+def run(database_url, originals, copies, edit_rate, words, batch_size):
+    engine = create_engine(database_url)
+    Session = sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    articles, origins = make_corpus(originals, copies, edit_rate, words)
+    db = Session()
+    try:
+        service = IngestionService(db)
+        start = time.perf_counter()
+        for offset in range(0, len(articles), batch_size):
+            service.bulk_insert("news", [news_article_to_row(a) for a in articles[offset:offset + batch_size]])
+            db.commit()
+        elapsed = time.perf_counter() - start
+
+        clusters = dict(db.query(RawData.source_id, RawData.duplicate_cluster_id).all())
+    finally:
+        db.close()
+
+    # Pairwise precision/recall over rows that should share a cluster
+    predicted = [clusters[f"https://example.com/{n}"] for n in range(len(articles))]
+    true_pairs = found_pairs = correct_pairs = 0
+    by_origin = {}
+    by_cluster = {}
+    for n, (origin, cluster) in enumerate(zip(origins, predicted)):
+        by_origin.setdefault(origin, []).append(n)
+        by_cluster.setdefault(cluster, []).append(n)
+    for members in by_origin.values():
+        true_pairs += len(members) * (len(members) - 1) // 2
+    for members in by_cluster.values():
+        found_pairs += len(members) * (len(members) - 1) // 2
+        for i, a in enumerate(members):
+            correct_pairs += sum(origins[a] == origins[b] for b in members[i + 1:])
+
+    print(f"{len(articles)} articles ({originals} originals, {copies} copies each, {edit_rate:.0%} words edited)")
+    print(f"Ingested in {elapsed:.1f}s ({len(articles) / elapsed:.0f} rows/s)")
+    print(f"Clusters: {len(by_cluster)} (expected {originals})")
+    print(f"Pair precision: {correct_pairs / max(found_pairs, 1):.3f}, recall: {correct_pairs / max(true_pairs, 1):.3f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--database-url",
+        help="Database to benchmark (defaults to a temporary SQLite file); "
+             "pass a postgresql:// URL to benchmark Postgres. "
+             "Its tables are dropped and recreated"
+    )
+    parser.add_argument("--originals", type=int, default=5000)
+    parser.add_argument("--copies", type=int, default=3)
+    parser.add_argument("--edit-rate", type=float, default=0.01)
+    parser.add_argument("--words", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.originals, args.copies, args.edit_rate, args.words, args.batch_size)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(
+                f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+                args.originals, args.copies, args.edit_rate, args.words, args.batch_size
+            )
+
+if __name__ == "__main__":
+    main()
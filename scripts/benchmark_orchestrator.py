@@ -0,0 +1,104 @@
+"""
+Benchmark end-to-end wall time for ingesting N news sources from the local
+stub API: sequentially through one shared session, as
+scripts/ingest_sample_data.py does, against the concurrent orchestrator
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api import start_stub_server
+
+def queries(sources):
+    return [f"topic{i}" for i in range(sources)]
+
+async def sequential(sources, page_size):
+    from app.core.database import SessionLocal
+    from app.services.ingestion_service import IngestionService
+
+    db = SessionLocal()
+    try:
+        service = IngestionService(db)
+        rows = 0
+        for query in queries(sources):
+            result = await service.ingest_news_data(query=query, page_size=page_size, incremental=False)
+            rows += result["count"]
+        return rows
+    finally:
+        db.close()
+
+async def orchestrated(sources, page_size):
+    from app.core.database import SessionLocal
+    from app.models.data_models import DataSource
+    from app.services.ingestion_service import news_source_name
+    from app.services.orchestrator_service import IngestionOrchestrator
+
+    db = SessionLocal()
+    try:
+        db.add_all([
+            DataSource(
+                name=news_source_name(query, "en"),
+                source_type="news_api",
+                config={"query": query, "language": "en", "page_size": page_size, "incremental": False},
+            )
+            for query in queries(sources)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    # Limits from settings, pacing lifted so only concurrency is measured
+    result = await IngestionOrchestrator(fetches_per_minute={"news_api": 0, "twitter": 0}).run_once()
+    return result["inserted"]
+
+async def run(mode, sources, page_size):
+    # The app reads its settings at import time, so point it at the stub first
+    from app.core.database import engine, Base
+    # Importing the models registers their tables with Base
+    import app.models.data_models
+    from app.core.http import close_http_client
+    from app.services.upstream_cache import upstream_cache
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    upstream_cache.clear()
+    started = time.perf_counter()
+    try:
+        rows = await (sequential if mode == "sequential" else orchestrated)(sources, page_size)
+    finally:
+        # The shared client is bound to this run's event loop
+        await close_http_client()
+    elapsed = time.perf_counter() - started
+    print(f"{mode:<12} {elapsed:>9.2f} {rows:>8} {rows / elapsed:>10.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=8)
+    parser.add_argument("--articles", type=int, default=500, help="Articles ingested per source")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub API latency per request in seconds")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent news fetches in the orchestrator")
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency, total_results=args.articles)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'benchmark.db')}"
+        os.environ["NEWS_API_KEY"] = "stub"
+        os.environ["NEWS_API_BASE_URL"] = f"{server.base_url}/v2"
+        os.environ["ORCHESTRATOR_MAX_CONCURRENT_NEWS"] = str(args.concurrency)
+        print(
+            f"{args.sources} sources x {args.articles} articles in pages of 100, "
+            f"{args.latency * 1000:.0f} ms stub latency"
+        )
+        print(f"{'mode':<12} {'seconds':>9} {'rows':>8} {'rows/s':>10}")
+        try:
+            for mode in ("sequential", "orchestrator"):
+                asyncio.run(run(mode, args.sources, args.articles))
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark offset pagination against cursor pagination at increasing depth
+"""
+import sys
+import os
+import time
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.data_models import RawData
+from app.api.endpoints.data import paginate, encode_cursor
+
+CHUNK_SIZE = 50000
+
+def populate(db, rows):
+    """Insert synthetic rows, several per created_at second so ties are exercised"""
+    start = datetime(2024, 1, 1)
+    for offset in range(0, rows, CHUNK_SIZE):
+        db.execute(insert(RawData), [
+            {
+                "source": "news" if i % 2 else "twitter",
+                "source_id": str(i),
+                "title": f"Item {i}",
+                "content": "Synthetic content",
+                "created_at": start + timedelta(seconds=i // 4),
+            }
+            for i in range(offset, min(offset + CHUNK_SIZE, rows))
+        ])
+        db.commit()
+
+def time_page(db, skip, limit, cursor, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items, _ = paginate(db.query(RawData), skip, limit, cursor)
+        best = min(best, time.perf_counter() - start)
+        assert len(items) == limit
+    return best
+
+def run(database_url, rows, depths, limit, repeat):
+    engine = create_engine(database_url)
+    Session = sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = Session()
+    try:
+        start = time.perf_counter()
+        populate(db, rows)
+        print(f"Inserted {rows} rows in {time.perf_counter() - start:.1f}s")
+
+        print(f"{'depth':>10} {'offset ms':>10} {'cursor ms':>10}")
+        for depth in depths:
+            if depth + limit > rows:
+                continue
+            # Cursor pointing just before the row at this depth (not timed)
+            cursor = None
+            if depth:
+                before, _ = paginate(db.query(RawData), depth - 1, 1)
+                cursor = encode_cursor(before[0])
+            offset_time = time_page(db, depth, limit, None, repeat)
+            cursor_time = time_page(db, 0, limit, cursor, repeat)
+            print(f"{depth:>10} {offset_time * 1000:>10.2f} {cursor_time * 1000:>10.2f}")
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--database-url",
+        help="Database to benchmark (defaults to a temporary SQLite file); "
+             "pass a postgresql:// URL to benchmark Postgres. "
+             "Its tables are dropped and recreated"
+    )
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument(
+        "--depths", type=int, nargs="+", default=[0, 1000, 10000, 100000, 500000, 999000]
+    )
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.rows, args.depths, args.limit, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.depths, args.limit, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark a News API ingestion through the staged pipeline against fetching
+everything before writing and against handling one page at a time, and
+print the pipeline's per-stage throughput and queue depths
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api import start_stub_server
+
+async def fetch_all_then_write(service, query, articles, max_concurrent_pages):
+    """Fetch every page, map every article, then write and commit once"""
+    from app.services.ingestion_service import news_article_to_row
+
+    fetched = []
+    async for _, page in service.news_service.iter_article_pages(
+        query, page_size=articles, max_concurrent_pages=max_concurrent_pages
+    ):
+        fetched.extend(page)
+    rows = [news_article_to_row(article) for article in fetched]
+    count = service.bulk_insert("news", rows)
+    service.db.commit()
+    return count
+
+async def page_at_a_time(service, query, articles, max_concurrent_pages):
+    """Map, write and commit each page before taking the next"""
+    from app.services.ingestion_service import news_article_to_row
+
+    count = 0
+    async for _, page in service.news_service.iter_article_pages(
+        query, page_size=articles, max_concurrent_pages=max_concurrent_pages
+    ):
+        count += service.bulk_insert("news", [news_article_to_row(article) for article in page])
+        service.db.commit()
+    return count
+
+async def pipelined(service, query, articles, max_concurrent_pages):
+    from app.services.ingestion_service import news_article_to_row
+
+    async def pages():
+        async for _, page in service.news_service.iter_article_pages(
+            query, page_size=articles, max_concurrent_pages=max_concurrent_pages
+        ):
+            yield page
+
+    result = await service.pipeline("news").run(pages(), news_article_to_row)
+    return result
+
+MODES = {"fetch all, then write": fetch_all_then_write, "page at a time": page_at_a_time, "pipeline": pipelined}
+
+async def run(label, articles, max_concurrent_pages):
+    # The app reads its settings at import time, so point it at the stub first
+    from app.core.database import engine, Base, SessionLocal
+    from app.core.http import close_http_client
+    from app.services.ingestion_service import IngestionService
+    from app.services.upstream_cache import upstream_cache
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    upstream_cache.clear()
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        result = await MODES[label](IngestionService(db), "benchmark", articles, max_concurrent_pages)
+    finally:
+        db.close()
+        # The shared client is bound to this run's event loop
+        await close_http_client()
+    elapsed = time.perf_counter() - started
+
+    count = result["count"] if isinstance(result, dict) else result
+    print(f"{label:<22} {elapsed:>8.2f} {count:>7} {count / elapsed:>8.0f}")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=3000, help="Articles ingested, in pages of 100")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub API latency per request in seconds")
+    parser.add_argument("--max-concurrent-pages", type=int, default=1, help="Pages requested at a time")
+    parser.add_argument("--commit-batch-size", type=int, default=500)
+    parser.add_argument("--queue-size", type=int, default=4)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency, total_results=args.articles)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'benchmark.db')}"
+        os.environ["NEWS_API_KEY"] = "stub"
+        os.environ["NEWS_API_BASE_URL"] = f"{server.base_url}/v2"
+        os.environ["INGESTION_COMMIT_BATCH_SIZE"] = str(args.commit_batch_size)
+        os.environ["INGESTION_QUEUE_SIZE"] = str(args.queue_size)
+        print(
+            f"{args.articles} articles, {args.latency * 1000:.0f} ms stub latency, "
+            f"{args.max_concurrent_pages} page(s) requested at a time"
+        )
+        print(f"{'mode':<22} {'seconds':>8} {'rows':>7} {'rows/s':>8}")
+        try:
+            for label in MODES:
+                result = asyncio.run(run(label, args.articles, args.max_concurrent_pages))
+        finally:
+            server.shutdown()
+
+    print(f"\n{'stage':<10} {'pages':>6} {'rows':>7} {'seconds':>8} {'rows/s':>8}")
+    for name, stage in result["stages"].items():
+        print(f"{name:<10} {stage['pages']:>6} {stage['rows']:>7} {stage['seconds']:>8.2f} {stage['rows_per_second'] or 0:>8}")
+    print(f"\n{'queue':<11} {'mean depth':>10} {'max depth':>10} {'full waits':>11} {'blocked s':>10}")
+    for name, queue in result["queues"].items():
+        print(
+            f"{name:<11} {queue['mean_depth']:>10} {queue['max_depth']:>10} "
+            f"{queue['full_waits']:>11} {queue['blocked_seconds']:>10.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
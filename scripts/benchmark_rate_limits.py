@@ -0,0 +1,98 @@
+"""
+Run concurrent News API ingestions against a local stub that enforces a
+request quota, with and without the rate limiter, and report failures and
+sustained upstream throughput
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api import start_stub_server
+
+# (label, rate limiter enabled, stub sends x-rate-limit headers)
+MODES = [
+    ("no limiter", False, True),
+    ("limiter, backoff only", True, False),
+    ("limiter, quota headers", True, True),
+]
+
+async def run(server, label, enabled, rate_headers, sources, articles):
+    # The app reads its settings at import time, so point it at the stub first
+    from app.core.database import engine, Base, SessionLocal
+    from app.core.http import close_http_client
+    from app.services.ingestion_service import IngestionService
+    from app.services.rate_limiter import rate_limiter
+    from app.services.upstream_cache import upstream_cache
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    upstream_cache.clear()
+    rate_limiter.clear()
+    rate_limiter.enabled = enabled
+    server.rate_headers = rate_headers
+    server.reset()
+
+    async def ingest(query):
+        # A session each, as separate ingestion jobs would have
+        db = SessionLocal()
+        try:
+            result = await IngestionService(db).ingest_news_data(query=query, page_size=articles, incremental=False)
+            return result["count"]
+        finally:
+            db.close()
+
+    started = time.perf_counter()
+    try:
+        results = await asyncio.gather(*(ingest(f"topic{i}") for i in range(sources)), return_exceptions=True)
+    finally:
+        # The shared client is bound to this run's event loop
+        await close_http_client()
+    elapsed = time.perf_counter() - started
+
+    failed = sum(isinstance(result, Exception) for result in results)
+    rows = sum(result for result in results if not isinstance(result, Exception))
+    served = server.requests - server.rate_limited
+    print(
+        f"{label:<24} {elapsed:>8.2f} {sources - failed:>4} {failed:>6} {rows:>7} "
+        f"{server.requests:>9} {server.rate_limited:>6} {served / elapsed:>9.1f}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=60, help="Concurrent ingestions")
+    parser.add_argument("--articles", type=int, default=20, help="Articles per ingestion, in pages of 100")
+    parser.add_argument("--quota", type=int, default=20, help="Requests the stub allows per window")
+    parser.add_argument("--window", type=float, default=2.0, help="Stub quota window in seconds")
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args()
+
+    server = start_stub_server(
+        latency=args.latency, total_results=args.articles, quota=args.quota, window=args.window
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'benchmark.db')}"
+        # A pooled connection for each concurrent ingestion's session
+        os.environ["DATABASE_POOL_SIZE"] = str(args.sources)
+        os.environ["NEWS_API_KEY"] = "stub"
+        os.environ["NEWS_API_BASE_URL"] = f"{server.base_url}/v2"
+        print(
+            f"{args.sources} ingestions x {args.articles} articles, stub quota {args.quota} requests "
+            f"per {args.window:g}s ({args.quota / args.window:.1f}/s)"
+        )
+        print(
+            f"{'mode':<24} {'seconds':>8} {'ok':>4} {'failed':>6} {'rows':>7} "
+            f"{'requests':>9} {'429s':>6} {'served/s':>9}"
+        )
+        try:
+            for label, enabled, rate_headers in MODES:
+                asyncio.run(run(server, label, enabled, rate_headers, args.sources, args.articles))
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark the SQLite FTS5 index against a naive LIKE '%term%' scan
+"""
+import sys
+import os
+import time
+import random
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, select, or_, text
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.data_models import RawData
+from app.services.search_service import SearchService, fts5_match_expression
+
+CHUNK_SIZE = 50000
+VOCABULARY_SIZE = 20000
+WORDS_PER_ROW = 40
+
+def make_vocabulary():
+    """Synthetic words; low indices are drawn far more often (Zipf-like)"""
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(VOCABULARY_SIZE)]
+
+def populate(db, rows, vocabulary):
+    rng = random.Random(1)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    for offset in range(0, rows, CHUNK_SIZE):
+        count = min(CHUNK_SIZE, rows - offset)
+        words = rng.choices(vocabulary, weights=weights, k=count * (WORDS_PER_ROW + 6))
+        batch = []
+        for i in range(count):
+            row_words = words[i * (WORDS_PER_ROW + 6):(i + 1) * (WORDS_PER_ROW + 6)]
+            batch.append({
+                "source": "news",
+                "source_id": str(offset + i),
+                "title": " ".join(row_words[:6]),
+                "content": " ".join(row_words[6:]),
+            })
+        db.execute(insert(RawData), batch)
+        db.commit()
+
+def like_matches(db, q):
+    """Baseline: substring scan of title and content for every term"""
+    statement = select(RawData.id).where(*(
+        or_(RawData.title.like(f"%{term}%"), RawData.content.like(f"%{term}%"))
+        for term in q.split()
+    ))
+    return db.execute(statement).all()
+
+def fts_matches(db, q):
+    """Every row matching q, looked up in the full-text index without ranking"""
+    statement = text("SELECT rowid FROM raw_data_fts WHERE raw_data_fts MATCH :q")
+    return db.execute(statement, {"q": fts5_match_expression(q)}).all()
+
+def fts_ranked(db, q, limit):
+    return SearchService(db).search(q, [RawData.id, RawData.title], limit=limit)
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(database_url, rows, limit, repeat):
+    engine = create_engine(database_url)
+    Session = sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    vocabulary = make_vocabulary()
+    db = Session()
+    try:
+        start = time.perf_counter()
+        populate(db, rows, vocabulary)
+        print(f"Inserted and indexed {rows} rows in {time.perf_counter() - start:.1f}s")
+
+        queries = [
+            ("common term", vocabulary[0]),
+            ("mid-frequency term", vocabulary[500]),
+            ("rare term", vocabulary[-1]),
+            ("two terms", f"{vocabulary[10]} {vocabulary[300]}"),
+        ]
+        # Ranking needs every match, so the scan is timed to completion.
+        # Ranked search cost grows with the number of matches, so very
+        # common terms (stop-word like) stay expensive.
+        print(f"{'query':<20} {'matches':>8} {'LIKE ms':>10} {'FTS ms':>10} {'speedup':>8} {'ranked ms':>10}")
+        for name, q in queries:
+            matches = len(fts_matches(db, q))
+            like_time = best_time(lambda: like_matches(db, q), repeat)
+            fts_time = best_time(lambda: fts_matches(db, q), repeat)
+            ranked_time = best_time(lambda: fts_ranked(db, q, limit), repeat)
+            print(
+                f"{name:<20} {matches:>8} {like_time * 1000:>10.1f} {fts_time * 1000:>10.1f} "
+                f"{like_time / fts_time:>7.1f}x {ranked_time * 1000:>10.1f}"
+            )
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--database-url",
+        help="SQLite database to benchmark (defaults to a temporary file). "
+             "Its tables are dropped and recreated"
+    )
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.rows, args.limit, args.repeat)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.limit, args.repeat)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark chunked text analytics over a large table within a memory ceiling
+"""
+import sys
+import os
+import time
+import random
+import resource
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.data_models import RawData
+from app.services.text_analytics_service import TextAnalyticsService, SENTIMENT_LEXICON
+
+INSERT_CHUNK_SIZE = 50000
+WORDS_PER_ROW = 40
+
+def populate(db, rows):
+    """Insert rows of synthetic text mixing a Zipf-like vocabulary with lexicon words"""
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) for _ in range(20000)]
+    vocabulary += list(SENTIMENT_LEXICON)
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    for offset in range(0, rows, INSERT_CHUNK_SIZE):
+        count = min(INSERT_CHUNK_SIZE, rows - offset)
+        words = rng.choices(vocabulary, weights=weights, k=count * WORDS_PER_ROW)
+        db.execute(insert(RawData), [
+            {
+                "source": "news" if i % 3 else "twitter",
+                "source_id": str(offset + i),
+                "content": " ".join(words[i * WORDS_PER_ROW:(i + 1) * WORDS_PER_ROW]),
+            }
+            for i in range(count)
+        ])
+        db.commit()
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run(database_url, rows, chunksize, max_memory_mb):
+    engine = create_engine(database_url)
+    Session = sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = Session()
+    try:
+        start = time.perf_counter()
+        populate(db, rows)
+        print(f"Inserted {rows} rows in {time.perf_counter() - start:.1f}s")
+        baseline_rss = peak_rss_mb()
+
+        start = time.perf_counter()
+        result = TextAnalyticsService(db).analyze(top_n=10, chunksize=chunksize)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+
+    rss = peak_rss_mb()
+    print(f"Analyzed {result['rows']} rows in {elapsed:.1f}s ({result['rows'] / elapsed:.0f} rows/s)")
+    print(f"Top keywords: {', '.join(keyword['term'] for keyword in result['keywords'])}")
+    print(f"Peak RSS: {rss:.0f} MB (before analysis {baseline_rss:.0f} MB, ceiling {max_memory_mb} MB)")
+    if rss > max_memory_mb:
+        sys.exit(f"Peak RSS {rss:.0f} MB exceeded the {max_memory_mb} MB ceiling")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--database-url",
+        help="Database to benchmark (defaults to a temporary SQLite file); "
+             "pass a postgresql:// URL to benchmark Postgres. "
+             "Its tables are dropped and recreated"
+    )
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--chunksize", type=int, default=20000)
+    parser.add_argument("--max-memory-mb", type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.database_url:
+        run(args.database_url, args.rows, args.chunksize, args.max_memory_mb)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            run(f"sqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.chunksize, args.max_memory_mb)
+
+if __name__ == "__main__":
+    main()
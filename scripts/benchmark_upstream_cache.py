@@ -0,0 +1,90 @@
+"""
+Measure upstream News API calls and bytes across repeated scheduled
+ingestion runs, with and without the response cache and incremental fetching
+"""
+import sys
+import os
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api import start_stub_server
+
+MODES = {
+    "full": {"cache": False, "incremental": False},
+    "cache": {"cache": True, "incremental": False},
+    "cache+incremental": {"cache": True, "incremental": True},
+}
+
+async def run_schedule(server, mode, query, runs, repeats, initial, new_per_run, page_size):
+    # The app reads its settings at import time, so point it at the stub first
+    from app.core.database import engine, Base, SessionLocal
+    from app.core.http import close_http_client
+    from app.services.ingestion_service import IngestionService
+    from app.services.upstream_cache import upstream_cache
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    upstream_cache.clear()
+    upstream_cache.reset_stats()
+    upstream_cache.enabled = MODES[mode]["cache"]
+    server.total_results = initial
+    server.requests = server.bytes_sent = 0
+
+    rows = 0
+    db = SessionLocal()
+    try:
+        for run in range(runs):
+            # Time passes between scheduled runs: new articles appear and
+            # cached responses go stale
+            if run:
+                server.total_results += new_per_run
+            upstream_cache.expire()
+            # Overlapping schedules ask for the same query more than once
+            for _ in range(repeats):
+                result = await IngestionService(db).ingest_news_data(
+                    query=query, page_size=page_size, incremental=MODES[mode]["incremental"]
+                )
+                rows += result["count"]
+    finally:
+        db.close()
+        # The shared client is bound to this run's event loop
+        await close_http_client()
+
+    print(
+        f"{mode:<18} {server.requests:>9} {server.bytes_sent / 1024:>10.1f} "
+        f"{upstream_cache.stats['hits']:>6} {upstream_cache.stats['not_modified']:>6} {rows:>7}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=2, help="Ingestions of the query per scheduled run")
+    parser.add_argument("--initial", type=int, default=500, help="Articles available before the first run")
+    parser.add_argument("--new-per-run", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=0.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'benchmark.db')}"
+        os.environ["NEWS_API_KEY"] = "stub"
+        os.environ["NEWS_API_BASE_URL"] = f"{server.base_url}/v2"
+        print(
+            f"{args.runs} runs x {args.repeats}, {args.initial} articles then {args.new_per_run} new per run, "
+            f"up to {args.page_size} per ingestion"
+        )
+        print(f"{'mode':<18} {'requests':>9} {'KiB sent':>10} {'hits':>6} {'304s':>6} {'rows':>7}")
+        try:
+            for mode in MODES:
+                asyncio.run(run_schedule(
+                    server, mode, "benchmark", args.runs, args.repeats,
+                    args.initial, args.new_per_run, args.page_size
+                ))
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+"""
+Move inline raw_metadata payloads into the compressed side table
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.metadata_store import MetadataStore
+
+def compact_metadata():
+    """Compress raw_metadata stored inline by earlier versions or inline mode"""
+    db = SessionLocal()
+    try:
+        print("Compacting raw_metadata...")
+        start = time.perf_counter()
+        moved = MetadataStore(db).compact()
+        print(f"Moved {moved} payloads in {time.perf_counter() - start:.1f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    compact_metadata()
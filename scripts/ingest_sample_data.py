@@ -7,6 +7,7 @@ import asyncio
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.database import SessionLocal
+from app.core.http import close_http_client
 from app.services.ingestion_service import IngestionService
 
 async def ingest_sample_data():
@@ -44,6 +45,7 @@ async def ingest_sample_data():
         
     finally:
         db.close()
+        await close_http_client()
 
 if __name__ == "__main__":
     asyncio.run(ingest_sample_data())
@@ -6,12 +6,18 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.database import engine, Base
-from app.models.data_models import RawData, DataSource
+from app.models.data_models import RawData, DataSource, IngestionJob, RawMetadataBlob, MinHashBand, VolumeRollup, create_search_index, upgrade_raw_data, add_missing_columns
 
 def init_database():
     """Initialize the database with all tables"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist, so bring older ones up to
+    # date and add the search index explicitly
+    with engine.begin() as connection:
+        upgrade_raw_data(connection)
+        add_missing_columns(connection, IngestionJob.__table__)
+        create_search_index(connection)
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
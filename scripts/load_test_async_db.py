@@ -0,0 +1,151 @@
+"""
+Load test the data endpoints on async sessions against the previous
+synchronous-session handlers at increasing client concurrency
+"""
+import sys
+import os
+import time
+import json
+import random
+import asyncio
+import argparse
+import statistics
+import tempfile
+import multiprocessing
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PORTS = {"sync": 8765, "async": 8766}
+
+def populate(rows):
+    from sqlalchemy import insert
+    from app.core.database import SessionLocal, engine, Base
+    from app.models.data_models import RawData
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        start = datetime(2024, 1, 1)
+        db.execute(insert(RawData), [
+            {
+                "source": "news" if i % 2 else "twitter",
+                "source_id": str(i),
+                "title": f"Item {i}",
+                "content": "Synthetic content " * 20,
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    engine.dispose()
+
+def sync_app():
+    """The data listing as it was served before: a sync Session inside an async handler"""
+    from fastapi import FastAPI, Depends, Query
+    from fastapi.responses import Response
+    from sqlalchemy.orm import Session
+    from app.core.database import get_read_db
+    from app.api.endpoints.data import DATA_COLUMNS, DATA_FIELDS, paginate, _to_dicts, _json_default
+
+    app = FastAPI()
+
+    @app.get("/api/v1/data/")
+    async def get_data(
+        limit: int = Query(100, ge=1, le=1000),
+        source: str = Query(None),
+        db: Session = Depends(get_read_db)
+    ):
+        query = db.query(*DATA_COLUMNS)
+        if source:
+            query = query.filter(DATA_COLUMNS[1] == source)
+        data, next_cursor = paginate(query, 0, limit)
+        body = {"data": _to_dicts(db, data, DATA_FIELDS), "next_cursor": next_cursor}
+        return Response(json.dumps(body, default=_json_default, separators=(",", ":")), media_type="application/json")
+
+    return app
+
+def serve(mode):
+    import uvicorn
+    if mode == "sync":
+        app = sync_app()
+    else:
+        from app.main import app
+    uvicorn.run(app, host="127.0.0.1", port=PORTS[mode], log_level="warning")
+
+async def hammer(mode, concurrency, seconds, limit):
+    import httpx
+
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client_loop(client):
+        nonlocal errors
+        rng = random.Random()
+        while time.perf_counter() < deadline:
+            params = {"limit": limit, "count": "none", "source": rng.choice(["news", "twitter"])}
+            requested = time.perf_counter()
+            try:
+                response = await client.get("/api/v1/data/", params=params)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - requested)
+            except httpx.HTTPError:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{PORTS[mode]}", limits=limits, timeout=60
+    ) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    median = statistics.median(latencies) if latencies else 0
+    print(
+        f"{mode:<6} {concurrency:>6} {len(latencies) / seconds:>10.1f} "
+        f"{median * 1000:>10.1f} {p99 * 1000:>10.1f} {errors:>7}"
+    )
+
+def wait_for_server(mode):
+    import httpx
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORTS[mode]}/api/v1/data/", params={"limit": 1})
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{mode} server did not start")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--limit", type=int, default=20, help="Rows per listing request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app reads its settings at import time, so set the database first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'load_test.db')}"
+        # Enough pooled connections for every in-flight request in either mode
+        os.environ["DATABASE_POOL_SIZE"] = "20"
+        os.environ["DATABASE_MAX_OVERFLOW"] = "100"
+        populate(args.rows)
+
+        print(f"{args.rows} rows, {args.limit} rows per request, {args.seconds}s per run")
+        print(f"{'mode':<6} {'clients':>6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>7}")
+        for mode in ("sync", "async"):
+            server = multiprocessing.Process(target=serve, args=(mode,), daemon=True)
+            server.start()
+            try:
+                wait_for_server(mode)
+                for concurrency in args.concurrency:
+                    asyncio.run(hammer(mode, concurrency, args.seconds, args.limit))
+            finally:
+                server.terminate()
+                server.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Throughput test for the ingestion job queue: many queued jobs drain
+concurrently while read endpoints keep answering
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+import statistics
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api import start_stub_server
+
+async def run_load_test(jobs, workers, latency, page_size):
+    # The app reads its settings at import time, so point it at the stub first
+    from app.core.database import engine, Base
+    from app.main import app
+    from app.services.job_service import job_queue
+    import httpx
+
+    Base.metadata.create_all(bind=engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        start = time.perf_counter()
+        submit_times = []
+        job_ids = []
+        for i in range(jobs):
+            submitted = time.perf_counter()
+            response = await client.post(
+                "/api/v1/ingestion/news",
+                json={"query": f"job-{i}", "page_size": page_size}
+            )
+            response.raise_for_status()
+            submit_times.append(time.perf_counter() - submitted)
+            job_ids.append(response.json()["id"])
+
+        # Hit the read endpoints while the queue drains
+        read_times = []
+        drained = asyncio.create_task(job_queue.join())
+        while not drained.done():
+            requested = time.perf_counter()
+            response = await client.get("/api/v1/data/", params={"limit": 10})
+            response.raise_for_status()
+            read_times.append(time.perf_counter() - requested)
+            await asyncio.sleep(0.05)
+        await drained
+        elapsed = time.perf_counter() - start
+
+        statuses = {}
+        rows = 0
+        for job_id in job_ids:
+            job = (await client.get(f"/api/v1/ingestion/jobs/{job_id}")).json()
+            statuses[job["status"]] = statuses.get(job["status"], 0) + 1
+            rows += job["rows_inserted"]
+
+    serialized = jobs * latency
+    print(f"{jobs} jobs, {workers} workers, upstream latency {latency:.2f}s")
+    print(f"Job statuses: {statuses}, rows inserted: {rows}")
+    print(f"Wall time: {elapsed:.2f}s (one job at a time would be >= {serialized:.2f}s)")
+    print(f"Submit latency: max {max(submit_times) * 1000:.1f}ms")
+    if read_times:
+        print(
+            f"Read latency while draining ({len(read_times)} requests): "
+            f"median {statistics.median(read_times) * 1000:.1f}ms, max {max(read_times) * 1000:.1f}ms"
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--page-size", type=int, default=200)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'load_test.db')}"
+        os.environ["NEWS_API_KEY"] = "stub"
+        os.environ["NEWS_API_BASE_URL"] = f"{server.base_url}/v2"
+        os.environ["INGESTION_WORKERS"] = str(args.workers)
+        try:
+            asyncio.run(run_load_test(args.jobs, args.workers, args.latency, args.page_size))
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
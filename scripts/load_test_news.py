@@ -0,0 +1,59 @@
+"""
+Load test showing concurrent news ingestion jobs overlap their upstream calls
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stub_api import start_stub_server
+
+async def run_load_test(concurrency, latency):
+    # The app reads its settings at import time, so point it at the stub first
+    from app.core.database import engine, Base
+    from app.main import app
+    from app.services.job_service import job_queue
+    import httpx
+
+    Base.metadata.create_all(bind=engine)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        async def ingest(i):
+            response = await client.post(
+                "/api/v1/ingestion/news",
+                json={"query": f"load-{i}", "page_size": 20}
+            )
+            response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(ingest(i) for i in range(concurrency)))
+        await job_queue.join()
+        elapsed = time.perf_counter() - start
+
+    serialized = concurrency * latency
+    print(f"{concurrency} concurrent requests, upstream latency {latency:.2f}s")
+    print(f"Wall time: {elapsed:.2f}s (fully serialized would be >= {serialized:.2f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'load_test.db')}"
+        os.environ["NEWS_API_KEY"] = "stub"
+        os.environ["NEWS_API_BASE_URL"] = f"{server.base_url}/v2"
+        try:
+            asyncio.run(run_load_test(args.concurrency, args.latency))
+        finally:
+            server.shutdown()
+
+if __name__ == "__main__":
+    main()
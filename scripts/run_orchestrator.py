@@ -0,0 +1,113 @@
+"""
+Manage data sources and run the multi-source ingestion orchestrator
+"""
+import sys
+import os
+import json
+import asyncio
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.http import close_http_client
+from app.models.data_models import DataSource
+from app.services.ingestion_service import news_source_name, twitter_source_name
+from app.services.orchestrator_service import orchestrator
+
+def add_source(source_type, query, language, page_size, interval):
+    """Register a query; an existing source of the same name keeps its fetch state"""
+    if source_type == "news_api":
+        name = news_source_name(query, language)
+        config = {"query": query, "language": language, "page_size": page_size}
+    else:
+        name = twitter_source_name(query)
+        config = {"query": query, "count": page_size}
+    if interval:
+        config["interval_seconds"] = interval
+
+    db = SessionLocal()
+    try:
+        data_source = db.query(DataSource).filter(DataSource.name == name).first()
+        if data_source is None:
+            data_source = DataSource(name=name, source_type=source_type, config=config)
+            db.add(data_source)
+        else:
+            data_source.config = {**(data_source.config or {}), **config}
+            data_source.is_active = "true"
+        db.commit()
+        print(f"Source {data_source.id}: {name}")
+    finally:
+        db.close()
+
+def list_sources():
+    db = SessionLocal()
+    try:
+        for data_source in db.query(DataSource).order_by(DataSource.id).all():
+            print(
+                f"{data_source.id:>4}  {data_source.source_type:<9} active={data_source.is_active:<5} "
+                f"last_fetch={data_source.last_fetch}  {data_source.name}  {json.dumps(data_source.config)}"
+            )
+    finally:
+        db.close()
+
+def set_active(source_id, active):
+    db = SessionLocal()
+    try:
+        data_source = db.get(DataSource, source_id)
+        if data_source is None:
+            raise SystemExit(f"No data source {source_id}")
+        data_source.is_active = "true" if active else "false"
+        db.commit()
+    finally:
+        db.close()
+
+async def run(only_due):
+    try:
+        result = await orchestrator.run_once(only_due=only_due)
+    finally:
+        await close_http_client()
+    for source in result["sources"]:
+        error = f" ({source['error']})" if "error" in source else ""
+        print(f"  {source['name']}: {source['status']}, {source['fetched']} fetched{error}")
+    print(f"Inserted {result['inserted']} rows from {len(result['sources'])} sources")
+
+async def schedule(poll_seconds):
+    orchestrator.start(poll_seconds)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await orchestrator.stop()
+        await close_http_client()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Register a news or Twitter query as a data source")
+    add.add_argument("source_type", choices=["news_api", "twitter"])
+    add.add_argument("query")
+    add.add_argument("--language", default="en")
+    add.add_argument("--page-size", type=int, default=100)
+    add.add_argument("--interval", type=int, help="Seconds between scheduled fetches")
+    commands.add_parser("list", help="List data sources and their fetch state")
+    run_parser = commands.add_parser("run", help="Fetch due sources once")
+    run_parser.add_argument("--all", action="store_true", help="Fetch every active source, due or not")
+    schedule_parser = commands.add_parser("schedule", help="Fetch due sources every poll interval until interrupted")
+    schedule_parser.add_argument("--poll-seconds", type=float, default=settings.ORCHESTRATOR_POLL_SECONDS)
+    for command, help_text in (("enable", "Activate a data source"), ("disable", "Deactivate a data source")):
+        commands.add_parser(command, help=help_text).add_argument("source_id", type=int)
+    args = parser.parse_args()
+
+    if args.command == "add":
+        add_source(args.source_type, args.query, args.language, args.page_size, args.interval)
+    elif args.command == "list":
+        list_sources()
+    elif args.command in ("enable", "disable"):
+        set_active(args.source_id, args.command == "enable")
+    elif args.command == "run":
+        asyncio.run(run(only_due=not args.all))
+    else:
+        try:
+            asyncio.run(schedule(args.poll_seconds))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,193 @@
+"""
+Local stub of the News API for tests, load tests and benchmarks
+"""
+import sys
+import json
+import math
+import time
+import hashlib
+import threading
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from datetime import datetime, timedelta
+
+# Article i of a query is published i minutes after this
+PUBLISHED_BASE = datetime(2024, 1, 1)
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    """Serve deterministic News API responses after a fixed latency"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        self.server.record_request()
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            return
+        self.server.record_bytes(len(body))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        time.sleep(self.server.latency)
+
+        allowed, headers = self.server.take_quota()
+        if not allowed:
+            self._send_json(429, {
+                "status": "error",
+                "code": "rateLimited",
+                "message": "You have made too many requests recently."
+            }, headers)
+        elif parts.path.endswith("/everything") or parts.path.endswith("/top-headlines"):
+            self._send_json(200, self.server.news_page(params), headers)
+        else:
+            self._send_json(404, {"status": "error", "message": "Not found"})
+
+class StubAPIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.1, total_results=1000, quota=None, window=60.0, rate_headers=True):
+        super().__init__(address, StubAPIHandler)
+        self.latency = latency
+        self.total_results = total_results
+        # At most quota requests per fixed window of seconds, if set
+        self.quota = quota
+        self.window = window
+        self.rate_headers = rate_headers
+        self.requests = 0
+        self.bytes_sent = 0
+        self.rate_limited = 0
+        self._window_start = math.floor(time.time())
+        self._window_used = 0
+        self._lock = threading.Lock()
+
+    def handle_error(self, request, client_address):
+        # Clients cancel pages they no longer need mid-response
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def reset(self):
+        """Zero the counters and start a fresh quota window"""
+        with self._lock:
+            self.requests = self.bytes_sent = self.rate_limited = 0
+            self._window_start = math.floor(time.time())
+            self._window_used = 0
+
+    def take_quota(self):
+        """Count a request against the quota; return whether it is allowed
+        and the rate limit headers to send, Twitter style"""
+        if self.quota is None:
+            return True, {}
+        with self._lock:
+            now = time.time()
+            if now >= self._window_start + self.window:
+                self._window_start += (now - self._window_start) // self.window * self.window
+                self._window_used = 0
+            allowed = self._window_used < self.quota
+            if allowed:
+                self._window_used += 1
+            else:
+                self.rate_limited += 1
+            reset = self._window_start + self.window
+            remaining = self.quota - self._window_used
+        if not self.rate_headers:
+            return allowed, {}
+        headers = {
+            "x-rate-limit-limit": str(self.quota),
+            "x-rate-limit-remaining": str(remaining),
+            "x-rate-limit-reset": str(math.ceil(reset)),
+        }
+        if not allowed:
+            headers["Retry-After"] = str(math.ceil(reset - now))
+        return allowed, headers
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_bytes(self, size):
+        with self._lock:
+            self.bytes_sent += size
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def news_page(self, params):
+        """Build one page of synthetic articles for a query, newest first.
+
+        Raising total_results publishes newer articles; from and to limit
+        results to articles published at or after and at or before them,
+        as News API does.
+        """
+        query = params.get("q") or params.get("category") or "headlines"
+        page = int(params.get("page", 1))
+        page_size = int(params.get("pageSize", 100))
+        oldest = 0
+        if params.get("from"):
+            minutes = (datetime.fromisoformat(params["from"]) - PUBLISHED_BASE).total_seconds() / 60
+            oldest = max(0, math.ceil(minutes))
+        newest = self.total_results - 1
+        if params.get("to"):
+            minutes = (datetime.fromisoformat(params["to"]) - PUBLISHED_BASE).total_seconds() / 60
+            newest = min(newest, math.floor(minutes))
+        available = max(0, newest + 1 - oldest)
+        start = (page - 1) * page_size
+        end = min(start + page_size, available)
+        articles = [
+            {
+                "source": {"id": None, "name": "Stub"},
+                "author": "stub",
+                "title": f"{query} article {i}",
+                "description": f"Description of {query} article {i}",
+                "url": f"https://stub.example.com/{query}/{i}",
+                "publishedAt": (PUBLISHED_BASE + timedelta(minutes=i)).isoformat() + "Z",
+                "content": f"Content of {query} article {i}",
+            }
+            for i in (newest - position for position in range(start, end))
+        ]
+        return {"status": "ok", "totalResults": available, "articles": articles}
+
+def start_stub_server(latency=0.1, total_results=1000, host="127.0.0.1", port=0, **quota):
+    """Start a stub server on a background thread and return it; quota
+    takes the quota, window and rate_headers arguments of StubAPIServer"""
+    server = StubAPIServer((host, port), latency=latency, total_results=total_results, **quota)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--quota", type=int, help="Requests allowed per window before answering 429")
+    parser.add_argument("--window", type=float, default=60.0, help="Quota window in seconds")
+    parser.add_argument("--no-rate-headers", action="store_true", help="Send no x-rate-limit or Retry-After headers")
+    args = parser.parse_args()
+
+    server = StubAPIServer(
+        ("127.0.0.1", args.port), latency=args.latency,
+        quota=args.quota, window=args.window, rate_headers=not args.no_rate_headers
+    )
+    print(f"Stub API listening on {server.base_url} (set NEWS_API_BASE_URL={server.base_url}/v2)")
+    server.serve_forever()
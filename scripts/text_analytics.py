@@ -0,0 +1,43 @@
+"""
+Run batch text analytics over stored data and print the results
+"""
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal
+from app.services.text_analytics_service import TextAnalyticsService
+
+def run_text_analytics(source, top_n, terms):
+    """Print keyword, trend and sentiment summaries"""
+    db = SessionLocal()
+    try:
+        result = TextAnalyticsService(db).analyze(source=source, top_n=top_n, terms=terms)
+    finally:
+        db.close()
+
+    print(f"Analyzed {result['rows']} rows")
+
+    print("\nTop keywords:")
+    for keyword in result["keywords"]:
+        print(f"  {keyword['term']:<20} {keyword['count']:>8}")
+
+    print("\nTerm trends:")
+    for point in result["trends"]:
+        print(f"  {point['day']:%Y-%m-%d} {point['source']:<10} {point['term']:<20} {point['count']:>6}")
+
+    print("\nSentiment:")
+    for row in result["sentiment"]:
+        print(
+            f"  {row['source']:<10} mean {row['mean_score']:+.2f} "
+            f"(positive {row['positive']}, negative {row['negative']}, neutral {row['neutral']})"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--source")
+    parser.add_argument("--top-n", type=int, default=20)
+    parser.add_argument("--terms", nargs="+")
+    args = parser.parse_args()
+    run_text_analytics(args.source, args.top_n, args.terms)